@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Contribution de chaque détecteur sur les sessions validées
+
+Usage:
+    python analyze_detectors.py extractions_ultra --min-unique 1 --output rapport.json
+"""
+import sys
+import json
+import argparse
+from pathlib import Path
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.append(str(Path(__file__).parent))
+
+from analyzers.detector_analytics import DetectorAnalytics
+
+
+def main(argv=None):
+    """Point d'entrée de l'analyse des détecteurs"""
+    parser = argparse.ArgumentParser(description="Analyse de contribution des détecteurs")
+    parser.add_argument('extractions_dir', help="Dossier contenant les sessions validées")
+    parser.add_argument('--min-unique', type=int, default=1,
+                        help="Images validées trouvées seules pour conserver une source")
+    parser.add_argument('--output', help="Fichier JSON du rapport et de la config recommandée")
+    args = parser.parse_args(argv)
+
+    analytics = DetectorAnalytics(min_unique_validated=args.min_unique)
+    if not analytics.add_sessions(args.extractions_dir):
+        print(f"❌ Aucune session validée dans {args.extractions_dir}")
+        return 1
+
+    report = analytics.report()
+    print(analytics.format_report(report))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Rapport sauvegardé: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,5 +3,9 @@ Module des analyseurs
 """
 from .coherence_analyzer import CoherenceAnalyzer
 from .quality_analyzer import QualityAnalyzer
+from .detector_analytics import DetectorAnalytics
+from .summary_prescreen import SummaryPrescreen
+from .expected_plates import ExpectedPlates
+from .number_sequence import NumberSequence
 
-__all__ = ['CoherenceAnalyzer', 'QualityAnalyzer']
+__all__ = ['CoherenceAnalyzer', 'QualityAnalyzer', 'DetectorAnalytics', 'SummaryPrescreen', 'ExpectedPlates', 'NumberSequence']
@@ -28,6 +28,7 @@ class CoherenceAnalyzer:
             'detected_numbers': numbers,
             'is_sequential': self._is_sequential(numbers),
             'gaps': self._find_gaps(numbers),
+            'inferred_numbers': [item['number'] for item in detected_numbers if item['inferred']],
             'inconsistencies': [],
             'suggested_corrections': []
         }
@@ -53,7 +54,8 @@ class CoherenceAnalyzer:
                     'w': bbox.get('w', 0),
                     'h': bbox.get('h', 0),
                     'filename': rect.get('filename', ''),
-                    'confidence': rect.get('confidence', 0)
+                    'confidence': rect.get('confidence', 0),
+                    'inferred': rect.get('number_inferred', False)
                 })
         
         return detected_numbers
@@ -0,0 +1,190 @@
+"""
+Analyse de contribution des détecteurs à partir des validations humaines
+"""
+import os
+import json
+import copy
+from typing import List, Dict, Any
+
+from utils import logger, SessionDB
+from config import DETECTION_CONFIG
+
+ULTRA_PREFIX = "ultra_detector/"
+
+
+class DetectorAnalytics:
+    """Croise `validation_results.json` et la provenance des détections.
+
+    Pour chaque détecteur et chaque configuration Ultra : part du temps de
+    détection, images validées apportées seul (parmi les détecteurs, et
+    parmi les configs pour Ultra), faux positifs. Les sources
+    n'ayant jamais apporté seules une planche validée sont proposées à
+    l'élagage dans un `DETECTION_CONFIG` recommandé.
+    """
+
+    def __init__(self, min_unique_validated: int = 1):
+        self.min_unique_validated = min_unique_validated
+        self.logger = logger
+        self.sources: Dict[str, Dict[str, Any]] = {}
+        self.sessions: List[str] = []
+
+    def add_session(self, session_dir: str) -> bool:
+        """Intègre une session validée. Retourne False si elle n'est pas exploitable"""
+        image_states = self._load_validation(session_dir)
+        if not image_states:
+            return False
+
+        for page in self._load_pages(session_dir):
+            page_num = page.get('page_number')
+            for source, seconds in (page.get('detector_timings') or {}).items():
+                self._source(source)['time'] += seconds
+
+            for rect in page.get('rectangles_details', []):
+                state = image_states.get(f"page{page_num}_{rect.get('filename')}")
+                found_by = rect.get('found_by') or [rect.get('detection_method', 'unknown')]
+                # Détecteurs distincts (anciennes sessions : configs Ultra sans le détecteur)
+                detectors = sorted({source.split('/')[0] for source in found_by})
+                configs = sorted({source for source in found_by if source.startswith(ULTRA_PREFIX)})
+                # Unicité : entre détecteurs, et entre configs à l'intérieur d'Ultra
+                for sources, unique in ((detectors, len(detectors) == 1), (configs, len(configs) == 1)):
+                    for source in sources:
+                        stats = self._source(source)
+                        stats['detections'] += 1
+                        if state == 'validated':
+                            stats['validated'] += 1
+                            stats['unique_validated'] += int(unique)
+                        elif state == 'rejected':
+                            stats['false_positives'] += 1
+
+        self.sessions.append(session_dir)
+        return True
+
+    def add_sessions(self, extractions_dir: str) -> int:
+        """Intègre toutes les sessions validées d'un dossier d'extractions"""
+        count = 0
+        for name in sorted(os.listdir(extractions_dir)):
+            session_dir = os.path.join(extractions_dir, name)
+            if os.path.isdir(session_dir) and self.add_session(session_dir):
+                count += 1
+        return count
+
+    def report(self) -> Dict[str, Any]:
+        """Rapport par source avec part du temps et recommandation d'élagage"""
+        # Les temps des configs Ultra sont inclus dans celui d'ultra_detector
+        total_time = sum(s['time'] for name, s in self.sources.items()
+                         if not name.startswith(ULTRA_PREFIX))
+        rows = []
+        for name, stats in sorted(self.sources.items()):
+            row = dict(stats, source=name)
+            row['time'] = round(stats['time'], 3)
+            row['time_share'] = round(stats['time'] / total_time, 4) if total_time else 0.0
+            row['keep'] = stats['unique_validated'] >= self.min_unique_validated
+            rows.append(row)
+
+        return {
+            'sessions': len(self.sessions),
+            'total_detection_time': round(total_time, 3),
+            'sources': rows,
+            'recommended_detection_config': self.recommended_detection_config(),
+            'recommended_detectors': self.recommended_detectors()
+        }
+
+    def recommended_detection_config(self) -> Dict[str, Any]:
+        """DETECTION_CONFIG sans les configs Ultra qui n'apportent rien seules"""
+        pruned = copy.deepcopy(DETECTION_CONFIG)
+        observed = {name[len(ULTRA_PREFIX):] for name in self.sources if name.startswith(ULTRA_PREFIX)}
+        pruned['ultra_configs'] = [
+            config for config in pruned['ultra_configs']
+            if config['name'] not in observed or self._keeps(ULTRA_PREFIX + config['name'])
+        ]
+        return pruned
+
+    def recommended_detectors(self) -> List[str]:
+        """Détecteurs ayant apporté seuls au moins une planche validée"""
+        return [name for name in sorted(self.sources)
+                if not name.startswith(ULTRA_PREFIX) and self._keeps(name)]
+
+    def format_report(self, report: Dict[str, Any]) -> str:
+        """Rapport texte lisible"""
+        lines = [
+            f"SESSIONS ANALYSÉES: {report['sessions']}",
+            f"Temps total de détection: {report['total_detection_time']}s",
+            "",
+            f"{'Source':45s} {'Temps':>7s} {'Part':>6s} {'Détect.':>8s} "
+            f"{'Validées':>9s} {'Uniques':>8s} {'Faux +':>7s}  Garder",
+        ]
+        for row in report['sources']:
+            lines.append(
+                f"{row['source']:45s} {row['time']:7.1f} {row['time_share']:6.1%} "
+                f"{row['detections']:8d} {row['validated']:9d} {row['unique_validated']:8d} "
+                f"{row['false_positives']:7d}  {'oui' if row['keep'] else 'NON'}"
+            )
+        kept = [c['name'] for c in report['recommended_detection_config']['ultra_configs']]
+        lines += ["", f"Configs Ultra recommandées: {kept}",
+                  f"Détecteurs recommandés: {report['recommended_detectors']}"]
+        return "\n".join(lines)
+
+    def _keeps(self, source: str) -> bool:
+        stats = self.sources.get(source)
+        return stats is not None and stats['unique_validated'] >= self.min_unique_validated
+
+    def _source(self, name: str) -> Dict[str, Any]:
+        if name not in self.sources:
+            self.sources[name] = {
+                'time': 0.0,
+                'detections': 0,
+                'validated': 0,
+                'unique_validated': 0,
+                'false_positives': 0
+            }
+        return self.sources[name]
+
+    def _load_validation(self, session_dir: str) -> Dict[str, str]:
+        """États de validation (manifeste SQLite, sinon validation_results.json)"""
+        if SessionDB.exists(session_dir):
+            db = SessionDB(session_dir)
+            try:
+                image_states = db.get_validation_states()
+            finally:
+                db.close()
+            if image_states:
+                return image_states
+
+        results_file = os.path.join(session_dir, "validation_results.json")
+        if not os.path.exists(results_file):
+            return {}
+        try:
+            with open(results_file, 'r', encoding='utf-8') as f:
+                return json.load(f).get('image_states', {})
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"⚠️ Validation illisible {session_dir}: {e}")
+            return {}
+
+    def _load_pages(self, session_dir: str) -> List[Dict[str, Any]]:
+        """Pages d'une session (manifeste SQLite, log global, sinon page_ultra_details.json)"""
+        if SessionDB.exists(session_dir):
+            db = SessionDB(session_dir)
+            try:
+                pages = db.get_pages()
+            finally:
+                db.close()
+            if pages:
+                return pages
+
+        global_log = os.path.join(session_dir, "extraction_ultra_complete.json")
+        if os.path.exists(global_log):
+            try:
+                with open(global_log, 'r', encoding='utf-8') as f:
+                    pages = json.load(f).get('pages', [])
+                if pages:
+                    return pages
+            except (OSError, ValueError):
+                pass
+
+        pages = []
+        for name in sorted(os.listdir(session_dir)):
+            details = os.path.join(session_dir, name, "page_ultra_details.json")
+            if name.startswith("page_") and os.path.exists(details):
+                with open(details, 'r', encoding='utf-8') as f:
+                    pages.append(json.load(f))
+        return pages
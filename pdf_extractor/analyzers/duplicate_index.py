@@ -0,0 +1,159 @@
+"""
+Index de hash perceptuels pour regrouper les reproductions d'une même œuvre
+"""
+import os
+import json
+from typing import List, Dict, Any, Tuple
+
+from utils import logger
+from config import DUPLICATE_CONFIG
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+class BKTree:
+    """Arbre BK sur la distance de Hamming (requêtes par rayon)"""
+
+    def __init__(self):
+        self.root = None
+        self.size = 0
+
+    def add(self, value: int, item: Any):
+        self.size += 1
+        node = [value, [item], {}]
+        if self.root is None:
+            self.root = node
+            return
+        current = self.root
+        while True:
+            distance = hamming_distance(value, current[0])
+            if distance == 0:
+                current[1].append(item)
+                return
+            child = current[2].get(distance)
+            if child is None:
+                current[2][distance] = node
+                return
+            current = child
+
+    def query(self, value: int, radius: int) -> List[Tuple[int, Any]]:
+        """Éléments à distance <= radius, avec leur distance"""
+        results = []
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            node_value, items, children = stack.pop()
+            distance = hamming_distance(value, node_value)
+            if distance <= radius:
+                results.extend((distance, item) for item in items)
+            # Inégalité triangulaire : seuls les enfants dans [d - r, d + r]
+            for child_distance, child in children.items():
+                if distance - radius <= child_distance <= distance + radius:
+                    stack.append(child)
+        return results
+
+
+class DuplicateIndex:
+    """Regroupe les découpes quasi identiques d'une session et entre volumes.
+
+    Chaque découpe sauvegardée porte un dHash (`phash` dans les détails de
+    page). Les groupes sont calculés dans la session puis complétés par les
+    correspondances des sessions précédentes, lues dans un index persistant.
+    """
+
+    def __init__(self, index_path: str = None, max_distance: int = None):
+        self.index_path = index_path
+        self.max_distance = (DUPLICATE_CONFIG['max_distance']
+                             if max_distance is None else max_distance)
+        self.skip_reasons = set(DUPLICATE_CONFIG.get('skip_reasons', []))
+        self.logger = logger
+        self.entries: List[Dict[str, Any]] = self._load()
+
+    def assign_groups(self, session_data: Dict[str, Any], session_name: str) -> List[Dict[str, Any]]:
+        """Annote les rectangles (`duplicate_group`) et retourne les groupes"""
+        candidates = []
+        for page in session_data.get('pages', []):
+            for rect in page.get('rectangles_details', []):
+                if rect.get('phash') and not self.skip_reasons.intersection(rect.get('doubt_reasons', [])):
+                    candidates.append((page.get('page_number'), rect))
+
+        # Union-find des découpes proches dans la session
+        parent = list(range(len(candidates)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        session_tree = BKTree()
+        for i, (_, rect) in enumerate(candidates):
+            value = int(rect['phash'], 16)
+            for _, j in session_tree.query(value, self.max_distance):
+                parent[find(i)] = find(j)
+            session_tree.add(value, i)
+
+        # Correspondances dans les volumes déjà indexés
+        external_tree = BKTree()
+        for entry in self.entries:
+            if entry['session'] != session_name:
+                external_tree.add(int(entry['hash'], 16), entry)
+
+        clusters: Dict[int, List[int]] = {}
+        for i in range(len(candidates)):
+            clusters.setdefault(find(i), []).append(i)
+
+        groups = []
+        for members in clusters.values():
+            external = {}
+            for i in members:
+                value = int(candidates[i][1]['phash'], 16)
+                for distance, entry in external_tree.query(value, self.max_distance):
+                    key = (entry['session'], entry['page'], entry['filename'])
+                    if key not in external or distance < external[key]['distance']:
+                        external[key] = dict(entry, distance=distance)
+            if len(members) < 2 and not external:
+                continue
+
+            group_id = f"dup_{len(groups) + 1:03d}"
+            for i in members:
+                candidates[i][1]['duplicate_group'] = group_id
+            groups.append({
+                'group_id': group_id,
+                'members': [{'page': candidates[i][0], 'filename': candidates[i][1]['filename'],
+                             'artwork_number': candidates[i][1].get('artwork_number')}
+                            for i in members],
+                'other_volumes': sorted(external.values(), key=lambda e: e['distance'])
+            })
+
+        self._replace_session(session_name, candidates)
+        if groups:
+            self.logger.info(f"🪞 {len(groups)} groupes de quasi-doublons")
+        return groups
+
+    def save(self):
+        if not self.index_path:
+            return
+        os.makedirs(os.path.dirname(self.index_path) or '.', exist_ok=True)
+        with open(self.index_path, 'w', encoding='utf-8') as f:
+            json.dump({'entries': self.entries}, f, ensure_ascii=False)
+
+    def _replace_session(self, session_name: str, candidates: List[Tuple[int, Dict]]):
+        self.entries = [e for e in self.entries if e['session'] != session_name]
+        self.entries.extend({
+            'hash': rect['phash'],
+            'session': session_name,
+            'page': page_num,
+            'filename': rect['filename']
+        } for page_num, rect in candidates)
+
+    def _load(self) -> List[Dict[str, Any]]:
+        if not self.index_path or not os.path.exists(self.index_path):
+            return []
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                return json.load(f).get('entries', [])
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"⚠️ Index de doublons illisible, reconstruit: {e}")
+            return []
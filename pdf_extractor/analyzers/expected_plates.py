@@ -0,0 +1,78 @@
+"""
+Numéros de planches attendus par page PDF, d'après la table des planches
+"""
+from collections import Counter, defaultdict, deque
+from typing import Dict, Any, Iterable, Optional
+
+from config import TOC_VERIFICATION_CONFIG
+
+
+class ExpectedPlates:
+    """Numéros attendus sur chaque page du PDF, pour vérifier plutôt que chercher.
+
+    La table des planches donne la page imprimée de chaque planche. Le
+    décalage avec les pages du PDF (pages liminaires, hors-texte non
+    paginés) est appris sur les numéros confirmés des pages précédentes :
+    la vérification ne commence qu'une fois ce décalage établi, et suit ses
+    changements au fil du volume.
+    """
+
+    def __init__(self, plate_map: Dict[int, Dict], config: Dict[str, Any] = None):
+        self.config = config or TOC_VERIFICATION_CONFIG
+        self.by_page = defaultdict(list)
+        self.plate_pages: Dict[str, int] = {}
+        for number, info in (plate_map or {}).items():
+            if info.get('page') is not None:
+                self.by_page[int(info['page'])].append(str(number))
+                self.plate_pages[str(number)] = int(info['page'])
+        self.offsets = deque(maxlen=self.config.get('offset_window', 8))
+        self.stats = {'pages_verified': 0, 'expected': 0, 'matched': 0, 'corrected': 0,
+                      'open_search': 0, 'skipped': 0}
+
+    @property
+    def offset(self) -> Optional[int]:
+        """Décalage page PDF - page imprimée, None tant qu'il n'est pas établi"""
+        if self.config.get('page_offset') is not None:
+            return self.config['page_offset']
+        if not self.offsets:
+            return None
+        value, votes = Counter(self.offsets).most_common(1)[0]
+        if votes >= self.config.get('min_votes', 2) and \
+                votes >= self.config.get('min_vote_ratio', 0.6) * len(self.offsets):
+            return value
+        return None
+
+    def expected(self, pdf_page: int) -> Optional[Dict[str, Any]]:
+        """{'numbers' (page exacte), 'candidates' (pages voisines comprises), ...} ou None"""
+        if not self.config.get('enabled', True) or not self.by_page:
+            return None
+        offset = self.offset
+        if offset is None:
+            return None
+        printed = pdf_page - offset
+        slack = self.config.get('page_slack', 1)
+        candidates = {number for page in range(printed - slack, printed + slack + 1)
+                      for number in self.by_page.get(page, [])}
+        if not candidates:
+            return None
+        return {
+            'offset': offset,
+            'printed_page': printed,
+            'numbers': sorted(self.by_page.get(printed, []), key=int),
+            'candidates': sorted(candidates, key=int)
+        }
+
+    def confirm(self, pdf_page: int, numbers: Iterable[Optional[str]], verification: Dict = None):
+        """Numéros retenus sur une page : décalage mis à jour, statistiques cumulées"""
+        for number in numbers:
+            if number is not None and str(number) in self.plate_pages:
+                self.offsets.append(pdf_page - self.plate_pages[str(number)])
+        if verification:
+            self.stats['pages_verified'] += 1
+            for key in ('expected', 'matched', 'corrected', 'open_search', 'skipped'):
+                self.stats[key] += verification.get(key, 0)
+
+    def report(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats['offset'] = self.offset
+        return stats
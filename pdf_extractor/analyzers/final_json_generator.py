@@ -10,37 +10,54 @@ import uuid
 from typing import Dict, List, Optional
 import logging
 
+from utils import ImageUtils, ArtworkStore
+
 logger = logging.getLogger(__name__)
 
+# Champs d'œuvre complétés par le sommaire (qui peut se trouver en fin de volume)
+SUMMARY_FIELDS = ('artist_name', 'title', 'size', 'size_unit', 'medium', 'signature',
+                  'execution_year', 'description')
+SUMMARY_LIST_FIELDS = ('provenance', 'literature', 'exhibition')
+
 class FinalJSONGenerator:
     """Générateur de JSON final pour l'interface web"""
     
     def __init__(self, base_url: str = "http://localhost:5000"):
         self.base_url = base_url
+        self.reset()
+    
+    def reset(self):
+        """Démarre une nouvelle session"""
+        self._entries = []  # (rectangle de la page, JSON d'œuvre)
+        self._summary_data = {}
+    
+    def add_page(self, page_data: Dict):
+        """Ajoute les œuvres d'une page terminée (dimensions issues du pipeline)"""
+        page_num = page_data.get('page_number', 0)
+        page_dir = page_data.get('page_dir', '')
+        self._summary_data.update(self._collect_summary_data({'pages': [page_data]}, verbose=False))
         
-    def generate_final_json(self, session_data: Dict, output_dir: str) -> Dict:
-        """Génère le JSON final pour toutes les images extraites"""
-        logger.info("🎯 Génération du JSON final...")
+        if not page_dir or not os.path.exists(page_dir):
+            return
         
-        # Collecter toutes les informations
+        for rect in page_data.get('rectangles_details', []):
+            artwork_json = self._create_artwork_json(rect, page_num, page_dir, {})
+            if artwork_json:
+                self._entries.append((rect, artwork_json))
+    
+    def finalize(self, session_data: Dict, output_dir: str) -> Dict:
+        """Complète les œuvres (sommaire, quasi-doublons) et écrit final_artworks.json"""
         all_artworks = []
-        summary_data = self._collect_summary_data(session_data)
-        
-        # Parcourir toutes les pages
-        for page_data in session_data.get('pages', []):
-            page_num = page_data.get('page_number', 0)
-            page_dir = page_data.get('page_dir', '')
-            
-            if not page_dir or not os.path.exists(page_dir):
-                continue
-                
-            # Récupérer les rectangles détectés
-            rectangles_details = page_data.get('rectangles_details', [])
-            
-            for rect in rectangles_details:
-                artwork_json = self._create_artwork_json(rect, page_num, page_dir, summary_data)
-                if artwork_json:
-                    all_artworks.append(artwork_json)
+        for rect, artwork_json in self._entries:
+            artwork_number = artwork_json['metadata']['artwork_number']
+            summary_info = self._summary_data.get(artwork_number) if artwork_number else None
+            if summary_info:
+                self._apply_summary(artwork_json, summary_info)
+            # Groupes attribués après le traitement des pages
+            artwork_json['metadata']['duplicate_group'] = rect.get('duplicate_group')
+            all_artworks.append(artwork_json)
+        if self._summary_data:
+            logger.info(f"📋 {len(self._summary_data)} entrées de sommaire collectées")
         
         # Créer le JSON final
         final_data = {
@@ -48,9 +65,10 @@ class FinalJSONGenerator:
                 "pdf_name": session_data.get('pdf_name', ''),
                 "total_images": len(all_artworks),
                 "extraction_date": session_data.get('start_time', ''),
-                "mode": "ULTRA_SENSIBLE"
+                "mode": session_data.get('mode', 'ULTRA_SENSIBLE')
             },
-            "artworks": all_artworks
+            "artworks": all_artworks,
+            "duplicate_groups": session_data.get('duplicate_groups', [])
         }
         
         # Sauvegarder le JSON final
@@ -63,7 +81,24 @@ class FinalJSONGenerator:
         
         return final_data
     
-    def _collect_summary_data(self, session_data: Dict) -> Dict:
+    def generate_final_json(self, session_data: Dict, output_dir: str) -> Dict:
+        """Génère le JSON final pour toutes les images extraites (en une passe)"""
+        logger.info("🎯 Génération du JSON final...")
+        self.reset()
+        for page_data in session_data.get('pages', []):
+            self.add_page(page_data)
+        return self.finalize(session_data, output_dir)
+    
+    @staticmethod
+    def _apply_summary(artwork_json: Dict, summary_info: Dict):
+        for field in SUMMARY_FIELDS:
+            artwork_json[field] = summary_info.get(field)
+        for field in SUMMARY_LIST_FIELDS:
+            artwork_json[field] = summary_info.get(field, [])
+        artwork_json['metadata']['extraction_method'] = summary_info.get('extraction_method', 'unknown')
+        artwork_json['metadata']['raw_text'] = summary_info.get('raw_text', '')
+    
+    def _collect_summary_data(self, session_data: Dict, verbose: bool = True) -> Dict:
         """Collecte toutes les données de sommaires"""
         summary_data = {}
         
@@ -76,7 +111,8 @@ class FinalJSONGenerator:
                     if artwork_number:
                         summary_data[artwork_number] = entry
         
-        logger.info(f"📋 {len(summary_data)} entrées de sommaire collectées")
+        if verbose:
+            logger.info(f"📋 {len(summary_data)} entrées de sommaire collectées")
         return summary_data
     
     def _create_artwork_json(self, rect: Dict, page_num: int, page_dir: str, summary_data: Dict) -> Optional[Dict]:
@@ -87,32 +123,25 @@ class FinalJSONGenerator:
             filename = rect.get('filename', '')
             is_doubtful = rect.get('is_doubtful', False)
             
-            # Chemin de l'image
-            image_path = os.path.join(page_dir, filename)
+            # Chemin de l'image (les douteuses sont rangées dans DOUTEUX/)
+            image_path = os.path.join(page_dir, "DOUTEUX" if is_doubtful else "", filename)
             if not os.path.exists(image_path):
                 logger.warning(f"Image non trouvée: {image_path}")
                 return None
             
             # URL de l'image (pour l'interface web)
-            image_url = f"{self.base_url}/images/{os.path.basename(page_dir)}/{filename}"
+            relative_path = os.path.relpath(image_path, os.path.dirname(page_dir)).replace(os.sep, '/')
+            image_url = f"{self.base_url}/images/{relative_path}"
             
             # Informations du sommaire si disponible
-            summary_info = summary_data.get(artwork_number) if artwork_number else {}
+            summary_info = (summary_data.get(artwork_number) if artwork_number else None) or {}
             
             # Créer l'ID unique
             artwork_id = str(uuid.uuid4())
             
-            # Dimensions de l'image
-            try:
-                import cv2
-                img = cv2.imread(image_path)
-                if img is not None:
-                    height, width = img.shape[:2]
-                    image_size = [width, height]  # [largeur, hauteur]
-                else:
-                    image_size = [0, 0]
-            except:
-                image_size = [0, 0]
+            # Dimensions connues du pipeline, sinon lues dans l'en-tête du fichier
+            image_size = rect.get('dimensions') or ImageUtils.read_image_size(image_path) or [0, 0]
+            image_size = list(image_size)  # [largeur, hauteur]
             
             # JSON final
             artwork_json = {
@@ -141,7 +170,9 @@ class FinalJSONGenerator:
                     "extraction_method": summary_info.get('extraction_method', 'unknown'),
                     "raw_text": summary_info.get('raw_text', ''),
                     "bbox": rect.get('bbox', {}),
-                    "area": rect.get('area', 0)
+                    "area": rect.get('area', 0),
+                    "phash": rect.get('phash'),
+                    "duplicate_group": rect.get('duplicate_group')
                 }
             }
             
@@ -160,8 +191,15 @@ class FinalJSONGenerator:
             logger.error(f"Erreur création JSON pour {filename}: {e}")
             return None
     
+    def create_artwork_store(self, final_data: Dict, output_dir: str) -> ArtworkStore:
+        """Écrit les fiches d'œuvres dans artworks.jsonl (index par id)"""
+        store = ArtworkStore(output_dir)
+        count = store.write(final_data.get('artworks', []))
+        logger.info(f"💾 {count} fiches d'œuvres dans {store.path}")
+        return store
+    
     def create_individual_jsons(self, final_data: Dict, output_dir: str):
-        """Crée des fichiers JSON individuels pour chaque œuvre"""
+        """Crée des fichiers JSON individuels pour chaque œuvre (export optionnel)"""
         artworks_dir = os.path.join(output_dir, "individual_artworks")
         os.makedirs(artworks_dir, exist_ok=True)
         
@@ -222,11 +260,16 @@ class FinalJSONGenerator:
                 
                 report += f"- **{filename}**: {artist}, {title}{doubtful_mark}\n"
         
+        stored_files = ""
+        if ArtworkStore.exists(output_dir):
+            stored_files += "- `artworks.jsonl` + `artworks.idx.json`: Une fiche par ligne, index par id\n"
+        if os.path.isdir(os.path.join(output_dir, "individual_artworks")):
+            stored_files += "- `individual_artworks/`: Dossier avec un JSON par œuvre\n"
+        
         report += f"""
 ## 📁 Fichiers Générés
 - `final_artworks.json`: JSON complet avec toutes les œuvres
-- `individual_artworks/`: Dossier avec un JSON par œuvre
-- `extraction_report.md`: Ce rapport
+{stored_files}- `extraction_report.md`: Ce rapport
 
 ## 🔗 Utilisation
 Les fichiers JSON peuvent être utilisés directement dans une interface web.
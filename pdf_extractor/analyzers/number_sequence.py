@@ -0,0 +1,87 @@
+"""
+Suite des numéros d'œuvres sur tout le document (prédiction page après page)
+"""
+from typing import List, Dict, Any, Optional
+
+from config import SEQUENCE_CONFIG
+
+
+class NumberSequence:
+    """Modèle de suite des numéros, mis à jour au fil des pages.
+
+    Dans un volume, les numéros de planches croissent d'une page à l'autre
+    et dans l'ordre de lecture d'une page. Après chaque page, le dernier
+    numéro d'une suite croissante est retenu ; la page suivante est
+    attendue à partir du numéro qui le suit. Un saut trop grand ou une page
+    non croissante est ignoré, sauf s'il se répète (nouvelle numérotation).
+    """
+
+    def __init__(self, config: Dict[str, Any] = None):
+        self.config = config or SEQUENCE_CONFIG
+        self.reset()
+
+    def reset(self):
+        """Nouveau document : aucune prédiction"""
+        self.last: Optional[int] = None
+        self.rejected = 0
+        self.stats = {'pages_predicted': 0, 'pages_inferred': 0, 'numbers_inferred': 0, 'pages_rejected': 0}
+
+    @staticmethod
+    def reading_order(rectangles: List[Dict]) -> List[int]:
+        """Indices des rectangles par rangées (haut en bas), puis de gauche à droite"""
+        boxes = []
+        for rect in rectangles:
+            bbox = rect.get('bbox') or rect
+            boxes.append((int(bbox['x']), int(bbox['y']), int(bbox['w']), int(bbox['h'])))
+
+        rows = []
+        for index in sorted(range(len(boxes)), key=lambda i: boxes[i][1]):
+            x, y, w, h = boxes[index]
+            # Même rangée si le centre vertical tombe dans l'étendue de la rangée courante
+            if rows and y + h / 2 <= rows[-1]['bottom']:
+                rows[-1]['items'].append(index)
+                rows[-1]['bottom'] = max(rows[-1]['bottom'], y + h)
+            else:
+                rows.append({'bottom': y + h, 'items': [index]})
+        return [index for row in rows for index in sorted(row['items'], key=lambda i: boxes[i][0])]
+
+    def predict(self, rectangles: List[Dict]) -> Optional[Dict[str, Any]]:
+        """{'next': premier numéro attendu, 'order': ordre de lecture} ou None"""
+        if not self.config.get('enabled', True) or self.last is None \
+                or len(rectangles) < self.config.get('min_rectangles', 3):
+            return None
+        self.stats['pages_predicted'] += 1
+        return {'next': self.last + 1, 'order': self.reading_order(rectangles)}
+
+    def observe(self, rectangles: List[Dict], numbers: List[Optional[str]], inferred: List[bool] = None):
+        """Numéros retenus sur une page : état de la suite mis à jour.
+
+        Seuls les numéros lus font avancer la suite ; les numéros déduits
+        (`inferred`) sont comptés mais jamais pris comme preuve.
+        """
+        inferred = inferred or [False] * len(numbers)
+        if any(inferred):
+            self.stats['pages_inferred'] += 1
+            self.stats['numbers_inferred'] += sum(inferred)
+
+        values = [int(numbers[i]) for i in self.reading_order(rectangles)
+                  if numbers[i] is not None and not inferred[i] and str(numbers[i]).isdigit()]
+        if not values:
+            return
+        increasing = all(b > a for a, b in zip(values, values[1:]))
+        jump = values[-1] - self.last if self.last is not None else None
+        if increasing and (jump is None or 0 < jump <= self.config.get('max_jump', 50)):
+            self.last = values[-1]
+            self.rejected = 0
+            return
+
+        self.stats['pages_rejected'] += 1
+        self.rejected += 1
+        if increasing and self.rejected >= self.config.get('reset_after', 2):
+            self.last = values[-1]
+            self.rejected = 0
+
+    def report(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats['last'] = self.last
+        return stats
@@ -3,8 +3,9 @@ Analyseur de qualité des images extraites
 """
 import cv2
 import numpy as np
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Optional
 from utils import logger
+from config import QUALITY_CONFIG
 
 class QualityAnalyzer:
     """Analyse la qualité et la validité des images extraites"""
@@ -15,17 +16,57 @@ class QualityAnalyzer:
     def analyze_image_quality(self, image: np.ndarray, 
                             all_images_in_page: List[np.ndarray]) -> Dict[str, Any]:
         """Analyse si une image est douteuse"""
+        size_stats = self._page_size_stats(all_images_in_page)
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if len(image.shape) == 3 else image
+        return self._score(image.shape[:2], size_stats, gray, gray)
+    
+    def analyze_page_quality(self, images: List[np.ndarray],
+                             max_side: int = None) -> List[Dict[str, Any]]:
+        """Analyse toutes les images d'une page en une passe.
+        
+        Les statistiques de taille sont calculées une seule fois pour la page et
+        les métriques pixel portent sur un échantillon borné de chaque image :
+        sous-échantillonnage régulier pour le taux de blanc et la variance
+        (estimateurs non biaisés), réduction INTER_AREA pour les contours.
+        """
+        max_side = max_side or QUALITY_CONFIG.get('sample_max_side', 512)
+        size_stats = self._page_size_stats(images)
+        
+        results = []
+        for image in images:
+            height, width = image.shape[:2]
+            step = max(1, int(np.ceil(max(height, width) / max_side)))
+            if step > 1:
+                sampled = image[::step, ::step]
+                reduced = cv2.resize(image, (max(1, width // step), max(1, height // step)),
+                                     interpolation=cv2.INTER_AREA)
+            else:
+                sampled = reduced = image
+            
+            gray_sample = cv2.cvtColor(sampled, cv2.COLOR_BGR2GRAY) if len(sampled.shape) == 3 else sampled
+            gray_edges = cv2.cvtColor(reduced, cv2.COLOR_BGR2GRAY) if len(reduced.shape) == 3 else reduced
+            results.append(self._score((height, width), size_stats, gray_sample, gray_edges))
+        
+        return results
+    
+    def _page_size_stats(self, images: List[np.ndarray]) -> Optional[Tuple[float, float]]:
+        """Moyenne et écart-type des surfaces des images de la page"""
+        if not images:
+            return None
+        sizes = [(img.shape[0] * img.shape[1]) for img in images]
+        return float(np.mean(sizes)), float(np.std(sizes))
+    
+    def _score(self, shape: Tuple[int, int], size_stats: Optional[Tuple[float, float]],
+               gray: np.ndarray, gray_edges: np.ndarray) -> Dict[str, Any]:
+        """Applique les critères de doute (gray: taux de blanc/variance, gray_edges: contours)"""
         reasons = []
         confidence = 1.0
         
-        height, width = image.shape[:2]
+        height, width = shape
         
         # 1. Vérifier les dimensions suspectes
-        if all_images_in_page:
-            # Calculer les statistiques de taille de la page
-            sizes = [(img.shape[0] * img.shape[1]) for img in all_images_in_page]
-            mean_size = np.mean(sizes)
-            std_size = np.std(sizes)
+        if size_stats:
+            mean_size, std_size = size_stats
             current_size = height * width
             
             # Si beaucoup plus petit que la moyenne
@@ -34,7 +75,6 @@ class QualityAnalyzer:
                 confidence *= 0.5
         
         # 2. Vérifier si c'est principalement blanc/vide
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if len(image.shape) == 3 else image
         white_pixels = np.sum(gray > 240) / gray.size
         
         if white_pixels > 0.95:
@@ -54,7 +94,7 @@ class QualityAnalyzer:
             confidence *= 0.4
         
         # 5. Détection de contours
-        edges = cv2.Canny(gray, 50, 150)
+        edges = cv2.Canny(gray_edges, 50, 150)
         edge_ratio = np.sum(edges > 0) / edges.size
         
         if edge_ratio < 0.01:
@@ -0,0 +1,77 @@
+"""
+Pré-filtre des pages de sommaire (signaux peu coûteux avant l'OCR pleine page)
+"""
+import re
+from typing import Dict, Any, Iterable, Tuple
+
+import cv2
+import numpy as np
+
+from config import SUMMARY_PRESCREEN_CONFIG
+
+
+class SummaryPrescreen:
+    """Décide si une page scannée mérite l'OCR pleine page de l'analyse de sommaire.
+
+    Presque aucune page n'est un sommaire : la décision repose sur la page
+    de la table des planches déjà trouvée, les mots-clés de la couche texte
+    (même trop pauvre pour remplacer l'OCR), le nombre de lignes de texte
+    mesuré sur une image réduite et la position de la page dans le volume.
+    """
+
+    def __init__(self, config: Dict[str, Any] = None):
+        self.config = config or SUMMARY_PRESCREEN_CONFIG
+        self.keywords = [re.compile(r"\b" + re.escape(k) + r"\b", re.IGNORECASE)
+                         for k in self.config.get('keywords', [])]
+
+    def screen(self, page_image: np.ndarray, page_number: int, total_pages: int = None,
+               text_layer_text: str = "", toc_pages: Iterable[int] = ()) -> Dict[str, Any]:
+        """Décision {'candidate', 'reasons', 'text_lines', 'edge_page'} pour une page"""
+        reasons = []
+        if page_number in set(toc_pages):
+            reasons.append('page_table_des_planches')
+
+        keywords = [k.pattern for k in self.keywords if text_layer_text and k.search(text_layer_text)]
+        if keywords:
+            reasons.append('mots_cles_couche_texte')
+
+        edge_pages = self.config.get('edge_pages', 6)
+        edge_page = page_number <= edge_pages or (
+            total_pages is not None and page_number > total_pages - edge_pages)
+
+        text_lines, text_ratio = self.count_text_lines(page_image)
+        threshold = self.config['edge_min_text_lines'] if edge_page else self.config['min_text_lines']
+        if text_lines >= threshold:
+            reasons.append('debut_fin_de_volume' if edge_page and text_lines < self.config['min_text_lines']
+                           else 'densite_de_texte')
+
+        return {
+            'candidate': bool(reasons),
+            'reasons': reasons,
+            'text_lines': text_lines,
+            'text_area_ratio': round(float(text_ratio), 3),
+            'edge_page': edge_page
+        }
+
+    def count_text_lines(self, page_image: np.ndarray) -> Tuple[int, float]:
+        """Lignes de texte (composantes larges et basses) sur la page réduite, et leur emprise"""
+        gray = cv2.cvtColor(page_image, cv2.COLOR_BGR2GRAY) if page_image.ndim == 3 else page_image
+        width = self.config.get('analysis_width', 800)
+        scale = min(1.0, width / gray.shape[1])
+        small = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA) if scale < 1 else gray
+
+        binary = cv2.adaptiveThreshold(small, 255, cv2.ADAPTIVE_THRESH_MEAN_C,
+                                       cv2.THRESH_BINARY_INV, 15, 10)
+        # Fusionner les caractères d'une même ligne
+        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (max(3, small.shape[1] // 50), 1))
+        merged = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel)
+
+        count, _, stats, _ = cv2.connectedComponentsWithStats(merged, connectivity=8)
+        max_height = max(6, small.shape[1] // 25)
+        lines, area = 0, 0
+        for x, y, w, h, pixels in stats[1:]:
+            if 3 <= h <= max_height and w >= 3 * h and w >= small.shape[1] // 20 \
+                    and pixels >= 0.2 * w * h:
+                lines += 1
+                area += w * h
+        return lines, area / float(small.shape[0] * small.shape[1])
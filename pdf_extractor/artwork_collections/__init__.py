@@ -6,5 +6,6 @@ Gère différents types de collections avec leurs spécificités.
 
 from .base_collection import BaseCollection
 from .collection_manager import CollectionManager
+from .zone_search import ZoneSearch
 
-__all__ = ['BaseCollection', 'CollectionManager']
+__all__ = ['BaseCollection', 'CollectionManager', 'ZoneSearch']
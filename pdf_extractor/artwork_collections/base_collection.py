@@ -4,6 +4,7 @@ Classe de base pour toutes les collections d'œuvres d'art.
 Définit l'interface commune pour l'extraction et la détection.
 """
 
+import re
 import logging
 from abc import ABC, abstractmethod
 from typing import Dict, List, Optional, Tuple, Any
@@ -29,6 +30,21 @@ class BaseCollection(ABC):
         self.name = name
         self.description = description
         self.logger = logging.getLogger(f"{__name__}.{name}")
+        
+        # Chiffres appris sur les numéros confirmés par Tesseract (remis à zéro par document)
+        from config import OCR_CONFIG
+        from ocr.digit_recognizer import DigitRecognizer
+        from .zone_search import ZoneSearch
+        self.digit_recognizer = (DigitRecognizer() if OCR_CONFIG.get('digits', {}).get('enabled', True)
+                                 else None)
+        # Zones qui donnent les numéros dans ce document, zones vides ou couvertes
+        self.zone_search = ZoneSearch()
+    
+    def reset_number_search(self):
+        """Nouveau document : statistiques des zones et chiffres appris oubliés"""
+        self.zone_search.reset()
+        if self.digit_recognizer is not None:
+            self.digit_recognizer.reset()
     
     @abstractmethod
     def extract_toc(self, pdf_path: str) -> Optional[Dict]:
@@ -58,6 +74,312 @@ class BaseCollection(ABC):
         """
         pass
     
+    def number_search_boxes(self, image_shape, rectangle: Dict) -> List[Tuple[str, Tuple[int, int, int, int]]]:
+        """
+        Zones de recherche du numéro d'un rectangle, par priorité décroissante.
+        
+        Args:
+            image_shape: Dimensions de l'image de la page
+            rectangle: Rectangle détecté (coordonnées dans 'bbox')
+            
+        Returns:
+            Liste de (nom de zone, (x, y, w, h)) ; vide si la collection ne lit pas de zones
+        """
+        return []
+    
+    def prepare_zone(self, zone):
+        """Prétraitement des pixels d'une zone avant OCR (aucun par défaut)"""
+        return zone
+    
+    def number_search_zones(self, image, rectangle: Dict, rectangles: List[Dict] = ()) -> List[Tuple[str, Any]]:
+        """
+        Pixels (prétraités) des zones de recherche à reconnaître, dans l'ordre d'essai.
+        
+        L'ordre est celui de la collection, puis celui des zones les plus
+        productives du document. Les zones vides ou couvertes par un autre
+        rectangle de la page (`rectangles`) sont écartées avant tout OCR.
+        """
+        others = [self.rectangle_bbox(other) for other in rectangles if other is not rectangle]
+        zones = []
+        for zone_name, (zone_x, zone_y, zone_w, zone_h) in self.zone_search.order(
+                self.number_search_boxes(image.shape, rectangle)):
+            if zone_w <= 0 or zone_h <= 0:
+                continue
+            zone = image[max(0, zone_y):zone_y + zone_h, max(0, zone_x):zone_x + zone_w]
+            if zone.size == 0:
+                continue
+            skipped = self.zone_search.triage(zone, (zone_x, zone_y, zone_w, zone_h), others)
+            if skipped:
+                self.logger.debug(f"⏭️ Zone {zone_name} écartée ({skipped})")
+                continue
+            zones.append((zone_name, self.prepare_zone(zone)))
+        return zones
+    
+    def parse_number(self, text: str) -> Optional[str]:
+        """Numéro lu dans le texte OCR d'une zone (1-6 chiffres)"""
+        match = re.search(r"\b\d{1,6}\b", text or "")
+        return match.group() if match else None
+    
+    def resolve_number(self, number: Optional[str], rectangle: Dict, page_context: Dict) -> Optional[str]:
+        """Numéro final d'un rectangle (permet un repli propre à la collection)"""
+        return number
+    
+    def detect_artwork_numbers(self, image, rectangles: List[Dict], page_context: Dict) -> List[Optional[str]]:
+        """
+        Détecte les numéros de tous les rectangles d'une page.
+        
+        Si la page a déjà été lue (`page_context['page_words']`, mots
+        positionnés), les numéros sont obtenus par jointure spatiale entre ces
+        mots et les zones de recherche, sans nouvel OCR. Sinon toutes les
+        zones candidates sont reconnues en mosaïque. Chaque rectangle prend
+        le premier numéro trouvé dans ses zones, dans leur ordre d'essai
+        (`number_search_zones`). Les zones reconnues par rectangle sont
+        notées dans `page_context['number_search']`.
+        
+        Si la table des planches donne les numéros attendus sur la page
+        (`page_context['expected_numbers']`), les zones sont vérifiées contre
+        ces seuls numéros (OCR restreint à leurs chiffres) et la recherche
+        s'arrête dès qu'ils sont tous attribués.
+        
+        Si la suite du document prédit les numéros de la page
+        (`page_context['sequence']`), seuls le premier et le dernier rectangle
+        dans l'ordre de lecture sont lus ; les numéros intérieurs sont déduits
+        quand ils confirment la prédiction (`number_search['inferred']`).
+        
+        Args:
+            image: Image de la page (numpy array)
+            rectangles: Rectangles de la page
+            page_context: Contexte de la page
+            
+        Returns:
+            Numéro (ou None) de chaque rectangle, dans l'ordre
+        """
+        from config import OCR_CONFIG
+        
+        boxes_per_rect = [self.number_search_boxes(image.shape, rect) for rect in rectangles]
+        if not any(boxes_per_rect):
+            return [self.detect_artwork_number(image, rect, page_context) for rect in rectangles]
+        
+        found: List[Optional[str]] = [None] * len(rectangles)
+        search = page_context['number_search'] = {
+            'ocr_zones': [0] * len(rectangles),
+            'skipped_empty': 0,
+            'skipped_covered': 0,
+            'inferred': [False] * len(rectangles),
+            'sources': [None] * len(rectangles),   # text_layer, ocr (page), knn, tesseract, inferred
+            'readings': []                         # Texte brut lu par zone, avec sa source
+        }
+        page_words = page_context.get('page_words')
+        if page_words is not None:
+            for index, boxes in enumerate(boxes_per_rect):
+                for zone_name, box in boxes:
+                    text = page_words.text_in(box)
+                    found[index] = self.parse_number(text)
+                    search['readings'].append({'rectangle': index, 'zone': zone_name, 'text': text,
+                                               'source': page_words.source, 'number': found[index]})
+                    if found[index]:
+                        search['sources'][index] = page_words.source
+                        self.logger.debug(f"🔍 Numéro lu dans {zone_name} ({page_words.source}): {found[index]}")
+                        break
+        
+        # Zones encore sans numéro : OCR dédié (mosaïque), sauf si la page est déjà lue
+        pending = [i for i, number in enumerate(found) if number is None and boxes_per_rect[i]]
+        if page_words is not None and not OCR_CONFIG.get('page_words', {}).get('zone_fallback', False):
+            pending = []
+        page_context['rectangles'] = rectangles
+        
+        # Suite attendue (`page_context['sequence']`) : les rectangles extrêmes dans
+        # l'ordre de lecture sont lus d'abord ; s'ils confirment la prédiction, les
+        # numéros intérieurs en sont déduits sans OCR
+        sequence = page_context.get('sequence')
+        if sequence and len(pending) > 2 and sorted(sequence['order']) == pending:
+            order = sequence['order']
+            self._search_numbers(image, rectangles, page_context, found, [order[0], order[-1]])
+            first, last = found[order[0]], found[order[-1]]
+            pending = order[1:-1]
+            if first and last and first.isdigit() and last.isdigit() \
+                    and int(first) == sequence['next'] and int(last) - int(first) == len(order) - 1:
+                for step, i in enumerate(pending, start=1):
+                    found[i] = str(int(first) + step)
+                    search['inferred'][i] = True
+                    search['sources'][i] = 'inferred'
+                self.logger.debug(f"🔗 Suite confirmée {first} → {last} : {len(pending)} numéros déduits")
+                pending = []
+        if pending:
+            self._search_numbers(image, rectangles, page_context, found, pending)
+        
+        return [self.resolve_number(number, rect, page_context) for number, rect in zip(found, rectangles)]
+    
+    def _search_numbers(self, image, rectangles: List[Dict], page_context: Dict,
+                        found: List[Optional[str]], pending: List[int]):
+        """Numéros des rectangles `pending` par OCR des zones (complète `found` et `number_search`)"""
+        from config import OCR_CONFIG
+        
+        search = page_context['number_search']
+        ocr_zones = search['ocr_zones']
+        skipped_before = (self.zone_search.stats['skipped_empty'], self.zone_search.stats['skipped_covered'])
+        if pending and not OCR_CONFIG.get('mosaic', {}).get('enabled', True):
+            for i in pending:
+                zones_before = self.zone_search.stats['zones_ocr']
+                found[i] = self.detect_artwork_number(image, rectangles[i], page_context)
+                ocr_zones[i] += self.zone_search.stats['zones_ocr'] - zones_before
+                if found[i] and str(found[i]).isdigit():
+                    # OCR séquentiel de la collection : texte brut non conservé
+                    search['sources'][i] = 'tesseract'
+                    search['readings'].append({'rectangle': i, 'zone': None, 'text': None,
+                                               'source': 'tesseract', 'number': found[i]})
+            pending = []
+        
+        # Vérification guidée par la table des planches : numéros attendus sur la page
+        expected = page_context.get('expected_numbers') or {}
+        candidates = set(expected.get('candidates', []))
+        verification = None
+        
+        if pending:
+            zones_per_rect = {i: self.number_search_zones(image, rectangles[i], rectangles) for i in pending}
+            for i in pending:
+                if not zones_per_rect[i]:
+                    self.zone_search.record([], None)
+            pending = [i for i in pending if zones_per_rect[i]]
+            
+            # Chiffres reconnus sans Tesseract quand le classifieur est sûr (audit périodique)
+            recognizer = self.digit_recognizer
+            audited: Dict[int, str] = {}
+            if recognizer is not None:
+                deferred = []
+                for i in pending:
+                    number = recognizer.read_zones([pixels for _, pixels in zones_per_rect[i]])
+                    if number is None or (candidates and number not in candidates):
+                        deferred.append(i)
+                        continue
+                    found[i] = number
+                    search['sources'][i] = 'knn'
+                    search['readings'].append({'rectangle': i, 'zone': None, 'text': number,
+                                               'source': 'knn', 'number': number})
+                    recognizer.stats['rectangles_knn'] += 1
+                    if recognizer.should_audit():
+                        audited[i] = number
+                        deferred.append(i)
+                    else:
+                        self.zone_search.record([], None)
+                pending = deferred
+            
+            confirmed: Dict[int, Tuple[str, str]] = {}
+            tried: Dict[int, List[str]] = {i: [] for i in pending}
+            if candidates:
+                # OCR restreint aux chiffres attendus, arrêt dès que la page est complète ;
+                # recherche ouverte seulement si des numéros attendus manquent encore
+                numbers = set(expected.get('numbers', []))
+                assigned = {number for i, number in enumerate(found) if number and i not in audited}
+                verification = {'expected': len(numbers), 'corrected': 0}
+                self._mosaic_pass(pending, zones_per_rect, confirmed, tried,
+                                  "".join(sorted(set("".join(candidates)))), search['readings'],
+                                  candidates, numbers, assigned, verification)
+                rest = [i for i in pending if i not in confirmed]
+                if rest and not numbers <= assigned:
+                    verification['open_search'] = len(rest)
+                    self._mosaic_pass(rest, zones_per_rect, confirmed, tried, "0123456789", search['readings'])
+                else:
+                    verification['skipped'] = len(rest)
+                verification['matched'] = len(numbers & assigned)
+            else:
+                self._mosaic_pass(pending, zones_per_rect, confirmed, tried, "0123456789", search['readings'])
+            
+            for i in pending:
+                zone_name, number = confirmed.get(i, (None, None))
+                self.zone_search.record(tried[i], zone_name)
+                ocr_zones[i] += len(tried[i])
+                if i in audited:
+                    recognizer.stats['audits'] += 1
+                    recognizer.stats['audit_agreements'] += int(number == audited[i])
+                elif recognizer is not None:
+                    recognizer.stats['rectangles_tesseract'] += 1
+                # Tesseract prévaut sur le classifieur en cas d'audit
+                if number:
+                    found[i] = number
+                    search['sources'][i] = 'tesseract'
+        
+        search['skipped_empty'] += self.zone_search.stats['skipped_empty'] - skipped_before[0]
+        search['skipped_covered'] += self.zone_search.stats['skipped_covered'] - skipped_before[1]
+        if verification is not None:
+            previous = search.get('verification', {})
+            for key in ('corrected', 'open_search', 'skipped'):
+                verification[key] = verification.get(key, 0) + previous.get(key, 0)
+            search['verification'] = verification
+    
+    def _mosaic_pass(self, rects: List[int], zones_per_rect: Dict[int, List[Tuple[str, Any]]],
+                     confirmed: Dict[int, Tuple[str, str]], tried: Dict[int, List[str]], whitelist: str,
+                     readings: List[Dict], candidates: set = None, numbers: set = None, assigned: set = None,
+                     verification: Dict = None):
+        """
+        Reconnaît en mosaïque les zones des rectangles sans numéro, par tranches.
+        
+        La zone la plus productive de chaque rectangle passe d'abord, puis les
+        autres zones des rectangles restés sans numéro. Avec des numéros
+        attendus (`candidates`), seule une lecture correspondant à un numéro
+        encore libre est retenue, et la recherche s'arrête dès que tous les
+        numéros de la page (`numbers`) sont attribués.
+        """
+        from ocr import get_ocr_engine
+        
+        for start, stop in self.zone_search.stages():
+            if numbers and numbers <= assigned:
+                break
+            batch = [(i, zones_per_rect[i][start:stop]) for i in rects if i not in confirmed]
+            batch = [(i, zones) for i, zones in batch if zones]
+            if not batch:
+                break
+            flat_zones = [pixels for _, zones in batch for _, pixels in zones]
+            texts = iter(get_ocr_engine().recognize_mosaic(flat_zones, whitelist=whitelist))
+            for i, zones in batch:
+                for zone_name, pixels in zones:
+                    tried[i].append(zone_name)
+                    text = next(texts)
+                    reading = {'rectangle': i, 'zone': zone_name, 'text': text,
+                               'source': 'tesseract', 'number': None}
+                    readings.append(reading)
+                    if i in confirmed:
+                        continue
+                    if candidates:
+                        number, corrected = self.match_expected(text, candidates - assigned)
+                        if corrected:
+                            verification['corrected'] += 1
+                    else:
+                        number = self.parse_number(text)
+                    reading['number'] = number
+                    if not number:
+                        continue
+                    confirmed[i] = (zone_name, number)
+                    if assigned is not None:
+                        assigned.add(number)
+                    self.logger.debug(f"🔍 Numéro détecté dans {zone_name}: {number}")
+                    if self.digit_recognizer is not None:
+                        self.digit_recognizer.learn(pixels, number)
+    
+    def match_expected(self, text: str, candidates: set) -> Tuple[Optional[str], bool]:
+        """
+        Numéro attendu lu dans le texte OCR d'une zone.
+        
+        Une lecture exacte est prise en priorité ; sinon une lecture à un
+        chiffre près d'un seul numéro attendu est corrigée (corrected=True).
+        """
+        readings = re.findall(r"\b\d{1,6}\b", text or "")
+        for reading in readings:
+            if reading in candidates:
+                return reading, False
+        for reading in readings:
+            close = [c for c in candidates
+                     if len(c) == len(reading) and sum(a != b for a, b in zip(c, reading)) == 1]
+            if len(close) == 1:
+                return close[0], True
+        return None, False
+    
+    @staticmethod
+    def rectangle_bbox(rectangle: Dict) -> Tuple[int, int, int, int]:
+        """(x, y, w, h) d'un rectangle de détecteur ('bbox') ou à plat"""
+        bbox = rectangle.get('bbox') or rectangle
+        return int(bbox['x']), int(bbox['y']), int(bbox['w']), int(bbox['h'])
+    
     def get_artist_name(self, pdf_path: str) -> str:
         """
         Extrait le nom de l'artiste depuis le nom du fichier PDF.
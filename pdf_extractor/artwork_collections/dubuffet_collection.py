@@ -73,6 +73,33 @@ class DubuffetCollection(BaseCollection):
             self._extraction_counter += 1
             return f"extraction_{self._extraction_counter:03d}"
     
+    def number_search_boxes(self, image_shape, rectangle: Dict) -> List[Tuple[str, Tuple[int, int, int, int]]]:
+        """Bande directement sous l'œuvre"""
+        x, y, w, h = self.rectangle_bbox(rectangle)
+        search_zone = self._get_dubuffet_search_zone(x, y, w, h, image_shape)
+        return [('bande_sous', search_zone)] if search_zone else []
+    
+    def prepare_zone(self, zone: np.ndarray) -> np.ndarray:
+        return self._preprocess_zone_for_ocr(zone)
+    
+    def parse_number(self, text: str) -> Optional[str]:
+        """1-3 chiffres en priorité, puis 1-6 chiffres"""
+        import re
+        for pattern in (r"\b\d{1,3}\b", r"\b\d{1,6}\b"):
+            matches = re.findall(pattern, text or "")
+            if matches:
+                return matches[0]
+        return None
+    
+    def resolve_number(self, number: Optional[str], rectangle: Dict, page_context: Dict) -> Optional[str]:
+        """Fallback séquentiel d'extraction si aucun numéro sous l'œuvre"""
+        if number:
+            return number
+        self._extraction_counter += 1
+        fallback_number = f"extraction_{self._extraction_counter:03d}"
+        self.logger.info(f"🔄 Fallback séquentiel: {fallback_number}")
+        return fallback_number
+    
     def _detect_artwork_number_dubuffet(self, image: np.ndarray, rectangle: Dict) -> Optional[str]:
         """
         Détecte le numéro d'œuvre spécifiquement pour Dubuffet.
@@ -86,18 +113,16 @@ class DubuffetCollection(BaseCollection):
             Numéro détecté ou None
         """
         try:
-            import pytesseract
             import re
+            from ocr import get_ocr_engine
             
-            # Vérifier la disponibilité de Tesseract
-            try:
-                _ = pytesseract.get_tesseract_version()
-            except Exception:
-                self.logger.warning("⚠️ Tesseract non disponible")
+            # Vérifier la disponibilité de Tesseract (sondée une seule fois)
+            ocr_engine = get_ocr_engine()
+            if not ocr_engine.available:
                 return None
             
             # Extraire les coordonnées
-            x, y, w, h = rectangle['x'], rectangle['y'], rectangle['w'], rectangle['h']
+            x, y, w, h = self.rectangle_bbox(rectangle)
             
             # Zone de recherche restrictive: directement sous l'œuvre
             search_zone = self._get_dubuffet_search_zone(x, y, w, h, image.shape)
@@ -116,9 +141,8 @@ class DubuffetCollection(BaseCollection):
             # Préprocessing pour améliorer la détection
             zone_processed = self._preprocess_zone_for_ocr(zone)
             
-            # OCR optimisé pour les numéros courts (1-3 chiffres en priorité)
-            config = "--psm 7 -c tessedit_char_whitelist=0123456789"
-            text = pytesseract.image_to_string(zone_processed, config=config)
+            # OCR optimisé pour les numéros courts (1-3 chiffres en priorité), via le pool OCR
+            text = ocr_engine.submit_recognize(zone_processed, psm=7, whitelist="0123456789").result()
             
             # Chercher des numéros de 1-3 chiffres en priorité, puis 1-6 chiffres
             patterns = [
@@ -72,13 +72,14 @@ class PicassoCollection(BaseCollection):
         """
         try:
             # Utiliser la méthode de détection existante
-            return self._detect_artwork_number_picasso(image, rectangle)
+            return self._detect_artwork_number_picasso(image, rectangle, page_context.get('rectangles', []))
             
         except Exception as e:
             self.logger.error(f"❌ Erreur lors de la détection du numéro: {e}")
             return None
     
-    def _detect_artwork_number_picasso(self, image: np.ndarray, rectangle: Dict) -> Optional[str]:
+    def _detect_artwork_number_picasso(self, image: np.ndarray, rectangle: Dict,
+                                       rectangles: List[Dict] = ()) -> Optional[str]:
         """
         Méthode de détection spécifique à Picasso.
         Utilise les zones de recherche optimisées.
@@ -86,49 +87,35 @@ class PicassoCollection(BaseCollection):
         Args:
             image: Image extraite
             rectangle: Coordonnées du rectangle
+            rectangles: Rectangles de la page (zones couvertes écartées)
             
         Returns:
             Numéro détecté ou None
         """
         try:
-            import pytesseract
-            import re
+            from ocr import get_ocr_engine
             
-            # Vérifier la disponibilité de Tesseract
-            try:
-                _ = pytesseract.get_tesseract_version()
-            except Exception:
-                self.logger.warning("⚠️ Tesseract non disponible")
+            # Vérifier la disponibilité de Tesseract (sondée une seule fois)
+            ocr_engine = get_ocr_engine()
+            if not ocr_engine.available:
                 return None
             
-            # Extraire les coordonnées
-            x, y, w, h = rectangle['x'], rectangle['y'], rectangle['w'], rectangle['h']
-            
-            # Définir les zones de recherche avec priorité stricte
-            search_zones = self._get_picasso_search_zones(x, y, w, h, image.shape)
-            
-            # Tester chaque zone dans l'ordre de priorité
-            for zone_name, (zone_x, zone_y, zone_w, zone_h) in search_zones.items():
-                if zone_w <= 0 or zone_h <= 0:
-                    continue
-                
-                # Extraire la zone
-                zone = image[zone_y:zone_y+zone_h, zone_x:zone_x+zone_w]
-                
-                if zone.size == 0:
-                    continue
-                
-                # OCR optimisé pour les numéros courts
-                config = "--psm 7 -c tessedit_char_whitelist=0123456789"
-                text = pytesseract.image_to_string(zone, config=config)
+            # Zones dans l'ordre d'essai (les plus productives du document d'abord),
+            # sans les zones vides ou couvertes par un autre rectangle
+            tried = []
+            for zone_name, zone in self.number_search_zones(image, rectangle, rectangles):
+                # OCR optimisé pour les numéros courts (pool OCR, zone suivante seulement si vide)
+                text = ocr_engine.submit_recognize(zone, psm=7, whitelist="0123456789").result()
+                tried.append(zone_name)
                 
                 # Chercher un numéro de 1-6 chiffres
-                match = re.search(r"\b\d{1,6}\b", text)
-                if match:
-                    number = match.group()
+                number = self.parse_number(text)
+                if number:
+                    self.zone_search.record(tried, zone_name)
                     self.logger.debug(f"🔍 Numéro détecté dans {zone_name}: {number}")
                     return number
             
+            self.zone_search.record(tried, None)
             self.logger.debug("🔍 Aucun numéro détecté dans les zones de recherche")
             return None
             
@@ -136,6 +123,11 @@ class PicassoCollection(BaseCollection):
             self.logger.error(f"❌ Erreur dans la détection Picasso: {e}")
             return None
     
+    def number_search_boxes(self, image_shape, rectangle: Dict) -> List[Tuple[str, Tuple[int, int, int, int]]]:
+        """Les 6 zones Picasso, dans leur ordre de priorité"""
+        x, y, w, h = self.rectangle_bbox(rectangle)
+        return list(self._get_picasso_search_zones(x, y, w, h, image_shape).items())
+    
     def _get_picasso_search_zones(self, x: int, y: int, w: int, h: int, 
                                  image_shape: Tuple[int, int, int]) -> Dict[str, Tuple[int, int, int, int]]:
         """
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Ordre adaptatif et tri à l'encre des zones de recherche des numéros.
+"""
+
+from typing import Dict, List, Optional, Tuple, Any
+
+import cv2
+import numpy as np
+
+from config import OCR_CONFIG
+
+
+class ZoneSearch:
+    """
+    Statistiques par document des zones qui donnent réellement les numéros.
+
+    Les zones sont réordonnées selon leur taux de réussite (lissé) dès que
+    assez de numéros ont été trouvés ; l'ordre de priorité de la collection
+    départage. Avant tout OCR, une zone sans encre (aucune composante de la
+    taille d'un chiffre) ou couverte par d'autres rectangles est écartée.
+    """
+
+    def __init__(self, config: Dict[str, Any] = None):
+        self.config = config or OCR_CONFIG.get('zone_search', {})
+        self.reset()
+
+    def reset(self):
+        """Nouveau document : taux de réussite et compteurs remis à zéro"""
+        self.yields: Dict[str, Dict[str, int]] = {}
+        self.stats = {'rectangles': 0, 'zones_ocr': 0, 'skipped_empty': 0, 'skipped_covered': 0}
+
+    def rate(self, zone_name: str) -> float:
+        """Part des essais où la zone a donné le numéro (lissage de Laplace)"""
+        counts = self.yields.get(zone_name, {})
+        return (counts.get('found', 0) + 1) / (counts.get('tried', 0) + 2)
+
+    @property
+    def ordered(self) -> bool:
+        """Assez de numéros trouvés pour réordonner les zones"""
+        found = sum(counts['found'] for counts in self.yields.values())
+        return self.config.get('adaptive', True) and found >= self.config.get('min_found', 20)
+
+    def order(self, zones: List[Tuple[str, Any]]) -> List[Tuple[str, Any]]:
+        """Zones triées par taux de réussite décroissant (ordre de la collection à égalité)"""
+        if not self.ordered:
+            return list(zones)
+        priority = {name: index for index, (name, _) in enumerate(zones)}
+        return sorted(zones, key=lambda zone: (-self.rate(zone[0]), priority[zone[0]]))
+
+    def stages(self) -> List[Tuple[int, Optional[int]]]:
+        """Tranches de zones reconnues ensemble : la meilleure zone seule, puis le reste"""
+        if not (self.config.get('staged', True) and self.ordered):
+            return [(0, None)]
+        best = max(self.rate(name) for name in self.yields)
+        return [(0, 1), (1, None)] if best >= self.config.get('stage_min_rate', 0.5) else [(0, None)]
+
+    def triage(self, zone: np.ndarray, box: Tuple[int, int, int, int],
+               other_boxes: List[Tuple[int, int, int, int]]) -> Optional[str]:
+        """Raison d'écarter la zone avant OCR ('couverte', 'vide') ou None"""
+        if not self.config.get('triage', True):
+            return None
+        if self.covered_ratio(box, other_boxes) >= self.config.get('max_covered_ratio', 0.5):
+            self.stats['skipped_covered'] += 1
+            return 'couverte'
+        if not self.has_digit_blob(zone):
+            self.stats['skipped_empty'] += 1
+            return 'vide'
+        return None
+
+    def has_digit_blob(self, zone: np.ndarray) -> bool:
+        """Au moins une composante sombre de la taille d'un chiffre"""
+        gray = cv2.cvtColor(zone, cv2.COLOR_BGR2GRAY) if zone.ndim == 3 else zone
+        if int(gray.max()) - int(gray.min()) < self.config.get('min_contrast', 40):
+            return False
+        _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+        count, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+        min_height = self.config.get('min_glyph_height', 5)
+        zone_area = gray.shape[0] * gray.shape[1]
+        for _, _, w, h, area in stats[1:]:
+            if min_height <= h and w <= 4 * h and area >= 0.15 * w * h and area < 0.5 * zone_area:
+                return True
+        return False
+
+    @staticmethod
+    def covered_ratio(box: Tuple[int, int, int, int], other_boxes: List[Tuple[int, int, int, int]]) -> float:
+        """Part de la zone recouverte par les autres rectangles de la page"""
+        x, y, w, h = box
+        if w <= 0 or h <= 0:
+            return 0.0
+        mask = np.zeros((h, w), np.uint8)
+        for ox, oy, ow, oh in other_boxes:
+            x1, y1 = max(x, ox), max(y, oy)
+            x2, y2 = min(x + w, ox + ow), min(y + h, oy + oh)
+            if x2 > x1 and y2 > y1:
+                mask[y1 - y:y2 - y, x1 - x:x2 - x] = 1
+        return float(mask.mean())
+
+    def record(self, tried: List[str], found_zone: Optional[str]):
+        """Résultat d'un rectangle : zones reconnues et zone qui a donné le numéro"""
+        self.stats['rectangles'] += 1
+        self.stats['zones_ocr'] += len(tried)
+        for zone_name in tried:
+            counts = self.yields.setdefault(zone_name, {'tried': 0, 'found': 0})
+            counts['tried'] += 1
+            counts['found'] += int(zone_name == found_zone)
+
+    def report(self) -> Dict[str, Any]:
+        """Statistiques du document : zones par rectangle, zones écartées, taux par zone"""
+        stats = dict(self.stats)
+        stats['ocr_per_rectangle'] = (round(stats['zones_ocr'] / stats['rectangles'], 2)
+                                      if stats['rectangles'] else None)
+        stats['zones'] = {name: dict(counts, rate=round(self.rate(name), 3))
+                          for name, counts in self.yields.items()}
+        stats['order'] = ([name for name, _ in self.order([(name, None) for name in self.yields])]
+                          if self.ordered else None)
+        return stats
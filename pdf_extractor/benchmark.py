@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Benchmarks de référence de l'extracteur
+
+Usage:
+    python benchmark.py presets corpus.pdf --pages 1-20 --reference <session_validee>
+    python benchmark.py codecs <dossier_de_decoupes>
+    python benchmark.py ocr picasso=<session_validee> dubuffet=<session_validee>
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.append(str(Path(__file__).parent))
+
+from config import THROUGHPUT_PRESETS
+
+# Formats candidats du benchmark d'encodage: (libellé, format, qualité)
+CODEC_CANDIDATES = [
+    ('png-1', 'png', 1),
+    ('png-3', 'png', 3),
+    ('png-6', 'png', 6),
+    ('webp-lossless', 'webp', None),
+    ('webp-90', 'webp', 90),
+    ('jpeg-95', 'jpeg', 95),
+    ('jpeg-85', 'jpeg', 85),
+]
+
+
+def parse_pages(pages: str) -> list:
+    """Parse une plage de pages '1-20' ou '1,5,9'"""
+    result = []
+    for part in pages.split(','):
+        if '-' in part:
+            start, end = part.split('-', 1)
+            result.extend(range(int(start), int(end) + 1))
+        else:
+            result.append(int(part))
+    return result
+
+
+def load_reference_boxes(session_dir: str) -> dict:
+    """Charge les bbox des images validées d'une session de référence.
+
+    Returns:
+        {page_number: {'dpi': int, 'boxes': [bbox, ...]}}
+    """
+    results_file = os.path.join(session_dir, "validation_results.json")
+    with open(results_file, 'r', encoding='utf-8') as f:
+        image_states = json.load(f).get('image_states', {})
+
+    validated = {}
+    for image_id, state in image_states.items():
+        if state != 'validated':
+            continue
+        page_part, filename = image_id.split('_', 1)
+        validated.setdefault(int(page_part.replace('page', '')), set()).add(filename)
+
+    reference = {}
+    for page_num, filenames in validated.items():
+        details_file = os.path.join(session_dir, f"page_{page_num:03d}", "page_ultra_details.json")
+        if not os.path.exists(details_file):
+            continue
+        with open(details_file, 'r', encoding='utf-8') as f:
+            details = json.load(f)
+        reference[page_num] = {
+            'dpi': int(details.get('dpi_used') or 400),
+            'boxes': [r['bbox'] for r in details.get('rectangles_details', [])
+                      if r.get('filename') in filenames and r.get('bbox')]
+        }
+    return reference
+
+
+def bbox_iou(a: dict, b: dict) -> float:
+    """IoU de deux bbox {x, y, w, h}"""
+    left, top = max(a['x'], b['x']), max(a['y'], b['y'])
+    right = min(a['x'] + a['w'], b['x'] + b['w'])
+    bottom = min(a['y'] + a['h'], b['y'] + b['h'])
+    if right <= left or bottom <= top:
+        return 0.0
+    inter = (right - left) * (bottom - top)
+    union = a['w'] * a['h'] + b['w'] * b['h'] - inter
+    return inter / union if union else 0.0
+
+
+def scale_bbox(bbox: dict, factor: float) -> dict:
+    return {k: int(round(bbox[k] * factor)) for k in ('x', 'y', 'w', 'h')}
+
+
+def bench_presets(args) -> str:
+    """Pages/min et rappel de chaque preset sur un corpus fixe.
+
+    Chaque preset part d'un cache OCR et d'un store de blobs vides dans son
+    dossier temporaire : ni le cache persistant ni `_blobs` ne sont réchauffés
+    (ou remplis) par le benchmark, et les presets sont mesurés à froid.
+    """
+    from core import PDFExtractor
+    from ocr import get_ocr_engine, OCRCache
+    from utils import BlobStore
+    from config import OCR_CONFIG
+
+    pages = parse_pages(args.pages)
+    reference = load_reference_boxes(args.reference) if args.reference else {}
+    engine = get_ocr_engine()
+    saved_cache = engine.cache
+    rows = []
+
+    try:
+        for preset_name in args.presets or list(THROUGHPUT_PRESETS):
+            found = expected = 0
+
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                # Attaché avant la création de l'extracteur, qui le reprend tel quel
+                engine.cache = (OCRCache(os.path.join(tmp_dir, "_ocr_cache.sqlite"))
+                                if OCR_CONFIG.get('cache', {}).get('enabled') else None)
+                extractor = PDFExtractor(preset=preset_name)
+                extractor.collection = extractor.collection_manager.get_collection(args.collection)
+                extractor.session_dir = tmp_dir
+                if extractor.blob_store:
+                    extractor.blob_store = BlobStore(os.path.join(tmp_dir, "_blobs"))
+                try:
+                    start = time.time()
+                    for page_num in pages:
+                        page_result = extractor.process_page(args.pdf, page_num)
+                        ref = reference.get(page_num)
+                        if not ref:
+                            continue
+                        factor = (page_result.get('dpi_used') or ref['dpi']) / ref['dpi']
+                        detected = [r['bbox'] for r in page_result.get('rectangles_details', [])]
+                        for box in ref['boxes']:
+                            expected += 1
+                            target = scale_bbox(box, factor)
+                            if any(bbox_iou(target, d) >= args.iou for d in detected):
+                                found += 1
+                    elapsed = time.time() - start
+                finally:
+                    extractor.image_writer.close()
+                    if engine.cache is not None:
+                        engine.cache.close()
+
+            rows.append({
+                'preset': preset_name,
+                'pages_per_min': round(len(pages) * 60 / elapsed, 2) if elapsed else 0.0,
+                'recall': round(found / expected, 3) if expected else None
+            })
+    finally:
+        engine.cache = saved_cache
+
+    lines = [
+        f"Corpus: {os.path.basename(args.pdf)} pages {args.pages}",
+        "",
+        "| Preset | Pages/min | Rappel |",
+        "|--------|-----------|--------|",
+    ]
+    for row in rows:
+        recall = f"{row['recall']:.1%}" if row['recall'] is not None else "n/a"
+        lines.append(f"| {row['preset']} | {row['pages_per_min']} | {recall} |")
+    return "\n".join(lines)
+
+
+def load_reference_crops(crops_dir: str, limit: int = None) -> list:
+    """Charge les découpes de référence (récursivement, sans miniatures ni aperçus)"""
+    import cv2
+    from utils import OutputFormats
+
+    crops = []
+    for root, _, files in os.walk(crops_dir):
+        for name in sorted(files):
+            if not OutputFormats.is_image_file(name):
+                continue
+            image = cv2.imread(os.path.join(root, name), cv2.IMREAD_COLOR)
+            if image is not None:
+                crops.append(image)
+            if limit and len(crops) >= limit:
+                return crops
+    return crops
+
+
+def bench_codecs(args) -> str:
+    """Temps d'encodage, de décodage et taille par format sur des découpes de référence"""
+    import cv2
+    from utils import OutputFormats
+
+    crops = load_reference_crops(args.crops_dir, args.limit)
+    if not crops:
+        return f"❌ Aucune découpe trouvée dans {args.crops_dir}"
+    megapixels = sum(c.shape[0] * c.shape[1] for c in crops) / 1e6
+
+    rows = []
+    for label, fmt, quality in CODEC_CANDIDATES:
+        ext = '.jpg' if fmt == 'jpeg' else f".{fmt}"
+        params = OutputFormats.encode_params(fmt, quality)
+        encode_time = decode_time = 0.0
+        total_bytes = 0
+        for crop in crops:
+            start = time.perf_counter()
+            ok, buffer = cv2.imencode(ext, crop, params)
+            encode_time += time.perf_counter() - start
+            if not ok:
+                raise RuntimeError(f"Encodage {label} impossible")
+            total_bytes += buffer.nbytes
+
+            start = time.perf_counter()
+            cv2.imdecode(buffer, cv2.IMREAD_COLOR)
+            decode_time += time.perf_counter() - start
+
+        rows.append((label, encode_time, decode_time, total_bytes))
+
+    lines = [
+        f"Découpes: {len(crops)} ({megapixels:.1f} Mpx) depuis {args.crops_dir}",
+        "",
+        "| Format | Encodage (ms/Mpx) | Décodage (ms/Mpx) | Taille (Ko/Mpx) |",
+        "|--------|-------------------|-------------------|-----------------|",
+    ]
+    for label, encode_time, decode_time, total_bytes in rows:
+        lines.append(f"| {label} | {encode_time * 1000 / megapixels:.1f} | "
+                     f"{decode_time * 1000 / megapixels:.1f} | {total_bytes / 1024 / megapixels:.0f} |")
+    return "\n".join(lines)
+
+
+def load_reference_numbers(session_dir: str) -> list:
+    """Pages d'une session avec les numéros servant de vérité terrain.
+
+    Seules les découpes validées comptent quand la session a été validée.
+    Sans `page_full_image.jpg` (pyramide activée), la page est re-rastérisée
+    depuis le PDF de la session au DPI de l'extraction.
+
+    Returns:
+        [(source de la page, [rectangle, ...]), ...]
+    """
+    from analyzers import DetectorAnalytics
+
+    analytics = DetectorAnalytics()
+    states = analytics._load_validation(session_dir)
+    pdf_path = None
+    global_log = os.path.join(session_dir, "extraction_ultra_complete.json")
+    if os.path.exists(global_log):
+        with open(global_log, 'r', encoding='utf-8') as f:
+            pdf_path = json.load(f).get('pdf_path')
+
+    pages = []
+    for page in analytics._load_pages(session_dir):
+        page_num = page.get('page_number')
+        source = {'preview': os.path.join(session_dir, f"page_{page_num:03d}", "page_full_image.jpg"),
+                  'pdf_path': pdf_path, 'page': page_num, 'dpi': page.get('dpi_used')}
+        if not os.path.exists(source['preview']):
+            source['preview'] = None
+            if not (pdf_path and os.path.exists(pdf_path) and source['dpi']):
+                continue
+        rects = [r for r in page.get('rectangles_details', [])
+                 if str(r.get('artwork_number') or '').isdigit() and r.get('bbox')
+                 and (not states or states.get(f"page{page_num}_{r.get('filename')}") == 'validated')]
+        if rects:
+            pages.append((source, rects))
+    return pages
+
+
+def load_reference_page(source: dict):
+    """Raster d'extraction d'une page de référence (aperçu, sinon PDF re-rastérisé)"""
+    import cv2
+    import numpy as np
+
+    if source['preview']:
+        return cv2.imread(source['preview'], cv2.IMREAD_COLOR)
+    from pdf2image import convert_from_path
+    images = convert_from_path(source['pdf_path'], dpi=source['dpi'],
+                               first_page=source['page'], last_page=source['page'])
+    return cv2.cvtColor(np.array(images[0]), cv2.COLOR_RGB2BGR)
+
+
+def bench_ocr(args) -> str:
+    """Précision et temps de lecture des numéros, avec et sans normalisation de résolution"""
+    from artwork_collections import CollectionManager
+    from ocr import get_ocr_engine, OCRNormalizer, PageWords
+    from config import OCR_CONFIG
+
+    engine = get_ocr_engine()
+    if not engine.available:
+        return "❌ Tesseract indisponible"
+    saved = (engine.normalizer, engine.cache)
+    engine.cache = None  # Mesurer la reconnaissance, pas le cache
+    manager = CollectionManager()
+    modes = [('brut', None), ('normalisé', OCRNormalizer())]
+    rows = []
+    try:
+        for spec in args.sessions:
+            collection_name, session_dir = spec.split('=', 1)
+            collection = manager.get_collection(collection_name)
+            pages = load_reference_numbers(session_dir)
+            for label, normalizer in modes:
+                engine.normalizer = normalizer
+                correct = total = 0
+                zone_time = page_time = 0.0
+                for source, rects in pages:
+                    page = load_reference_page(source)
+                    start = time.perf_counter()
+                    numbers = collection.detect_artwork_numbers(page, rects, {})
+                    zone_time += time.perf_counter() - start
+                    total += len(rects)
+                    correct += sum(str(n) == str(r['artwork_number']) for n, r in zip(numbers, rects))
+                    if args.page_ocr:
+                        start = time.perf_counter()
+                        engine.words(PageWords.preprocess(page), OCR_CONFIG['page_words']['psm'])
+                        page_time += time.perf_counter() - start
+                rows.append((collection_name, label, len(pages), total,
+                             correct / total if total else None,
+                             zone_time / len(pages) if pages else 0.0,
+                             page_time / len(pages) if pages and args.page_ocr else None))
+    finally:
+        engine.normalizer, engine.cache = saved
+
+    lines = [
+        "| Collection | Entrée OCR | Pages | Numéros | Précision | Numéros (s/page) | OCR page (s/page) |",
+        "|------------|------------|-------|---------|-----------|------------------|-------------------|",
+    ]
+    for name, label, n_pages, total, accuracy, zone_s, page_s in rows:
+        accuracy = f"{accuracy:.1%}" if accuracy is not None else "n/a"
+        page_s = f"{page_s:.2f}" if page_s is not None else "-"
+        lines.append(f"| {name} | {label} | {n_pages} | {total} | {accuracy} | {zone_s:.2f} | {page_s} |")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Point d'entrée des benchmarks"""
+    parser = argparse.ArgumentParser(description="Benchmarks de l'extracteur PDF")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    presets = subparsers.add_parser('presets', help="Débit et rappel par preset")
+    presets.add_argument('pdf', help="PDF du corpus de référence")
+    presets.add_argument('--pages', required=True, help="Pages à traiter (ex: 1-20)")
+    presets.add_argument('--reference', help="Session validée servant de vérité terrain")
+    presets.add_argument('--collection', default='picasso')
+    presets.add_argument('--presets', nargs='*', choices=sorted(THROUGHPUT_PRESETS))
+    presets.add_argument('--iou', type=float, default=0.5)
+    presets.set_defaults(func=bench_presets)
+
+    codecs = subparsers.add_parser('codecs', help="Coût d'encodage et taille par format")
+    codecs.add_argument('crops_dir', help="Dossier de découpes de référence (ex: une session)")
+    codecs.add_argument('--limit', type=int, help="Nombre max de découpes")
+    codecs.set_defaults(func=bench_codecs)
+
+    ocr = subparsers.add_parser('ocr', help="Précision/temps OCR des numéros, brut et normalisé")
+    ocr.add_argument('sessions', nargs='+',
+                     help="collection=session validée (ex: picasso=extractions_ultra/<session>)")
+    ocr.add_argument('--page-ocr', action='store_true', help="Mesurer aussi l'OCR pleine page")
+    ocr.set_defaults(func=bench_ocr)
+
+    args = parser.parse_args(argv)
+    print(args.func(args))
+
+
+if __name__ == "__main__":
+    main()
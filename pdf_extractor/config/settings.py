@@ -44,9 +44,53 @@ DETECTION_CONFIG = {
     ],
     'max_rectangles_per_config': 50,
     'min_image_size': (20, 20),
-    'thumbnail_size': 200
+    'thumbnail_size': 200,
+    # Résolution des détections imbriquées (cadre > image > sous-zone)
+    'containment': {
+        'policy': 'outermost',  # 'outermost', 'innermost' ou 'best_score'
+        'tolerance': 4,          # marge en pixels pour la contenance
+        'min_area_ratio': 0.2    # enfant plus petit = pas une variante imbriquée
+    }
 }
 
+# Presets de débit : détecteurs, configs Ultra, DPI, OCR pleine page et encodage
+# - min_dpi/max_dpi : bornes appliquées au DPI recommandé pour la page
+# - page_ocr : 'full' (OCR pleine page des pages candidates au sommaire) ou 'none'
+# - png_compression : niveau PNG des découpes (None = défaut OpenCV)
+THROUGHPUT_PRESETS = {
+    'ultra': {
+        'mode': 'ULTRA_SENSIBLE',
+        'detectors': ['ultra_detector', 'template_detector', 'color_detector'],
+        'ultra_configs': None,  # toutes
+        'min_dpi': 400,
+        'max_dpi': None,
+        'page_ocr': 'full',
+        'png_compression': None,
+        'save_page_image': True
+    },
+    'balanced': {
+        'mode': 'BALANCED',
+        'detectors': ['ultra_detector', 'color_detector'],
+        'ultra_configs': ['ultra_high_contrast', 'ultra_documents', 'ultra_adaptive'],
+        'min_dpi': 300,
+        'max_dpi': 300,
+        'page_ocr': 'full',
+        'png_compression': 1,
+        'save_page_image': True
+    },
+    'fast': {
+        'mode': 'FAST',
+        'detectors': ['ultra_detector'],
+        'ultra_configs': ['ultra_adaptive'],
+        'min_dpi': 200,
+        'max_dpi': 200,
+        'page_ocr': 'none',
+        'png_compression': 1,
+        'save_page_image': False
+    }
+}
+DEFAULT_PRESET = 'ultra'
+
 # Configuration OCR
 OCR_CONFIG = {
     'psm_configs': [
@@ -54,9 +98,155 @@ OCR_CONFIG = {
         '--psm 6 -c tessedit_char_whitelist=0123456789NnOo°figFIGPlpl.:',
         '--psm 8 -c tessedit_char_whitelist=0123456789',
     ],
-    'scale_factor': 3.0,
+    'scale_factor': 3.0,   # Historique (agrandissement fixe), remplacé par 'normalize'
     'max_number_length': 4,
-    'min_number_length': 1
+    'min_number_length': 1,
+    'engine': 'auto',   # auto (tesserocr puis pytesseract), tesserocr ou pytesseract
+    'lang': 'eng',
+    # Résolution effective : chaque image OCR ramenée à une hauteur de caractère cible
+    'normalize': {
+        'enabled': True,
+        'target_text_height': 30,   # px (hauteur médiane des caractères)
+        'min_scale': 0.25,
+        'max_scale': 4.0,
+        'tolerance': 0.15           # Pas de rééchantillonnage si |facteur - 1| <= tolérance
+    },
+    # Numéros d'œuvres : toutes les zones d'une page dans une seule image OCR
+    'mosaic': {
+        'enabled': True,
+        'psm': 11,       # Texte épars
+        'padding': 24    # Séparation blanche entre zones (px)
+    },
+    # OCR pleine page unique (sommaire + numéros par jointure spatiale)
+    'page_words': {
+        'psm': 3,                # Segmentation automatique (légendes éparses comprises)
+        'zone_fallback': False   # True : mosaïque pour les rectangles restés sans numéro
+    },
+    # Couche texte des PDF nés numériques, lue avant tout OCR
+    'text_layer': {
+        'enabled': True,
+        'min_words': 3   # En dessous, la page est traitée comme scannée (OCR)
+    },
+    # Zones de recherche des numéros : ordre appris par document, zones vides/couvertes écartées
+    'zone_search': {
+        'adaptive': True,
+        'min_found': 20,            # Numéros trouvés avant de réordonner les zones
+        'staged': True,             # Mosaïque : meilleure zone d'abord, puis les autres
+        'stage_min_rate': 0.5,      # Taux de réussite minimal de la meilleure zone
+        'triage': True,
+        'min_contrast': 40,         # Écart de niveaux de gris sous lequel la zone est vide
+        'min_glyph_height': 5,      # px
+        'max_covered_ratio': 0.5    # Part de la zone couverte par d'autres rectangles
+    },
+    # Numéros lus par un kNN appris sur les chiffres confirmés par Tesseract
+    'digits': {
+        'enabled': True,
+        'k': 3,
+        'glyph_size': 16,              # Glyphes ramenés à 16 × 16
+        'min_samples': 40,             # Exemples avant la première lecture sans Tesseract
+        'max_samples_per_digit': 50,
+        'audit_every': 10,             # Une lecture sur N vérifiée par Tesseract
+        'distance_margin': 1.5,        # Seuil = 95e centile des distances intra-chiffre × marge
+        'min_distance': 4.0
+    },
+    # Cache disque des résultats (pixels + configuration), partagé entre sessions
+    'cache': {
+        'enabled': True,
+        'file': '_ocr_cache.sqlite',   # Dans OUTPUT_BASE_DIR
+        'max_entries': 200000,
+        'max_mb': 256                  # Éviction LRU au-delà
+    },
+    # Processus OCR dédiés (OCR pleine page et sommaire pendant la détection)
+    'pool': {
+        'workers': 2,           # 0 : OCR dans le processus principal
+        'omp_thread_limit': 1,  # Threads OpenMP par processus Tesseract (pas de sursouscription)
+        'overlap_pages': True   # Fin de page N (numéros, JSON) pendant la détection de N+1
+    }
+}
+
+# Configuration des sorties
+OUTPUT_CONFIG = {
+    'writer_workers': 2,      # Threads d'encodage PNG/JPEG
+    'writer_queue_size': 8,   # Images en attente max (plafonne la mémoire)
+    # Format par artefact. quality: niveau 0-9 (png, None = preset),
+    # 1-100 (jpeg), 1-100 ou None = sans perte (webp)
+    'formats': {
+        'crop': {'format': 'png', 'quality': None},          # png, webp ou jpeg
+        'thumbnail': {'format': 'jpeg', 'quality': 85},      # jpeg ou webp
+        'page_preview': {'format': 'jpeg', 'quality': 90}    # jpeg
+    },
+    # Découpes stockées par empreinte dans OUTPUT_BASE_DIR/<dir>, liées dans les sessions
+    'blob_store': {
+        'enabled': True,
+        'dir': '_blobs'
+    },
+    # Pyramide DeepZoom servie par l'interface (presets avec save_page_image),
+    # remplace page_full_image.jpg quand elle est activée
+    'pyramid': {
+        'enabled': True,
+        'max_side': 2048,             # Côté max du niveau le plus haut (aperçu serveur : 1600 px)
+        'tile_size': 256,
+        'overlap': 1,
+        'quality': 85
+    },
+    # Manifeste SQLite de la session (pages, rectangles, œuvres, OCR, validation)
+    'session_db': {
+        'enabled': True
+    },
+    # Exports historiques, redondants avec le manifeste SQLite
+    'exports': {
+        'page_json': True,            # page_XXX/page_ultra_details.json
+        'page_readme': True,          # page_XXX/README_ULTRA.txt
+        'doubtful_info': True,        # DOUTEUX/*_INFO.txt
+        'artwork_store': True,        # artworks.jsonl + artworks.idx.json (accès par id)
+        'individual_artworks': False  # individual_artworks/<id>.json (un fichier par œuvre)
+    }
+}
+
+# Configuration de l'analyse de qualité
+QUALITY_CONFIG = {
+    'sample_max_side': 512  # Côté max de l'échantillon utilisé pour les métriques pixel
+}
+
+# Configuration des quasi-doublons (même œuvre reproduite plusieurs fois)
+DUPLICATE_CONFIG = {
+    'hash_size': 8,                       # dHash de 64 bits
+    'max_distance': 10,                   # Distance de Hamming max entre doublons
+    'index_file': '_phash_index.json',    # Index partagé entre volumes (dans OUTPUT_BASE_DIR)
+    'skip_reasons': ['image_vide', 'peu_de_contenu', 'pas_de_contours']
+}
+
+# Pré-filtre des pages de sommaire : l'OCR pleine page n'est lancé que sur les
+# pages candidates (page de la table des planches, mots-clés de la couche texte,
+# densité de lignes de texte, pages de début/fin de volume)
+SUMMARY_PRESCREEN_CONFIG = {
+    'enabled': True,
+    'keywords': ['sommaire', 'table des matières', 'table des planches', 'liste des planches',
+                 'index', 'contents', 'list of plates'],
+    'analysis_width': 800,       # Largeur de l'image réduite analysée (px)
+    'min_text_lines': 14,        # Lignes de texte suffisantes n'importe où dans le volume
+    'edge_pages': 6,             # Pages de début/fin de volume (sommaires habituels)
+    'edge_min_text_lines': 6     # Seuil réduit pour ces pages
+}
+
+# Vérification guidée par la table des planches : numéros attendus sur chaque page
+# (page imprimée de la planche + décalage appris avec les pages du PDF)
+TOC_VERIFICATION_CONFIG = {
+    'enabled': True,
+    'page_offset': None,     # Décalage page PDF - page imprimée ; None : appris
+    'offset_window': 8,      # Derniers numéros confirmés pris en compte
+    'min_votes': 2,          # Numéros confirmés concordants avant la vérification
+    'min_vote_ratio': 0.6,
+    'page_slack': 1          # Pages imprimées voisines admises (planches en regard)
+}
+
+# Suite des numéros sur tout le document : numéros intérieurs d'une page déduits
+# quand le premier et le dernier rectangle (ordre de lecture) confirment la prédiction
+SEQUENCE_CONFIG = {
+    'enabled': True,
+    'min_rectangles': 3,     # Rectangles sur la page pour lire seulement les extrêmes
+    'max_jump': 50,          # Saut maximal accepté entre deux pages
+    'reset_after': 2         # Pages incohérentes consécutives avant de repartir de zéro
 }
 
 # Configuration de cohérence
@@ -6,6 +6,8 @@ import cv2
 import numpy as np
 import json
 import time
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from pdf2image import convert_from_path
@@ -17,15 +19,25 @@ from pathlib import Path
 # Ajouter le répertoire parent au path pour les imports
 sys.path.append(str(Path(__file__).parent.parent))
 
-from utils import logger, FileUtils, ImageUtils
-from config import OUTPUT_BASE_DIR, DETECTION_CONFIG
+from utils import (logger, FileUtils, ImageUtils, ImageWriterPool, OutputFormats, CropRef,
+                   PagePyramid, BlobStore, SessionDB)
+from config import (OUTPUT_BASE_DIR, DETECTION_CONFIG, THROUGHPUT_PRESETS, DEFAULT_PRESET,
+                    OUTPUT_CONFIG, DUPLICATE_CONFIG, OCR_CONFIG, SUMMARY_PRESCREEN_CONFIG,
+                    TOC_VERIFICATION_CONFIG, SEQUENCE_CONFIG)
 from detectors.ultra_detector import UltraDetector
 from detectors.template_detector import TemplateDetector
 from detectors.color_detector import ColorDetector
+from detectors.base_detector import BaseDetector
+from detectors.containment import ContainmentTree
 from analyzers.coherence_analyzer import CoherenceAnalyzer
 from analyzers.quality_analyzer import QualityAnalyzer
 from analyzers.summary_analyzer import SummaryAnalyzer
+from analyzers.summary_prescreen import SummaryPrescreen
+from analyzers.expected_plates import ExpectedPlates
+from analyzers.number_sequence import NumberSequence
 from analyzers.final_json_generator import FinalJSONGenerator
+from analyzers.duplicate_index import DuplicateIndex
+from ocr import get_ocr_engine, OCRCache, PageWords
 from toc_planches import (extract_toc_from_pdf, extract_toc_from_pdf_multipage, build_plate_map, 
                          save_toc_json, apply_renaming, prompt_for_renaming, 
                          extract_artist_name_from_pdf, create_artwork_jsons_for_images)
@@ -34,25 +46,66 @@ from artwork_collections import CollectionManager
 class PDFExtractor:
     """Extracteur PDF principal avec architecture modulaire"""
     
-    def __init__(self):
+    def __init__(self, preset: str = None, output_formats: dict = None):
         self.output_base_dir = OUTPUT_BASE_DIR
         self.session_dir = None
         self.total_extracted = 0
         
+        # Preset de débit (ultra, balanced, fast)
+        self.preset_name = preset or DEFAULT_PRESET
+        if self.preset_name not in THROUGHPUT_PRESETS:
+            raise ValueError(f"Preset inconnu: {self.preset_name} "
+                             f"(disponibles: {', '.join(THROUGHPUT_PRESETS)})")
+        self.preset = THROUGHPUT_PRESETS[self.preset_name]
+        
+        # Formats de sortie (OUTPUT_CONFIG['formats'] + surcharges CLI)
+        self.output_formats = OutputFormats(output_formats, self.preset.get('png_compression'))
+        
         # NOUVEAU: Système de collections
         self.collection_manager = CollectionManager()
         self.collection = None
         
         # Initialiser les composants
-        self.detectors = [
-            UltraDetector(),
+        available_detectors = [
+            UltraDetector(self.preset['ultra_configs']),
             TemplateDetector(),
             ColorDetector()
         ]
+        self.detectors = [d for d in available_detectors if d.name in self.preset['detectors']]
         self.coherence_analyzer = CoherenceAnalyzer()
         self.quality_analyzer = QualityAnalyzer()
         self.summary_analyzer = SummaryAnalyzer()
+        self.summary_prescreen = SummaryPrescreen()
+        self.expected_plates = None
+        self.number_sequence = NumberSequence() if SEQUENCE_CONFIG.get('enabled', True) else None
         self.final_json_generator = FinalJSONGenerator()
+        self.containment_tree = ContainmentTree()
+        self.image_writer = ImageWriterPool(OUTPUT_CONFIG['writer_workers'],
+                                            OUTPUT_CONFIG['writer_queue_size'])
+        self.page_pyramid = PagePyramid()
+        blob_config = OUTPUT_CONFIG.get('blob_store', {})
+        self.blob_store = (BlobStore(os.path.join(self.output_base_dir, blob_config.get('dir', '_blobs')))
+                           if blob_config.get('enabled') else None)
+        # Manifeste SQLite ouvert par extract_pdf ; fichiers JSON/texte optionnels
+        self.session_db = None
+        self.exports = OUTPUT_CONFIG.get('exports', {})
+        # Document PyMuPDF gardé ouvert pour la couche texte (chemin, document)
+        self._text_layer_doc = None
+        # Document partagé entre la détection et le thread de fin de page
+        self._text_layer_lock = threading.Lock()
+        # Contexte du volume pour le pré-filtre des sommaires
+        self.total_pdf_pages = None
+        self.toc_pages = set()
+        # Cache OCR persistant, attaché au moteur partagé
+        cache_config = OCR_CONFIG.get('cache', {})
+        self.ocr_cache = None
+        if cache_config.get('enabled'):
+            ocr_engine = get_ocr_engine()
+            if ocr_engine.cache is None:
+                ocr_engine.attach_cache(OCRCache(
+                    os.path.join(self.output_base_dir, cache_config.get('file', '_ocr_cache.sqlite')),
+                    cache_config.get('max_entries', 200000), cache_config.get('max_mb', 256)))
+            self.ocr_cache = ocr_engine.cache
         
         # Configuration Tesseract
         self._configure_tesseract()
@@ -77,7 +130,7 @@ class PDFExtractor:
             logger.error(f"❌ Fichier non trouvé: {pdf_path}")
             return False
         
-        logger.info(f"🚀 EXTRACTION ULTRA SENSIBLE: {os.path.basename(pdf_path)}")
+        logger.info(f"🚀 EXTRACTION {self.preset['mode']}: {os.path.basename(pdf_path)}")
         
         # Créer la session
         pdf_name = os.path.basename(pdf_path)
@@ -106,9 +159,16 @@ class PDFExtractor:
         toc_data = self.collection.extract_toc(pdf_path)
         plate_map = {}
         
+        self.total_pdf_pages = total_pdf_pages
+        self.toc_pages = set()
+        self.expected_plates = None
         if toc_data:
             plate_map = build_plate_map(toc_data)
             save_toc_json(toc_data, self.session_dir)
+            self.expected_plates = ExpectedPlates(plate_map) if TOC_VERIFICATION_CONFIG.get('enabled') else None
+            self.toc_pages = {p + 1 for p in toc_data.get('all_source_pages', [])}
+            if toc_data.get('source_page_index') is not None:
+                self.toc_pages.add(toc_data['source_page_index'] + 1)
             logger.info(f"📋 {len(plate_map)} planches mappées")
             
             # Afficher les pages disponibles
@@ -189,7 +249,9 @@ class PDFExtractor:
             'pdf_name': pdf_name,
             'pdf_path': os.path.abspath(pdf_path),
             'session_dir': self.session_dir,
-            'mode': 'ULTRA_SENSIBLE',
+            'mode': self.preset['mode'],
+            'preset': self.preset_name,
+            'output_formats': self.output_formats.describe(),
             'start_time': datetime.now().isoformat(),
             'total_pages': total_pages,
             'start_page': start_page,
@@ -198,51 +260,79 @@ class PDFExtractor:
             'plate_count': len(plate_map) if plate_map else 0,
             'pages': []
         }
+        self.final_json_generator.reset()
+        digit_recognizer = getattr(self.collection, 'digit_recognizer', None)
+        zone_search = getattr(self.collection, 'zone_search', None)
+        if zone_search:
+            self.collection.reset_number_search()
+        if self.number_sequence:
+            self.number_sequence.reset()
+        if OUTPUT_CONFIG.get('session_db', {}).get('enabled'):
+            self.session_db = SessionDB(self.session_dir)
+            self.session_db.set_session(global_log)
         
-        # Traiter chaque page
-        for idx, page_num in enumerate(range(start_page, end_page + 1), start=1):
-            logger.info(f"📄 Traitement page {page_num} ({idx}/{total_pages})")
-            try:
-                page_result = self.process_page(pdf_path, page_num)
-                global_log['pages'].append(page_result)
+        # Traiter chaque page : la fin d'une page (numéros, cohérence, JSON) tourne dans
+        # un thread dédié pendant le rendu et la détection de la page suivante
+        finisher = (ThreadPoolExecutor(max_workers=1, thread_name_prefix="page-finisher")
+                    if OCR_CONFIG.get('pool', {}).get('overlap_pages', True) else None)
+        in_flight = None  # (numéro de page, Future du résultat de `_finish_page`)
+        try:
+            for idx, page_num in enumerate(range(start_page, end_page + 1), start=1):
+                logger.info(f"📄 Traitement page {page_num} ({idx}/{total_pages})")
+                try:
+                    state = self._start_page(pdf_path, page_num)
+                except Exception as e:
+                    state = e
                 
-                if page_result['success']:
-                    self.total_extracted += page_result['images_extracted']
-                    logger.info(f"  ✅ Page {page_num}: {page_result['images_extracted']} images capturées")
-            except Exception as e:
-                logger.error(f"  ❌ Erreur page {page_num}: {e}")
-                # Ajouter une page d'erreur même en cas d'échec
-                error_page = {
-                    'page_number': page_num,
-                    'success': False,
-                    'images_extracted': 0,
-                    'error': str(e),
-                    'start_time': datetime.now().isoformat(),
-                    'end_time': datetime.now().isoformat()
-                }
-                global_log['pages'].append(error_page)
-            
-            # Sauvegarder le log global après CHAQUE page (pour éviter la perte en cas d'interruption)
-            global_log['end_time'] = datetime.now().isoformat()
-            global_log['total_images_extracted'] = self.total_extracted
-            global_log['success_pages'] = len([p for p in global_log['pages'] if p['success']])
-            global_log['failed_pages'] = len([p for p in global_log['pages'] if not p['success']])
-            
-            # Sauvegarder le log global (mise à jour continue)
-            global_log_path = os.path.join(self.session_dir, "extraction_ultra_complete.json")
-            with open(global_log_path, 'w', encoding='utf-8') as f:
+                # Page précédente : son OCR a avancé pendant la détection de celle-ci
+                if in_flight is not None:
+                    self._record_page(global_log, *in_flight, digit_recognizer, zone_search)
+                in_flight = (page_num, self._submit_finish(finisher, state))
+            
+            if in_flight is not None:
+                self._record_page(global_log, *in_flight, digit_recognizer, zone_search)
+        finally:
+            if finisher is not None:
+                finisher.shutdown(wait=True)
+        
+        if self.blob_store:
+            stats = self.blob_store.stats
+            logger.info(f"🧱 Blobs: {stats['written']} écrits, {stats['reused']} réutilisés")
+        
+        # Regrouper les reproductions d'une même œuvre (dans la session et entre volumes)
+        try:
+            duplicate_index = DuplicateIndex(os.path.join(self.output_base_dir,
+                                                          DUPLICATE_CONFIG['index_file']))
+            global_log['duplicate_groups'] = duplicate_index.assign_groups(
+                global_log, os.path.basename(self.session_dir))
+            duplicate_index.save()
+            if self.session_db:
+                self.session_db.set_duplicate_groups(global_log['duplicate_groups'])
+            with open(os.path.join(self.session_dir, "extraction_ultra_complete.json"), 'w',
+                      encoding='utf-8') as f:
                 json.dump(global_log, f, indent=2, ensure_ascii=False)
+        except Exception as e:
+            logger.error(f"❌ Erreur index des quasi-doublons: {e}")
         
         # Créer le résumé texte
         self._create_text_summary(global_log)
         
+        # Toutes les pages ont attendu leurs écritures : arrêter les threads d'encodage
+        self.image_writer.close()
+        
         # NOUVEAU : Générer le JSON final pour l'interface web
         logger.info("🎯 Génération du JSON final pour l'interface web...")
         try:
-            final_data = self.final_json_generator.generate_final_json(global_log, self.session_dir)
+            final_data = self.final_json_generator.finalize(global_log, self.session_dir)
+            
+            if self.session_db:
+                self.session_db.write_artworks(final_data['artworks'])
             
-            # Créer des JSON individuels
-            self.final_json_generator.create_individual_jsons(final_data, self.session_dir)
+            # Fiches d'œuvres : JSONL indexé, fichiers individuels sur demande
+            if self.exports.get('artwork_store', True):
+                self.final_json_generator.create_artwork_store(final_data, self.session_dir)
+            if self.exports.get('individual_artworks', False):
+                self.final_json_generator.create_individual_jsons(final_data, self.session_dir)
             
             # Créer le rapport de synthèse
             self.final_json_generator.create_summary_report(final_data, self.session_dir)
@@ -251,6 +341,28 @@ class PDFExtractor:
         except Exception as e:
             logger.error(f"❌ Erreur génération JSON final: {e}")
         
+        if self.session_db:
+            self.session_db.close()
+            self.session_db = None
+        self._close_text_layer()
+        get_ocr_engine().shutdown_pool()
+        if self.ocr_cache:
+            stats = self.ocr_cache.snapshot()
+            if stats['hits'] or stats['misses']:
+                logger.info(f"🗃️ Cache OCR: {stats['hits']} réutilisations, "
+                            f"{stats['misses']} reconnaissances")
+            self.ocr_cache.close()
+        if digit_recognizer:
+            digits = digit_recognizer.report()
+            if digits['rectangles_knn'] or digits['rectangles_tesseract']:
+                logger.info(f"🔢 Chiffres appris: {digits['rectangles_knn']} rectangles sans Tesseract, "
+                            f"{digits['rectangles_tesseract']} via Tesseract, "
+                            f"précision auditée {digits['audit_accuracy']}")
+        if zone_search and zone_search.stats['rectangles']:
+            search = zone_search.report()
+            logger.info(f"🔎 Zones de numéros: {search['ocr_per_rectangle']} zones OCR par rectangle, "
+                        f"{search['skipped_empty']} vides et {search['skipped_covered']} couvertes écartées")
+        
         logger.info(f"🎉 EXTRACTION TERMINÉE: {self.total_extracted} images extraites")
         logger.info(f"📁 Résultats: {self.session_dir}")
         
@@ -326,8 +438,87 @@ class PDFExtractor:
             logger.warning(f"⚠️ Format invalide: {user_input}. Utilisation de toutes les pages.")
             return 1, total_pages
     
+    def _submit_finish(self, finisher, state) -> Future:
+        """Fin de page confiée au thread dédié (ou exécutée ici sans recouvrement)"""
+        if finisher is not None and not isinstance(state, Exception):
+            return finisher.submit(self._finish_page, state)
+        future = Future()
+        try:
+            if isinstance(state, Exception):
+                raise state
+            future.set_result(self._finish_page(state))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+    
+    def _record_page(self, global_log: dict, page_num: int, finishing: Future,
+                     digit_recognizer=None, zone_search=None):
+        """Attend la fin d'une page puis l'ajoute au log global, au manifeste et au JSON final"""
+        ocr_readings = []
+        try:
+            page_result = finishing.result()
+            # Lectures OCR brutes : manifeste SQLite seulement (pas dans le log global)
+            ocr_readings = page_result.pop('ocr_readings', [])
+            global_log['pages'].append(page_result)
+            
+            if page_result['success']:
+                self.total_extracted += page_result['images_extracted']
+                logger.info(f"  ✅ Page {page_num}: {page_result['images_extracted']} images capturées")
+        except Exception as e:
+            logger.error(f"  ❌ Erreur page {page_num}: {e}")
+            # Ajouter une page d'erreur même en cas d'échec
+            error_page = {
+                'page_number': page_num,
+                'success': False,
+                'images_extracted': 0,
+                'error': str(e),
+                'start_time': datetime.now().isoformat(),
+                'end_time': datetime.now().isoformat()
+            }
+            global_log['pages'].append(error_page)
+            page_result = error_page
+        
+        # Sauvegarder le log global après CHAQUE page (pour éviter la perte en cas d'interruption)
+        global_log['end_time'] = datetime.now().isoformat()
+        global_log['total_images_extracted'] = self.total_extracted
+        global_log['success_pages'] = len([p for p in global_log['pages'] if p['success']])
+        global_log['failed_pages'] = len([p for p in global_log['pages'] if not p['success']])
+        if digit_recognizer:
+            global_log['digit_recognizer'] = digit_recognizer.report()
+        if zone_search:
+            global_log['number_search'] = zone_search.report()
+        if self.expected_plates:
+            global_log['toc_verification'] = self.expected_plates.report()
+        if self.number_sequence:
+            global_log['number_sequence'] = self.number_sequence.report()
+        
+        # Sauvegarder le log global (mise à jour continue)
+        global_log_path = os.path.join(self.session_dir, "extraction_ultra_complete.json")
+        with open(global_log_path, 'w', encoding='utf-8') as f:
+            json.dump(global_log, f, indent=2, ensure_ascii=False)
+        
+        # Manifeste des découpes stockées par empreinte
+        if self.blob_store:
+            self.blob_store.save_manifest(self.session_dir)
+            global_log['blob_store'] = dict(self.blob_store.stats)
+        
+        # Page et compteurs dans le manifeste SQLite (une transaction)
+        if self.session_db:
+            self.session_db.write_page(page_result, global_log, ocr_readings)
+        
+        # Œuvres de la page pour le JSON final (sans relire les images)
+        self.final_json_generator.add_page(page_result)
+    
     def process_page(self, pdf_path: str, page_num: int) -> dict:
         """Traite une page spécifique"""
+        return self._finish_page(self._start_page(pdf_path, page_num))
+    
+    def _start_page(self, pdf_path: str, page_num: int) -> dict:
+        """Rendu, détection et découpes d'une page ; OCR pleine page confié au pool.
+        
+        Returns:
+            État de la page repris par `_finish_page` (numéros, cohérence, écritures)
+        """
         page_start_time = time.time()
         
         # Créer le dossier de la page
@@ -337,7 +528,7 @@ class PDFExtractor:
             'page_number': page_num,
             'page_dir': page_dir,
             'start_time': datetime.now().isoformat(),
-            'mode': 'ULTRA_SENSIBLE',
+            'mode': self.preset['mode'],
             'success': False,
             'images_extracted': 0,
             'rectangles_found': 0,
@@ -346,13 +537,25 @@ class PDFExtractor:
             'error': None
         }
         
+        # Écritures asynchrones de la page (découpes suivies à part pour size_kb)
+        pending_writes = []
+        crop_writes = []
+        state = {
+            'page_result': page_result,
+            'page_dir': page_dir,
+            'page_start_time': page_start_time,
+            'pending_writes': pending_writes,
+            'crop_writes': crop_writes,
+            'ocr_cache_before': self.ocr_cache.snapshot() if self.ocr_cache else None
+        }
+        
         try:
             # Analyser les dimensions de la page
             page_analysis = self._analyze_page_dimensions(pdf_path, page_num)
             page_result['page_analysis'] = page_analysis
             
-            # Convertir la page avec DPI élevé
-            high_dpi = max(400, page_analysis['recommended_dpi'])
+            # Convertir la page au DPI du preset
+            high_dpi = self._select_dpi(page_analysis['recommended_dpi'])
             logger.info(f"  📏 Page {page_num}: {page_analysis['page_format']} → DPI {high_dpi}")
             
             # DEBUG: Log pour vérifier la cohérence des numéros de pages
@@ -376,21 +579,55 @@ class PDFExtractor:
             page_result['image_megapixels'] = round((page_cv.shape[0] * page_cv.shape[1]) / 1000000, 1)
             page_result['dpi_used'] = high_dpi
             
-            # Sauvegarder l'image de la page complète
-            page_image_path = os.path.join(page_dir, "page_full_image.jpg")
-            cv2.imwrite(page_image_path, page_cv)
+            # Mots positionnés de la page : couche texte, sinon OCR pleine page confié
+            # au pool OCR (pages candidates au sommaire), pendant la détection et le découpage
+            pending_words, prescreen = self._submit_page_words(pdf_path, page_num, high_dpi, page_cv)
+            
+            # Aperçu de la page : pyramide tuilée servie par l'interface (plus de
+            # re-rastérisation du PDF), sinon l'image de la page complète
+            if self.preset.get('save_page_image', True) and self.page_pyramid.enabled:
+                pyramid, pyramid_writes = self.page_pyramid.build(page_cv, page_dir, self.image_writer,
+                                                                  dpi=high_dpi)
+                pending_writes.extend(pyramid_writes)
+                page_result['pyramid'] = {
+                    'manifest': "page_pyramid.json",
+                    'levels': len(pyramid['levels']),
+                    'tiles': sum(l['cols'] * l['rows'] for l in pyramid['levels']),
+                    'scale': pyramid['scale']
+                }
+            elif self.preset.get('save_page_image', True):
+                page_image_path = os.path.join(page_dir, "page_full_image.jpg")
+                pending_writes.append(self.image_writer.submit(
+                    page_image_path, page_cv, self.output_formats.write_params('page_preview')))
             
             # Détecter les rectangles avec tous les détecteurs
             all_rectangles = []
+            detector_timings = {}
             for detector in self.detectors:
                 logger.info(f"    🔍 Détection avec {detector.name}")
+                detector_start = time.time()
                 rectangles = detector.detect(page_cv)
+                detector_timings[detector.name] = round(time.time() - detector_start, 3)
                 logger.info(f"      → {len(rectangles)} rectangles trouvés")
                 
-                # Ajouter les rectangles uniques
+                # Ajouter les rectangles uniques (les doublons enrichissent la provenance)
                 for rect in rectangles:
-                    if not self._is_duplicate_rectangle(rect, all_rectangles):
+                    duplicate = self._find_duplicate_rectangle(rect, all_rectangles)
+                    if duplicate is None:
                         all_rectangles.append(rect)
+                    else:
+                        detector.merge_provenance(duplicate, rect)
+                
+                if hasattr(detector, 'config_timings'):
+                    for config_name, seconds in detector.config_timings.items():
+                        detector_timings[f"{detector.name}/{config_name}"] = seconds
+            
+            page_result['detector_timings'] = detector_timings
+            
+            # Réduire les chaînes imbriquées avant tout découpage/OCR/écriture
+            containment = self.containment_tree.resolve(all_rectangles)
+            all_rectangles = containment['rectangles']
+            page_result['containment'] = containment['stats']
             
             page_result['rectangles_found'] = len(all_rectangles)
             logger.info(f"  🎯 TOTAL: {len(all_rectangles)} rectangles uniques détectés")
@@ -402,17 +639,16 @@ class PDFExtractor:
             all_extracted_images = []
             all_rectangles_data = []
             
-            # Première passe : extraire toutes les images
+            # Première passe : références (page, bbox), les pixels restent dans page_cv
             for rect_idx, rectangle in enumerate(all_rectangles):
                 try:
-                    # Extraire l'image
-                    extracted_image = self._extract_rectangle_image(page_cv, rectangle)
-                    if extracted_image is None or not ImageUtils.is_image_valid(extracted_image):
+                    crop = self._crop_reference(page_cv, rectangle)
+                    if crop is None or not ImageUtils.is_image_valid(crop.view):
                         continue
                     
-                    all_extracted_images.append(extracted_image)
+                    all_extracted_images.append(crop.view)
                     all_rectangles_data.append({
-                        'image': extracted_image,
+                        'image': crop.view,
                         'rectangle': rectangle,
                         'rect_idx': rect_idx
                     })
@@ -421,27 +657,72 @@ class PDFExtractor:
                     logger.error(f"    ❌ Erreur rectangle {rect_idx + 1}: {e}")
                     continue
             
+            # Analyser la qualité de toutes les images de la page en une passe
+            quality_results = self.quality_analyzer.analyze_page_quality(all_extracted_images)
+            state.update(page_cv=page_cv, doubtful_dir=doubtful_dir, pending_words=pending_words,
+                         prescreen=prescreen, rectangles_data=all_rectangles_data,
+                         quality_results=quality_results)
+            
+        except Exception as e:
+            logger.error(f"  ❌ Erreur page {page_num}: {e}")
+            page_result['error'] = str(e)
+        
+        return state
+    
+    def _finish_page(self, state: dict) -> dict:
+        """Numéros, cohérence, sommaire et écritures d'une page commencée par `_start_page`.
+        
+        Exécuté par `extract_pdf` pendant la détection de la page suivante : les
+        lectures OCR de la page (mots, zones des numéros) sont attendues ici,
+        au moment où les numéros, `CoherenceAnalyzer` et les JSON en ont besoin.
+        """
+        page_result = state['page_result']
+        page_dir = state['page_dir']
+        pending_writes = state['pending_writes']
+        crop_writes = state['crop_writes']
+        
+        try:
+            if state.get('page_cv') is None:
+                raise RuntimeError(page_result['error'] or "Page non détectée")
+            page_cv = state['page_cv']
+            doubtful_dir = state['doubtful_dir']
+            all_rectangles_data = state['rectangles_data']
+            quality_results = state['quality_results']
+            prescreen = state['prescreen']
+            
+            # Premier besoin des mots de la page : attendre l'OCR soumis après le rendu
+            page_words = self._await_page_words(state['pending_words'])
+            if page_words is not None:
+                page_result['page_words'] = {'source': page_words.source, 'count': len(page_words)}
+                page_result.setdefault('ocr_readings', []).append(
+                    {'scope': 'page', 'source': page_words.source, 'text': page_words.text()})
+            
+            # Numéros d'œuvres de toute la page (jointure spatiale ou un seul appel OCR)
+            artwork_numbers = self._detect_artwork_numbers(
+                page_cv, [data['rectangle'] for data in all_rectangles_data], page_words, page_result)
+            
+            # Lectures brutes par zone (manifeste SQLite) et source de chaque numéro
+            number_search = page_result.get('number_search', {})
+            rectangle_ids = [data['rect_idx'] + 1 for data in all_rectangles_data]
+            page_result.setdefault('ocr_readings', []).extend(
+                dict(reading, scope='zone', rectangle=rectangle_ids[reading['rectangle']])
+                for reading in number_search.pop('readings', []))
+            numbers_inferred = number_search.get('inferred', [False] * len(all_rectangles_data))
+            number_sources = number_search.get('sources', [None] * len(all_rectangles_data))
+            
             # Analyser et classifier toutes les images
-            for data in all_rectangles_data:
+            for data, quality_analysis, artwork_number, number_inferred, number_source in zip(
+                    all_rectangles_data, quality_results, artwork_numbers, numbers_inferred, number_sources):
                 try:
                     extracted_image = data['image']
                     rectangle = data['rectangle']
                     rect_idx = data['rect_idx']
                     
-                    # Analyser la qualité
-                    quality_analysis = self.quality_analyzer.analyze_image_quality(
-                        extracted_image, 
-                        all_extracted_images
-                    )
-                    
-                    # Détecter numéro d'œuvre
-                    artwork_number = self._detect_artwork_number(page_cv, rectangle)
-                    
                     # Déterminer le nom et le dossier
                     if artwork_number:
-                        base_filename = f"{artwork_number}.png"
+                        base_filename = self.output_formats.filename('crop', str(artwork_number))
                     else:
-                        base_filename = f"rectangle_{rect_idx + 1:02d}.png"
+                        base_filename = self.output_formats.filename('crop', f"rectangle_{rect_idx + 1:02d}")
                     
                     # Décider où sauvegarder
                     if quality_analysis['is_doubtful']:
@@ -449,8 +730,9 @@ class PDFExtractor:
                         image_path = os.path.join(doubtful_dir, filename)
                         
                         # Créer un fichier info
-                        self._create_doubtful_info(doubtful_dir, base_filename, 
-                                                 quality_analysis, extracted_image)
+                        if self.exports.get('doubtful_info', True):
+                            pending_writes.append(self._create_doubtful_info(
+                                doubtful_dir, base_filename, quality_analysis, extracted_image))
                         
                         logger.info(f"    ⚠️ Sauvé (DOUTEUX): {filename}")
                     else:
@@ -460,11 +742,19 @@ class PDFExtractor:
                     
                     # Créer miniature
                     thumbnail = ImageUtils.create_thumbnail(extracted_image)
-                    thumb_path = os.path.join(os.path.dirname(image_path), f"thumb_{filename}")
-                    cv2.imwrite(thumb_path, thumbnail)
+                    thumb_filename = self.output_formats.filename(
+                        'thumbnail', f"thumb_{os.path.splitext(filename)[0]}")
+                    thumb_path = os.path.join(os.path.dirname(image_path), thumb_filename)
+                    pending_writes.append(self.image_writer.submit(
+                        thumb_path, thumbnail, self.output_formats.write_params('thumbnail')))
                     
-                    # Sauvegarder l'image
-                    cv2.imwrite(image_path, extracted_image)
+                    # Sauvegarder l'image (encodage en arrière-plan, taille relevée plus bas)
+                    crop_params = self.output_formats.write_params('crop')
+                    if self.blob_store:
+                        image_write = self.image_writer.submit_to_store(
+                            self.blob_store, image_path, extracted_image, crop_params)
+                    else:
+                        image_write = self.image_writer.submit(image_path, extracted_image, crop_params)
                     
                     # NOUVEAU : Créer le JSON d'œuvre immédiatement si on a le sommaire
                     if hasattr(self, 'plate_map') and self.plate_map and artwork_number:
@@ -510,15 +800,23 @@ class PDFExtractor:
                         'confidence': quality_analysis['confidence'],
                         'doubt_reasons': quality_analysis['reasons'],
                         'artwork_number': artwork_number,
+                        'number_inferred': number_inferred,
+                        'number_source': number_source if artwork_number else None,
                         'bbox': rectangle.get('bbox'),
                         'area': rectangle.get('area'),
-                        'size_kb': FileUtils.get_file_size_kb(image_path),
-                        'thumbnail': f"thumb_{filename}",
+                        'size_kb': 0,
+                        'thumbnail': thumb_filename,
                         'detection_method': rectangle.get('method', 'unknown'),
-                        'original_confidence': rectangle.get('confidence', 0.5)
+                        'detector': rectangle.get('detector'),
+                        'ultra_config': rectangle.get('ultra_config'),
+                        'found_by': rectangle.get('found_by', []),
+                        'original_confidence': rectangle.get('confidence', 0.5),
+                        'phash': self._perceptual_hash(extracted_image),
+                        'dimensions': [extracted_image.shape[1], extracted_image.shape[0]]
                     }
                     
                     page_result['rectangles_details'].append(rect_details)
+                    crop_writes.append((rect_details, image_write))
                     page_result['images_saved'].append(filename)
                     page_result['images_extracted'] += 1
                     
@@ -533,7 +831,7 @@ class PDFExtractor:
             
             # NOUVEAU : Détecter et analyser les sommaires
             logger.info(f"  📋 Vérification du sommaire...")
-            page_result = self.analyze_summary_page(page_result, page_cv)
+            page_result = self.analyze_summary_page(page_result, page_cv, page_words, prescreen)
             
             # Afficher les résultats de cohérence
             if 'error' not in coherence_result:
@@ -551,23 +849,42 @@ class PDFExtractor:
             page_result['success'] = True
             
         except Exception as e:
-            logger.error(f"  ❌ Erreur page {page_num}: {e}")
-            page_result['error'] = str(e)
+            # Erreur de `_start_page` déjà journalisée
+            if page_result['error'] is None:
+                logger.error(f"  ❌ Erreur page {page_result['page_number']}: {e}")
+                page_result['error'] = str(e)
+        
+        # Attendre la fin des encodages de la page avant d'écrire ses JSON
+        for rect_details, image_write in crop_writes:
+            rect_details['size_kb'] = self.image_writer.wait([image_write])[0]
+        self.image_writer.wait(pending_writes)
+        
+        if self.ocr_cache:
+            page_result['ocr_cache'] = OCRCache.hit_rate(state['ocr_cache_before'], self.ocr_cache.snapshot())
         
         # Calculer le temps de traitement
-        page_result['processing_time'] = round(time.time() - page_start_time, 2)
+        page_result['processing_time'] = round(time.time() - state['page_start_time'], 2)
         page_result['end_time'] = datetime.now().isoformat()
         
-        # Sauvegarder le log de la page
-        page_log_path = os.path.join(page_dir, "page_ultra_details.json")
-        with open(page_log_path, 'w', encoding='utf-8') as f:
-            json.dump(page_result, f, indent=2, ensure_ascii=False)
+        # Sauvegarder le log de la page (le manifeste SQLite est écrit par extract_pdf)
+        if self.exports.get('page_json', True):
+            page_log_path = os.path.join(page_dir, "page_ultra_details.json")
+            with open(page_log_path, 'w', encoding='utf-8') as f:
+                json.dump(page_result, f, indent=2, ensure_ascii=False)
         
         # Créer le fichier texte de détails
-        self._create_page_text_details(page_dir, page_result)
+        if self.exports.get('page_readme', True):
+            self._create_page_text_details(page_dir, page_result)
         
         return page_result
     
+    def _select_dpi(self, recommended_dpi: int) -> int:
+        """Borne le DPI recommandé selon le preset"""
+        dpi = max(self.preset.get('min_dpi') or recommended_dpi, recommended_dpi)
+        if self.preset.get('max_dpi'):
+            dpi = min(dpi, self.preset['max_dpi'])
+        return dpi
+    
     def _analyze_page_dimensions(self, pdf_path: str, page_number: int) -> dict:
         """Analyse les dimensions d'une page"""
         try:
@@ -630,35 +947,59 @@ class PDFExtractor:
         else:  # > A3
             return 300
     
-    def _extract_rectangle_image(self, image: np.ndarray, rectangle: dict) -> np.ndarray:
-        """Extrait l'image d'un rectangle"""
+    def _perceptual_hash(self, image: np.ndarray) -> str:
+        """dHash hexadécimal d'une découpe (index des quasi-doublons)"""
+        hash_size = DUPLICATE_CONFIG['hash_size']
+        return f"{ImageUtils.dhash(image, hash_size):0{hash_size * hash_size // 4}x}"
+    
+    def _crop_reference(self, image: np.ndarray, rectangle: dict) -> CropRef:
+        """Référence paresseuse sur la zone d'un rectangle (sans copie)"""
         try:
-            bbox = rectangle['bbox']
-            x, y, w, h = bbox['x'], bbox['y'], bbox['w'], bbox['h']
-            
-            # Extraction simple uniquement
-            bbox_image = image[y:y+h, x:x+w].copy()
-            return bbox_image
-            
+            return CropRef(image, rectangle['bbox'])
         except Exception as e:
             logger.error(f"Erreur extraction rectangle: {e}")
             return None
     
-    def analyze_summary_page(self, page_result: dict, page_image: np.ndarray) -> dict:
+    def analyze_summary_page(self, page_result: dict, page_image: np.ndarray,
+                             page_words: PageWords = None, prescreen: dict = None) -> dict:
         """Analyse si la page contient un sommaire et extrait les informations d'œuvres"""
         try:
-            # Extraire le texte de la page avec OCR
-            page_text = self._extract_page_text(page_image)
+            if page_words is None and self.preset.get('page_ocr', 'full') == 'none':
+                page_result['summary_analysis'] = {
+                    'is_summary': False,
+                    'message': f"OCR pleine page désactivé (preset {self.preset_name})"
+                }
+                return page_result
+            
+            if page_words is None and prescreen is not None and not prescreen['candidate']:
+                page_result['summary_analysis'] = {
+                    'is_summary': False,
+                    'message': 'Page non candidate au sommaire (OCR pleine page évité)',
+                    'prescreen': prescreen
+                }
+                return page_result
+            
+            # Texte de la page : mots déjà lus, sinon OCR
+            if page_words is not None:
+                page_text = page_words.text()
+            else:
+                page_text = self._extract_page_text(page_image)
+                page_result.setdefault('ocr_readings', []).append(
+                    {'scope': 'page', 'source': 'ocr', 'text': page_text})
             
             if not page_text or len(page_text.strip()) < 50:
                 page_result['summary_analysis'] = {
                     'is_summary': False,
                     'message': 'Pas assez de texte pour analyser'
                 }
+                if prescreen is not None:
+                    page_result['summary_analysis']['prescreen'] = prescreen
                 return page_result
             
             # Analyser avec l'analyseur de sommaires
             summary_analysis = self.summary_analyzer.analyze_summary_page(page_text, page_image)
+            if prescreen is not None:
+                summary_analysis['prescreen'] = prescreen
             
             # Sauvegarder l'analyse si c'est un sommaire
             if summary_analysis.get('is_summary'):
@@ -679,417 +1020,89 @@ class PDFExtractor:
             }
             return page_result
     
-    def _extract_page_text(self, page_image: np.ndarray) -> str:
-        """Extrait le texte d'une page avec OCR"""
-        try:
-            import pytesseract
-            
-            # Vérifier Tesseract avec test de version
-            try:
-                _ = pytesseract.get_tesseract_version()
-            except Exception:
-                return ""
-            
-            # Convertir en niveaux de gris
-            gray = cv2.cvtColor(page_image, cv2.COLOR_BGR2GRAY)
-            
-            # Prétraitement pour améliorer l'OCR
-            clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8,8))
-            enhanced = clahe.apply(gray)
-            
-            # OCR avec plusieurs configurations
-            text = pytesseract.image_to_string(enhanced, config='--psm 6')
-            
-            return text.strip()
-            
-        except Exception as e:
-            logger.debug(f"Erreur OCR: {e}")
-            return ""
-    
-    def _detect_artwork_number(self, image: np.ndarray, rectangle: dict) -> str:
-        """Détecte le numéro d'œuvre en utilisant la collection sélectionnée.
+    def _submit_page_words(self, pdf_path: str, page_num: int, dpi: int, page_image: np.ndarray):
+        """Lance la lecture des mots positionnés de la page (pixels du raster).
+        
+        Couche texte du PDF si elle est exploitable (aucun OCR, PageWords
+        immédiat), sinon OCR pleine page soumis au pool OCR (Future) si le
+        pré-filtre juge la page candidate au sommaire. None si l'OCR est
+        désactivé, indisponible ou évité (numéros alors lus par mosaïque).
         
-        Args:
-            image: Image extraite
-            rectangle: Coordonnées du rectangle
-            
         Returns:
-            Numéro d'œuvre détecté (string) ou None
+            (mots ou Future ou None, décision du pré-filtre ou None)
         """
-        if not self.collection:
-            logger.error("❌ Aucune collection sélectionnée")
-            return None
+        text_layer = self._text_layer_words(pdf_path, page_num, dpi)
+        if text_layer is not None:
+            return text_layer, None
         
-        # Créer le contexte de la page
-        page_context = {
-            'page_number': getattr(self, 'current_page_number', None),
-            'extraction_counter': getattr(self, 'total_extracted', 0)
-        }
+        if self.preset.get('page_ocr', 'full') == 'none':
+            return None, None
+        ocr_engine = get_ocr_engine()
+        if not ocr_engine.available:
+            return None, None
         
-        # Utiliser la méthode de détection de la collection
-        return self.collection.detect_artwork_number(image, rectangle, page_context)
-    def process_page(self, pdf_path: str, page_num: int) -> dict:
-        """Traite une page spécifique"""
-        page_start_time = time.time()
-        
-        # Créer le dossier de la page
-        page_dir = FileUtils.create_page_folder(self.session_dir, page_num)
-        
-        page_result = {
-            'page_number': page_num,
-            'page_dir': page_dir,
-            'start_time': datetime.now().isoformat(),
-            'mode': 'ULTRA_SENSIBLE',
-            'success': False,
-            'images_extracted': 0,
-            'rectangles_found': 0,
-            'images_saved': [],
-            'rectangles_details': [],
-            'error': None
-        }
-        
-        try:
-            # Analyser les dimensions de la page
-            page_analysis = self._analyze_page_dimensions(pdf_path, page_num)
-            page_result['page_analysis'] = page_analysis
-            
-            # Convertir la page avec DPI élevé
-            high_dpi = max(400, page_analysis['recommended_dpi'])
-            logger.info(f"  📏 Page {page_num}: {page_analysis['page_format']} → DPI {high_dpi}")
-            
-            # DEBUG: Log pour vérifier la cohérence des numéros de pages
-            logger.debug(f"🔍 DEBUG: Conversion PDF page {page_num} depuis {pdf_path}")
-            
-            page_images = convert_from_path(
-                pdf_path, 
-                dpi=high_dpi,
-                first_page=page_num,
-                last_page=page_num
-            )
-            
-            if not page_images:
-                raise Exception("Conversion PDF échouée")
-            
-            page_image = page_images[0]
-            page_array = np.array(page_image)
-            page_cv = cv2.cvtColor(page_array, cv2.COLOR_RGB2BGR)
-            
-            page_result['image_size'] = f"{page_cv.shape[1]}×{page_cv.shape[0]}"
-            page_result['image_megapixels'] = round((page_cv.shape[0] * page_cv.shape[1]) / 1000000, 1)
-            page_result['dpi_used'] = high_dpi
-            
-            # Sauvegarder l'image de la page complète
-            page_image_path = os.path.join(page_dir, "page_full_image.jpg")
-            cv2.imwrite(page_image_path, page_cv)
-            
-            # Détecter les rectangles avec tous les détecteurs
-            all_rectangles = []
-            for detector in self.detectors:
-                logger.info(f"    🔍 Détection avec {detector.name}")
-                rectangles = detector.detect(page_cv)
-                logger.info(f"      → {len(rectangles)} rectangles trouvés")
-                
-                # Ajouter les rectangles uniques
-                for rect in rectangles:
-                    if not self._is_duplicate_rectangle(rect, all_rectangles):
-                        all_rectangles.append(rect)
-            
-            page_result['rectangles_found'] = len(all_rectangles)
-            logger.info(f"  🎯 TOTAL: {len(all_rectangles)} rectangles uniques détectés")
-            
-            # Créer dossier douteux
-            doubtful_dir = FileUtils.create_doubtful_folder(page_dir)
-            
-            # Extraire et sauvegarder les images
-            all_extracted_images = []
-            all_rectangles_data = []
-            
-            # Première passe : extraire toutes les images
-            for rect_idx, rectangle in enumerate(all_rectangles):
-                try:
-                    # Extraire l'image
-                    extracted_image = self._extract_rectangle_image(page_cv, rectangle)
-                    if extracted_image is None or not ImageUtils.is_image_valid(extracted_image):
-                        continue
-                    
-                    all_extracted_images.append(extracted_image)
-                    all_rectangles_data.append({
-                        'image': extracted_image,
-                        'rectangle': rectangle,
-                        'rect_idx': rect_idx
-                    })
-                    
-                except Exception as e:
-                    logger.error(f"    ❌ Erreur rectangle {rect_idx + 1}: {e}")
-                    continue
-            
-            # Analyser et classifier toutes les images
-            for data in all_rectangles_data:
-                try:
-                    extracted_image = data['image']
-                    rectangle = data['rectangle']
-                    rect_idx = data['rect_idx']
-                    
-                    # Analyser la qualité
-                    quality_analysis = self.quality_analyzer.analyze_image_quality(
-                        extracted_image, 
-                        all_extracted_images
-                    )
-                    
-                    # Détecter numéro d'œuvre
-                    artwork_number = self._detect_artwork_number(page_cv, rectangle)
-                    
-                    # Déterminer le nom et le dossier
-                    if artwork_number:
-                        base_filename = f"{artwork_number}.png"
-                    else:
-                        base_filename = f"rectangle_{rect_idx + 1:02d}.png"
-                    
-                    # Décider où sauvegarder
-                    if quality_analysis['is_doubtful']:
-                        filename = f"DOUTEUX_{base_filename}"
-                        image_path = os.path.join(doubtful_dir, filename)
-                        
-                        # Créer un fichier info
-                        self._create_doubtful_info(doubtful_dir, base_filename, 
-                                                 quality_analysis, extracted_image)
-                        
-                        logger.info(f"    ⚠️ Sauvé (DOUTEUX): {filename}")
-                    else:
-                        filename = base_filename
-                        image_path = os.path.join(page_dir, filename)
-                        logger.info(f"    ✅ Sauvé: {filename} ({extracted_image.shape[1]}×{extracted_image.shape[0]})")
-                    
-                    # Créer miniature
-                    thumbnail = ImageUtils.create_thumbnail(extracted_image)
-                    thumb_path = os.path.join(os.path.dirname(image_path), f"thumb_{filename}")
-                    cv2.imwrite(thumb_path, thumbnail)
-                    
-                    # Sauvegarder l'image
-                    cv2.imwrite(image_path, extracted_image)
-                    
-                    # NOUVEAU : Créer le JSON d'œuvre immédiatement si on a le sommaire
-                    if hasattr(self, 'plate_map') and self.plate_map and artwork_number:
-                        try:
-                            from toc_planches import create_artwork_json, save_artwork_json, extract_artist_name_from_pdf
-                            
-                            plate_number = int(artwork_number)
-                            logger.debug(f"🔍 Tentative création JSON pour planche {plate_number}")
-                            logger.debug(f"🔍 Planches disponibles: {list(self.plate_map.keys())[:10]}...")
-                            
-                            if plate_number in self.plate_map:
-                                # Obtenir le nom de l'artiste (une seule fois)
-                                if not hasattr(self, 'artist_name'):
-                                    self.artist_name = extract_artist_name_from_pdf(self.current_pdf_path)
-                                
-                                # Créer le JSON de l'œuvre
-                                plate_info = self.plate_map[plate_number]
-                                logger.info(f"🔍 Plate info pour {plate_number}: {plate_info}")
-                                image_size = (extracted_image.shape[1], extracted_image.shape[0])
-                                logger.info(f"🔍 Appel create_artwork_json pour planche {plate_number}")
-                                artwork_data = create_artwork_json(
-                                    image_path, plate_number, plate_info, self.artist_name, image_size
-                                )
-                                logger.info(f"🔍 JSON créé avec medium: {artwork_data.get('medium', 'N/A')}")
-                                
-                                # Sauvegarder le JSON
-                                from pathlib import Path
-                                json_path = save_artwork_json(artwork_data, Path(page_dir), plate_number)
-                                if json_path:
-                                    logger.info(f"    🎨 JSON créé: oeuvre_{plate_number:03d}.json")
-                            else:
-                                logger.warning(f"    ⚠️ Planche {plate_number} non trouvée dans le sommaire")
-                        except Exception as e:
-                            logger.error(f"❌ Erreur création JSON immédiat: {e}")
-                            import traceback
-                            logger.debug(f"Traceback: {traceback.format_exc()}")
-                    
-                    # Enregistrer les détails
-                    rect_details = {
-                        'rectangle_id': rect_idx + 1,
-                        'filename': filename,
-                        'is_doubtful': quality_analysis['is_doubtful'],
-                        'confidence': quality_analysis['confidence'],
-                        'doubt_reasons': quality_analysis['reasons'],
-                        'artwork_number': artwork_number,
-                        'bbox': rectangle.get('bbox'),
-                        'area': rectangle.get('area'),
-                        'size_kb': FileUtils.get_file_size_kb(image_path),
-                        'thumbnail': f"thumb_{filename}",
-                        'detection_method': rectangle.get('method', 'unknown'),
-                        'original_confidence': rectangle.get('confidence', 0.5)
-                    }
-                    
-                    page_result['rectangles_details'].append(rect_details)
-                    page_result['images_saved'].append(filename)
-                    page_result['images_extracted'] += 1
-                    
-                except Exception as e:
-                    logger.error(f"    ❌ Erreur sauvegarde {rect_idx + 1}: {e}")
-                    continue
-            
-            # Analyser la cohérence des numéros
-            logger.info(f"  🔍 Analyse de cohérence des numéros...")
-            coherence_result = self.coherence_analyzer.analyze(page_result['rectangles_details'])
-            page_result['coherence_analysis'] = coherence_result
-            
-            # NOUVEAU : Détecter et analyser les sommaires
-            logger.info(f"  📋 Vérification du sommaire...")
-            page_result = self.analyze_summary_page(page_result, page_cv)
-            
-            # Afficher les résultats de cohérence
-            if 'error' not in coherence_result:
-                detected = coherence_result.get('detected_numbers', [])
-                is_seq = coherence_result.get('is_sequential', True)
-                gaps = coherence_result.get('gaps', [])
-                
-                if is_seq:
-                    logger.info(f"  ✅ Numéros cohérents: {detected}")
-                else:
-                    logger.warning(f"  ⚠️ Incohérences détectées: {detected}")
-                    if gaps:
-                        logger.warning(f"  🔍 Numéros manquants: {gaps}")
-            
-            page_result['success'] = True
-            
-        except Exception as e:
-            logger.error(f"  ❌ Erreur page {page_num}: {e}")
-            page_result['error'] = str(e)
-        
-        # Calculer le temps de traitement
-        page_result['processing_time'] = round(time.time() - page_start_time, 2)
-        page_result['end_time'] = datetime.now().isoformat()
-        
-        # Sauvegarder le log de la page
-        page_log_path = os.path.join(page_dir, "page_ultra_details.json")
-        with open(page_log_path, 'w', encoding='utf-8') as f:
-            json.dump(page_result, f, indent=2, ensure_ascii=False)
-        
-        # Créer le fichier texte de détails
-        self._create_page_text_details(page_dir, page_result)
-        
-        return page_result
-    
-    def _analyze_page_dimensions(self, pdf_path: str, page_number: int) -> dict:
-        """Analyse les dimensions d'une page"""
-        try:
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                page = pdf_reader.pages[page_number - 1]
-                
-                mediabox = page.mediabox
-                width_points = float(mediabox.width)
-                height_points = float(mediabox.height)
-                
-                width_mm = width_points * 25.4 / 72
-                height_mm = height_points * 25.4 / 72
-                area_mm2 = width_mm * height_mm
-                
-                page_format = self._identify_page_format(width_mm, height_mm)
-                recommended_dpi = self._calculate_optimal_dpi(width_mm, height_mm, area_mm2)
-                
-                return {
-                    'width_mm': round(width_mm, 1),
-                    'height_mm': round(height_mm, 1),
-                    'area_mm2': round(area_mm2, 0),
-                    'page_format': page_format,
-                    'recommended_dpi': recommended_dpi
-                }
-        except:
-            return {
-                'width_mm': 210.0,
-                'height_mm': 297.0,
-                'area_mm2': 62370,
-                'page_format': 'A4 (défaut)',
-                'recommended_dpi': 400
-            }
+        prescreen = None
+        if SUMMARY_PRESCREEN_CONFIG.get('enabled', True):
+            prescreen = self.summary_prescreen.screen(
+                page_image, page_num, self.total_pdf_pages,
+                self._text_layer_text(page_num), self.toc_pages)
+            if not prescreen['candidate']:
+                logger.info(f"  📋 Page non candidate au sommaire ({prescreen['text_lines']} lignes de texte)")
+                return None, prescreen
+        return (ocr_engine.submit_words(PageWords.preprocess(page_image), OCR_CONFIG['page_words']['psm']),
+                prescreen)
     
-    def _identify_page_format(self, width_mm: float, height_mm: float) -> str:
-        """Identifie le format de page"""
-        w, h = sorted([width_mm, height_mm])
-        
-        formats = {
-            (148, 210): "A5", 
-            (210, 297): "A4",
-            (297, 420): "A3",
-            (216, 279): "Letter US",
-        }
-        
-        for (fw, fh), format_name in formats.items():
-            if abs(w - fw) <= 5 and abs(h - fh) <= 5:
-                return format_name
-        
-        return f"Personnalisé {w:.0f}×{h:.0f}mm"
-    
-    def _calculate_optimal_dpi(self, width_mm: float, height_mm: float, area_mm2: float) -> int:
-        """Calcule le DPI optimal"""
-        if area_mm2 < 30000:  # < A5
-            return 500
-        elif area_mm2 < 70000:  # A5-A4
-            return 400
-        elif area_mm2 < 150000:  # A4-A3
-            return 350
-        else:  # > A3
-            return 300
-    
-    def _extract_rectangle_image(self, image: np.ndarray, rectangle: dict) -> np.ndarray:
-        """Extrait l'image d'un rectangle"""
+    def _await_page_words(self, pending) -> PageWords:
+        """Résultat de `_submit_page_words` (attend l'OCR du pool si besoin)"""
+        if pending is None or isinstance(pending, PageWords):
+            return pending
         try:
-            bbox = rectangle['bbox']
-            x, y, w, h = bbox['x'], bbox['y'], bbox['w'], bbox['h']
-            
-            # Extraction simple uniquement
-            bbox_image = image[y:y+h, x:x+w].copy()
-            return bbox_image
-            
+            return PageWords(pending.result(), source='ocr')
         except Exception as e:
-            logger.error(f"Erreur extraction rectangle: {e}")
+            logger.debug(f"Erreur OCR pleine page: {e}")
             return None
     
-    def analyze_summary_page(self, page_result: dict, page_image: np.ndarray) -> dict:
-        """Analyse si la page contient un sommaire et extrait les informations d'œuvres"""
+    def _text_layer_words(self, pdf_path: str, page_num: int, dpi: int) -> PageWords:
+        """Mots de la couche texte (PDF nés numériques), None si absente ou trop pauvre"""
+        config = OCR_CONFIG.get('text_layer', {})
+        if not config.get('enabled', True):
+            return None
         try:
-            # Extraire le texte de la page avec OCR
-            page_text = self._extract_page_text(page_image)
-            
-            if not page_text or len(page_text.strip()) < 50:
-                page_result['summary_analysis'] = {
-                    'is_summary': False,
-                    'message': 'Pas assez de texte pour analyser'
-                }
-                return page_result
-            
-            # Analyser avec l'analyseur de sommaires
-            summary_analysis = self.summary_analyzer.analyze_summary_page(page_text, page_image)
-            
-            # Sauvegarder l'analyse si c'est un sommaire
-            if summary_analysis.get('is_summary'):
-                page_dir = page_result.get('page_dir', '')
-                summary_file = os.path.join(page_dir, "summary_analysis.json")
-                self.summary_analyzer.save_summary_analysis(summary_analysis, summary_file)
-                
-                logger.info(f"  📋 Sommaire détecté: {summary_analysis.get('total_entries', 0)} entrées d'œuvres")
-            
-            page_result['summary_analysis'] = summary_analysis
-            return page_result
-            
+            import fitz
+            with self._text_layer_lock:
+                if self._text_layer_doc is None or self._text_layer_doc[0] != pdf_path:
+                    self._close_text_layer()
+                    self._text_layer_doc = (pdf_path, fitz.open(pdf_path))
+                words = PageWords.from_text_layer(self._text_layer_doc[1][page_num - 1], dpi)
         except Exception as e:
-            logger.error(f"  ❌ Erreur analyse sommaire: {e}")
-            page_result['summary_analysis'] = {
-                'is_summary': False,
-                'error': str(e)
-            }
-            return page_result
+            logger.debug(f"Couche texte illisible page {page_num}: {e}")
+            return None
+        
+        if len(words) < config.get('min_words', 3):
+            return None
+        logger.info(f"  🔤 Couche texte: {len(words)} mots (OCR évité)")
+        return words
+    
+    def _text_layer_text(self, page_num: int) -> str:
+        """Texte brut de la couche texte, même trop pauvre pour remplacer l'OCR"""
+        with self._text_layer_lock:
+            if self._text_layer_doc is None:
+                return ""
+            try:
+                return self._text_layer_doc[1][page_num - 1].get_text()
+            except Exception:
+                return ""
+    
+    def _close_text_layer(self):
+        if self._text_layer_doc is not None:
+            self._text_layer_doc[1].close()
+            self._text_layer_doc = None
     
     def _extract_page_text(self, page_image: np.ndarray) -> str:
         """Extrait le texte d'une page avec OCR"""
         try:
-            import pytesseract
-            
-            # Vérifier Tesseract avec test de version
-            try:
-                _ = pytesseract.get_tesseract_version()
-            except Exception:
+            ocr_engine = get_ocr_engine()
+            if not ocr_engine.available:
                 return ""
             
             # Convertir en niveaux de gris
@@ -1100,7 +1113,7 @@ class PDFExtractor:
             enhanced = clahe.apply(gray)
             
             # OCR avec plusieurs configurations
-            text = pytesseract.image_to_string(enhanced, config='--psm 6')
+            text = ocr_engine.recognize(enhanced, psm=6)
             
             return text.strip()
             
@@ -1108,30 +1121,61 @@ class PDFExtractor:
             logger.debug(f"Erreur OCR: {e}")
             return ""
     
-    def _detect_artwork_number(self, image: np.ndarray, rectangle: dict) -> str:
-        """Détecte le numéro d'œuvre en utilisant la collection sélectionnée.
+    def _detect_artwork_numbers(self, image: np.ndarray, rectangles: list,
+                                page_words: PageWords = None, page_result: dict = None) -> list:
+        """Détecte les numéros d'œuvres d'une page avec la collection sélectionnée.
         
         Args:
-            image: Image extraite
-            rectangle: Coordonnées du rectangle
+            image: Image de la page
+            rectangles: Rectangles retenus de la page
+            page_words: Mots positionnés de la page (évite un nouvel OCR)
+            page_result: Résultat de la page (zones OCR par rectangle)
             
         Returns:
-            Numéro d'œuvre détecté (string) ou None
+            Numéro détecté (string) ou None pour chaque rectangle
         """
         if not self.collection:
             logger.error("❌ Aucune collection sélectionnée")
-            return None
+            return [None] * len(rectangles)
         
         # Créer le contexte de la page
         page_context = {
-            'page_number': getattr(self, 'current_page_number', None),
-            'extraction_counter': getattr(self, 'total_extracted', 0)
+            'page_number': (page_result or {}).get('page_number', getattr(self, 'current_page_number', None)),
+            'extraction_counter': getattr(self, 'total_extracted', 0),
+            'page_words': page_words
         }
+        # Numéros attendus d'après la table des planches (vérification plutôt que recherche)
+        if self.expected_plates and page_context['page_number'] is not None:
+            page_context['expected_numbers'] = self.expected_plates.expected(page_context['page_number'])
+        # Suite du document : premier numéro attendu et ordre de lecture des rectangles
+        if self.number_sequence and page_words is None:
+            page_context['sequence'] = self.number_sequence.predict(rectangles)
         
-        # Utiliser la méthode de détection de la collection
-        return self.collection.detect_artwork_number(image, rectangle, page_context)
+        # Zones de tous les rectangles reconnues ensemble par la collection
+        try:
+            numbers = self.collection.detect_artwork_numbers(image, rectangles, page_context)
+            search = page_context.get('number_search', {})
+            if page_result is not None and search:
+                page_result['number_search'] = search
+            # Seuls les numéros lus (OCR, couche texte) font foi pour le décalage et la
+            # suite : un numéro déduit (number_source='inferred') n'est jamais une preuve
+            inferred = search.get('inferred') or [False] * len(numbers)
+            evidence = [None if flag else number for number, flag in zip(numbers, inferred)]
+            if self.expected_plates and page_context['page_number'] is not None:
+                self.expected_plates.confirm(page_context['page_number'], evidence, search.get('verification'))
+            if self.number_sequence:
+                self.number_sequence.observe(rectangles, evidence, inferred)
+            return numbers
+        except Exception as e:
+            logger.error(f"❌ Erreur détection des numéros: {e}")
+            return [None] * len(rectangles)
+    
     def _is_duplicate_rectangle(self, new_rect: dict, existing_rects: list) -> bool:
         """Vérifie si un rectangle est un doublon"""
+        return self._find_duplicate_rectangle(new_rect, existing_rects) is not None
+    
+    def _find_duplicate_rectangle(self, new_rect: dict, existing_rects: list) -> dict:
+        """Retourne le rectangle existant dont new_rect est le doublon, ou None"""
         # Implémentation directe de la logique de déduplication
         new_bbox = new_rect['bbox']
         new_x, new_y = new_bbox['x'], new_bbox['y']
@@ -1139,6 +1183,9 @@ class PDFExtractor:
         
         for existing_rect in existing_rects:
             ex_bbox = existing_rect['bbox']
+            # Rectangles imbriqués : l'arbre de contenance applique sa politique ensuite
+            if BaseDetector._is_nested(new_bbox, ex_bbox):
+                continue
             ex_x, ex_y = ex_bbox['x'], ex_bbox['y']
             ex_w, ex_h = ex_bbox['w'], ex_bbox['h']
             
@@ -1158,7 +1205,7 @@ class PDFExtractor:
                 size_ratio_h = min(new_h, ex_h) / max(new_h, ex_h)
                 
                 if size_ratio_w > 0.8 and size_ratio_h > 0.8:
-                    return True
+                    return existing_rect
             
             # Fallback: méthode de chevauchement classique
             left = max(new_x, ex_x)
@@ -1174,9 +1221,31 @@ class PDFExtractor:
                 # Si plus de 70% de chevauchement, c'est un doublon
                 overlap_ratio = intersection / min(area1, area2)
                 if overlap_ratio > 0.7:
-                    return True
+                    return existing_rect
         
-        return False
+        return None
+    
+    def _create_doubtful_info(self, doubtful_dir: str, base_filename: str, 
+                             quality_analysis: dict, extracted_image: np.ndarray):
+        """Programme l'écriture du fichier info d'une image douteuse"""
+        info_filename = f"{os.path.splitext(base_filename)[0]}_INFO.txt"
+        info_path = os.path.join(doubtful_dir, info_filename)
+        
+        lines = [
+            "IMAGE DOUTEUSE - ANALYSE AUTOMATIQUE",
+            f"={'=' * 40}",
+            "",
+            f"Fichier: {base_filename}",
+            f"Confiance: {quality_analysis['confidence']:.2f}/1.0",
+            f"Dimensions: {extracted_image.shape[1]}×{extracted_image.shape[0]} pixels",
+            f"Taille: {(extracted_image.shape[0] * extracted_image.shape[1]) // 1000}K pixels",
+            "",
+            "RAISONS DE LA CLASSIFICATION DOUTEUSE:"
+        ]
+        for reason in quality_analysis['reasons']:
+            lines.append(self.quality_analyzer.get_quality_description(reason))
+        
+        return self.image_writer.submit_text(info_path, "\n".join(lines) + "\n")
     
     def _create_page_text_details(self, page_dir: str, page_result: dict):
         """Crée un fichier texte avec les détails de la page"""
@@ -5,5 +5,6 @@ from .base_detector import BaseDetector
 from .ultra_detector import UltraDetector
 from .template_detector import TemplateDetector
 from .color_detector import ColorDetector
+from .containment import ContainmentTree
 
-__all__ = ['BaseDetector', 'UltraDetector', 'TemplateDetector', 'ColorDetector']
+__all__ = ['BaseDetector', 'UltraDetector', 'TemplateDetector', 'ColorDetector', 'ContainmentTree']
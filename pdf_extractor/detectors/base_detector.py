@@ -2,9 +2,10 @@
 Classe de base pour tous les détecteurs
 """
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import numpy as np
 from utils import logger
+from config import DETECTION_CONFIG
 
 class BaseDetector(ABC):
     """Classe de base pour tous les détecteurs de rectangles"""
@@ -38,19 +39,29 @@ class BaseDetector(ABC):
             'area': area,
             'method': method or self.name,
             'confidence': confidence,
-            'detector': self.name
+            'detector': self.name,
+            'found_by': [self.name]  # Sources ayant proposé ce rectangle
         }
     
     def _is_duplicate_rectangle(self, new_rect: Dict[str, Any], 
                                existing_rects: List[Dict[str, Any]], 
                                threshold: float = 0.7) -> bool:
         """Vérifie si un rectangle est un doublon"""
+        return self._find_duplicate_rectangle(new_rect, existing_rects, threshold) is not None
+    
+    def _find_duplicate_rectangle(self, new_rect: Dict[str, Any], 
+                                 existing_rects: List[Dict[str, Any]], 
+                                 threshold: float = 0.7) -> Optional[Dict[str, Any]]:
+        """Retourne le rectangle existant dont new_rect est le doublon, ou None"""
         new_bbox = new_rect['bbox']
         new_x, new_y = new_bbox['x'], new_bbox['y']
         new_w, new_h = new_bbox['w'], new_bbox['h']
         
         for existing_rect in existing_rects:
             ex_bbox = existing_rect['bbox']
+            # Cadre > image > sous-zone : laissé à l'arbre de contenance (politique configurée)
+            if self._is_nested(new_bbox, ex_bbox):
+                continue
             ex_x, ex_y = ex_bbox['x'], ex_bbox['y']
             ex_w, ex_h = ex_bbox['w'], ex_bbox['h']
             
@@ -70,7 +81,7 @@ class BaseDetector(ABC):
                 size_ratio_h = min(new_h, ex_h) / max(new_h, ex_h)
                 
                 if size_ratio_w > 0.8 and size_ratio_h > 0.8:
-                    return True
+                    return existing_rect
             
             # Fallback: méthode de chevauchement classique
             left = max(new_x, ex_x)
@@ -86,6 +97,30 @@ class BaseDetector(ABC):
                 # Si plus de 70% de chevauchement, c'est un doublon
                 overlap_ratio = intersection / min(area1, area2)
                 if overlap_ratio > threshold:
-                    return True
+                    return existing_rect
+        
+        return None
+    
+    @staticmethod
+    def _is_nested(bbox_a: Dict[str, int], bbox_b: Dict[str, int], tolerance: int = None) -> bool:
+        """Une bbox contient l'autre (à la tolérance près) sans être la même boîte"""
+        if tolerance is None:
+            tolerance = DETECTION_CONFIG.get('containment', {}).get('tolerance', 4)
+        a = (bbox_a['x'], bbox_a['y'], bbox_a['x'] + bbox_a['w'], bbox_a['y'] + bbox_a['h'])
+        b = (bbox_b['x'], bbox_b['y'], bbox_b['x'] + bbox_b['w'], bbox_b['y'] + bbox_b['h'])
+        if all(abs(p - q) <= tolerance for p, q in zip(a, b)):
+            return False
         
-        return False
+        def contains(outer, inner):
+            return (outer[0] - tolerance <= inner[0] and outer[1] - tolerance <= inner[1] and
+                    outer[2] + tolerance >= inner[2] and outer[3] + tolerance >= inner[3])
+        
+        return contains(a, b) or contains(b, a)
+    
+    @staticmethod
+    def merge_provenance(kept_rect: Dict[str, Any], duplicate_rect: Dict[str, Any]) -> None:
+        """Ajoute les sources d'un doublon écarté à la provenance du rectangle conservé"""
+        found_by = kept_rect.setdefault('found_by', [])
+        for source in duplicate_rect.get('found_by', []):
+            if source not in found_by:
+                found_by.append(source)
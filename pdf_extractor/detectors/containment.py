@@ -0,0 +1,147 @@
+"""
+Hiérarchie de contenance des rectangles détectés
+"""
+import heapq
+from typing import List, Dict, Any, Optional
+
+from utils import logger
+from config import DETECTION_CONFIG
+from detectors.base_detector import BaseDetector
+
+CONTAINMENT_POLICIES = ('outermost', 'innermost', 'best_score')
+
+
+class ContainmentTree:
+    """Arbre de contenance construit par tri et balayage des bbox.
+
+    Les configurations Ultra renvoient souvent le cadre d'une planche, l'image
+    qu'il contient et des sous-zones internes. Chaque chaîne d'imbrication
+    (parent avec un seul enfant) est réduite à un seul rectangle selon la
+    politique choisie, avant tout découpage, OCR ou encodage.
+    """
+
+    def __init__(self, policy: str = None, tolerance: int = None,
+                 min_area_ratio: float = None):
+        config = DETECTION_CONFIG.get('containment', {})
+        self.policy = policy or config.get('policy', 'outermost')
+        if self.policy not in CONTAINMENT_POLICIES:
+            raise ValueError(f"Politique de contenance inconnue: {self.policy}")
+        self.tolerance = config.get('tolerance', 4) if tolerance is None else tolerance
+        self.min_area_ratio = (config.get('min_area_ratio', 0.2)
+                               if min_area_ratio is None else min_area_ratio)
+        self.logger = logger
+
+    def build(self, rectangles: List[Dict[str, Any]]) -> List[Optional[int]]:
+        """Calcule le parent le plus serré de chaque rectangle (None = racine).
+
+        Balayage sur x : un rectangle entre dans l'ensemble actif à x1 - tolérance
+        et en sort dès que x2 + tolérance passe sous le x1 courant. Tri en
+        O(n log n), puis chaque requête ne parcourt que les rectangles actifs.
+        """
+        tol = self.tolerance
+        boxes = []
+        for rect in rectangles:
+            bbox = rect['bbox']
+            x, y, w, h = bbox['x'], bbox['y'], bbox['w'], bbox['h']
+            boxes.append((x, y, x + w, y + h, w * h))
+
+        events = []
+        for i, (x1, _, _, _, _) in enumerate(boxes):
+            events.append((x1 - tol, 0, i))  # insertion
+            events.append((x1, 1, i))        # requête
+        events.sort()
+
+        parents: List[Optional[int]] = [None] * len(boxes)
+        active = {}
+        expiry = []  # tas (x2 + tolérance, index)
+
+        for position, kind, i in events:
+            if kind == 0:
+                active[i] = boxes[i]
+                heapq.heappush(expiry, (boxes[i][2] + tol, i))
+                continue
+
+            while expiry and expiry[0][0] < position:
+                _, expired = heapq.heappop(expiry)
+                active.pop(expired, None)
+
+            cx1, cy1, cx2, cy2, c_area = boxes[i]
+            best, best_area = None, None
+            for j, (px1, py1, px2, py2, p_area) in active.items():
+                if j == i:
+                    continue
+                # Départage des boîtes identiques par index pour éviter les cycles
+                if (p_area, -j) <= (c_area, -i):
+                    continue
+                if p_area <= 0 or c_area / p_area < self.min_area_ratio:
+                    continue
+                if (px1 - tol <= cx1 and py1 - tol <= cy1 and
+                        px2 + tol >= cx2 and py2 + tol >= cy2):
+                    if best_area is None or p_area < best_area:
+                        best, best_area = j, p_area
+            parents[i] = best
+
+        return parents
+
+    def resolve(self, rectangles: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Réduit chaque chaîne d'imbrication selon la politique"""
+        if len(rectangles) < 2:
+            return {
+                'rectangles': list(rectangles),
+                'stats': self._stats(len(rectangles), 0, 0)
+            }
+
+        parents = self.build(rectangles)
+        children: Dict[int, List[int]] = {i: [] for i in range(len(rectangles))}
+        for i, parent in enumerate(parents):
+            if parent is not None:
+                children[parent].append(i)
+
+        kept = set()
+        chains_collapsed = 0
+        for head in range(len(rectangles)):
+            parent = parents[head]
+            # Une chaîne commence à une racine ou sous un parent à plusieurs enfants
+            if parent is not None and len(children[parent]) == 1:
+                continue
+
+            chain = [head]
+            while len(children[chain[-1]]) == 1:
+                chain.append(children[chain[-1]][0])
+
+            representative = self._select(chain, rectangles)
+            kept.add(representative)
+            # Le représentant hérite de la provenance des variantes écartées
+            for i in chain:
+                if i != representative:
+                    BaseDetector.merge_provenance(rectangles[representative], rectangles[i])
+            if len(chain) > 1:
+                chains_collapsed += 1
+
+        resolved = [rect for i, rect in enumerate(rectangles) if i in kept]
+        dropped = len(rectangles) - len(resolved)
+        if dropped:
+            self.logger.info(f"    🪆 Contenance ({self.policy}): {chains_collapsed} chaînes, "
+                             f"{dropped} rectangles imbriqués écartés")
+
+        return {
+            'rectangles': resolved,
+            'stats': self._stats(len(rectangles), chains_collapsed, dropped)
+        }
+
+    def _select(self, chain: List[int], rectangles: List[Dict[str, Any]]) -> int:
+        """Choisit le représentant d'une chaîne (ordonnée de l'extérieur vers l'intérieur)"""
+        if self.policy == 'outermost':
+            return chain[0]
+        if self.policy == 'innermost':
+            return chain[-1]
+        # best_score: meilleure confiance, l'extérieur l'emporte en cas d'égalité
+        return max(chain, key=lambda i: (rectangles[i].get('confidence', 0.0), -chain.index(i)))
+
+    def _stats(self, total: int, chains: int, dropped: int) -> Dict[str, Any]:
+        return {
+            'policy': self.policy,
+            'input_rectangles': total,
+            'chains_collapsed': chains,
+            'rectangles_dropped': dropped
+        }
@@ -2,6 +2,7 @@
 Détecteur ultra sensible pour les rectangles
 """
 import cv2
+import time
 import numpy as np
 from typing import List, Dict, Any
 import sys
@@ -16,8 +17,13 @@ from config import DETECTION_CONFIG
 class UltraDetector(BaseDetector):
     """Détecteur ultra sensible utilisant plusieurs configurations"""
     
-    def __init__(self):
+    def __init__(self, config_names: List[str] = None):
         super().__init__("ultra_detector")
+        # Sous-ensemble de configurations (preset de débit), toutes par défaut
+        self.configs = [c for c in DETECTION_CONFIG['ultra_configs']
+                        if config_names is None or c['name'] in config_names]
+        # Temps passé par configuration lors du dernier appel à detect()
+        self.config_timings = {}
     
     def detect(self, image: np.ndarray, config: Dict[str, Any] = None) -> List[Dict[str, Any]]:
         """Détecte les rectangles avec plusieurs configurations ultra sensibles"""
@@ -25,18 +31,26 @@ class UltraDetector(BaseDetector):
         total_pixels = height * width
         
         all_rectangles = []
+        self.config_timings = {}
         
         # Tester toutes les configurations ultra sensibles
-        for config_item in DETECTION_CONFIG['ultra_configs']:
+        for config_item in self.configs:
             self.logger.debug(f"    🧪 Test config: {config_item['name']}")
+            config_start = time.time()
             rectangles = self._detect_with_config(image, config_item, total_pixels)
+            self.config_timings[config_item['name']] = round(time.time() - config_start, 3)
             
             self.logger.debug(f"      → {len(rectangles)} rectangles trouvés")
             
-            # Ajouter tous les rectangles uniques
+            # Ajouter tous les rectangles uniques (en gardant la provenance des doublons)
             for rect in rectangles:
-                if not self._is_duplicate_rectangle(rect, all_rectangles):
+                rect['ultra_config'] = config_item['name']
+                rect['found_by'] = [self.name, f"{self.name}/{config_item['name']}"]
+                duplicate = self._find_duplicate_rectangle(rect, all_rectangles)
+                if duplicate is None:
                     all_rectangles.append(rect)
+                else:
+                    self.merge_provenance(duplicate, rect)
         
         return all_rectangles
     
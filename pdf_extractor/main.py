@@ -3,6 +3,7 @@ Point d'entrée principal pour l'extracteur PDF
 """
 import os
 import sys
+import argparse
 from pathlib import Path
 
 # Ajouter le répertoire parent au path pour les imports
@@ -10,9 +11,36 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from core import PDFExtractor
 from utils import logger
+from config import THROUGHPUT_PRESETS, DEFAULT_PRESET
 
-def main():
+def parse_args(argv=None):
+    """Options de ligne de commande"""
+    parser = argparse.ArgumentParser(description="Extracteur PDF Ultra Sensible")
+    parser.add_argument('--preset', choices=sorted(THROUGHPUT_PRESETS), default=DEFAULT_PRESET,
+                        help="Preset de débit: ultra (défaut), balanced ou fast")
+    parser.add_argument('--crop-format', choices=['png', 'webp', 'jpeg'],
+                        help="Format des découpes (défaut: OUTPUT_CONFIG)")
+    parser.add_argument('--crop-quality', type=int,
+                        help="Niveau PNG 0-9, qualité JPEG/WebP 1-100 (WebP > 100 = sans perte)")
+    parser.add_argument('--thumb-format', choices=['jpeg', 'webp'],
+                        help="Format des miniatures")
+    parser.add_argument('--thumb-quality', type=int, help="Qualité des miniatures 1-100")
+    parser.add_argument('--preview-quality', type=int,
+                        help="Qualité JPEG de l'aperçu de page complète")
+    return parser.parse_args(argv)
+
+def output_formats_from_args(args) -> dict:
+    """Surcharges de OUTPUT_CONFIG['formats'] issues de la ligne de commande"""
+    return {
+        'crop': {'format': args.crop_format, 'quality': args.crop_quality},
+        'thumbnail': {'format': args.thumb_format, 'quality': args.thumb_quality},
+        'page_preview': {'quality': args.preview_quality}
+    }
+
+def main(argv=None):
     """Fonction principale"""
+    args = parse_args(argv)
+    
     print("🚀 EXTRACTEUR PDF ULTRA SENSIBLE")
     print("=" * 60)
     print("🎯 MODE ULTRA : CAPTURE VRAIMENT TOUT !")
@@ -22,6 +50,9 @@ def main():
     print("🎨 Détection par saturation et contours doux")
     print("🔍 Analyse de cohérence des numéros d'œuvres")
     print("🤖 Intégration Ollama pour correction automatique")
+    print(f"⚙️ Preset: {args.preset} ({THROUGHPUT_PRESETS[args.preset]['mode']})")
+    if args.crop_format:
+        print(f"🖼️ Format des découpes: {args.crop_format}")
     print("=" * 60)
     
     # Demander le fichier PDF
@@ -44,7 +75,7 @@ def main():
         max_pages = int(max_pages_input)
     
     # Créer l'extracteur ULTRA
-    extractor = PDFExtractor()
+    extractor = PDFExtractor(preset=args.preset, output_formats=output_formats_from_args(args))
     
     # Lancer l'extraction ULTRA
     print("\n🚀 Extraction ULTRA en cours...")
@@ -0,0 +1,11 @@
+"""
+Module OCR (moteur Tesseract partagé)
+"""
+from .engine import OCREngine, get_ocr_engine
+from .cache import OCRCache
+from .normalizer import OCRNormalizer
+from .digit_recognizer import DigitRecognizer
+from .pool import OCRPool
+from .page_words import PageWords
+
+__all__ = ['OCREngine', 'get_ocr_engine', 'OCRCache', 'OCRNormalizer', 'DigitRecognizer', 'OCRPool', 'PageWords']
@@ -0,0 +1,122 @@
+"""
+Cache disque des résultats OCR, partagé entre sessions
+"""
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from typing import Any, Optional
+
+import numpy as np
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ocr_cache (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_ocr_cache_last_used ON ocr_cache(last_used);
+"""
+
+
+class OCRCache:
+    """Résultats OCR indexés par empreinte des pixels et configuration du moteur.
+
+    La clé combine un BLAKE2b des pixels prétraités de la zone et la chaîne
+    de configuration (backend, version, tessdata, langue, psm, liste
+    blanche) : relancer une extraction sur un volume inchangé ne coûte que
+    des recherches. Taille bornée (entrées et octets), éviction LRU.
+    Le fichier SQLite n'est ouvert qu'à la première recherche.
+    """
+
+    def __init__(self, path: str, max_entries: int = 200000, max_mb: float = 256,
+                 check_every: int = 100):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.check_every = check_every
+        self.stats = {'hits': 0, 'misses': 0, 'evicted': 0}
+        self._puts = 0
+        self._lock = threading.Lock()
+        self.conn: Optional[sqlite3.Connection] = None
+
+    @staticmethod
+    def make_key(image: np.ndarray, config: str) -> str:
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(f"{image.shape}|{image.dtype}|{config}".encode())
+        digest.update(np.ascontiguousarray(image))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            self._connect()
+            row = self.conn.execute("SELECT value FROM ocr_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.stats['misses'] += 1
+                return None
+            self.stats['hits'] += 1
+            with self.conn:
+                self.conn.execute("UPDATE ocr_cache SET last_used = ? WHERE key = ?", (time.time(), key))
+            return json.loads(row[0])
+
+    def put(self, key: str, value: Any):
+        payload = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._connect()
+            with self.conn:
+                self.conn.execute("INSERT OR REPLACE INTO ocr_cache VALUES (?, ?, ?, ?)",
+                                  (key, payload, len(payload), time.time()))
+            self._puts += 1
+            if self._puts % self.check_every == 0:
+                self._evict()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self.stats)
+
+    def close(self):
+        with self._lock:
+            if self.conn is not None:
+                self._evict()
+                self.conn.close()
+                self.conn = None
+
+    def _connect(self):
+        if self.conn is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            self.conn = sqlite3.connect(self.path, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript(SCHEMA)
+
+    def _evict(self):
+        """Supprime les entrées les moins récemment utilisées au-delà des limites (90 %)"""
+        count, total = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM ocr_cache").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        target_count = int(self.max_entries * 0.9)
+        target_bytes = int(self.max_bytes * 0.9)
+        removed = 0
+        rows = self.conn.execute("SELECT key, size FROM ocr_cache ORDER BY last_used").fetchall()
+        doomed = []
+        for key, size in rows:
+            if count <= target_count and total <= target_bytes:
+                break
+            doomed.append((key,))
+            count -= 1
+            total -= size
+            removed += 1
+        with self.conn:
+            self.conn.executemany("DELETE FROM ocr_cache WHERE key = ?", doomed)
+        self.stats['evicted'] += removed
+
+    @staticmethod
+    def hit_rate(before: dict, after: dict) -> dict:
+        """Statistiques entre deux instantanés (par page)"""
+        hits = after['hits'] - before['hits']
+        misses = after['misses'] - before['misses']
+        lookups = hits + misses
+        return {'hits': hits, 'misses': misses,
+                'hit_rate': round(hits / lookups, 3) if lookups else None}
@@ -0,0 +1,162 @@
+"""
+Reconnaissance rapide des numéros de planches (kNN sur glyphes), avant Tesseract
+"""
+from typing import List, Optional, Tuple, Dict, Any
+
+import cv2
+import numpy as np
+
+from config import OCR_CONFIG
+
+
+class DigitRecognizer:
+    """Classifieur kNN des chiffres d'un volume, appris sur les numéros lus par Tesseract.
+
+    Un volume n'utilise qu'une ou deux polices pour ses numéros : les
+    chiffres confirmés par Tesseract sur les premières pages (segmentation
+    en composantes connexes, un glyphe par chiffre) servent d'exemples.
+    Ensuite une zone est lue sans Tesseract quand chaque glyphe a ses k
+    voisins d'accord et assez proches ; sinon elle reste à Tesseract. Une
+    réponse sur `audit_every` est tout de même vérifiée par Tesseract
+    (estimation de la précision).
+    """
+
+    def __init__(self, config: Dict[str, Any] = None):
+        self.config = config or OCR_CONFIG.get('digits', {})
+        self.k = self.config.get('k', 3)
+        self.size = self.config.get('glyph_size', 16)
+        self.min_samples = self.config.get('min_samples', 40)
+        self.max_per_digit = self.config.get('max_samples_per_digit', 50)
+        self.audit_every = self.config.get('audit_every', 10)
+        self.reset()
+
+    def reset(self):
+        """Nouveau document : exemples et statistiques remis à zéro"""
+        self.samples: List[np.ndarray] = []
+        self.labels: List[int] = []
+        self._model = None
+        self._threshold = None
+        self.stats = {'rectangles_knn': 0, 'rectangles_tesseract': 0,
+                      'audits': 0, 'audit_agreements': 0}
+
+    @property
+    def ready(self) -> bool:
+        return len(self.samples) >= self.min_samples
+
+    def segment(self, zone: np.ndarray) -> Optional[List[np.ndarray]]:
+        """Glyphes de la ligne de chiffres principale, de gauche à droite (vecteurs normalisés).
+
+        [] si la zone n'a pas d'encre, None si des glyphes se touchent.
+        """
+        if zone is None or zone.size == 0:
+            return []
+        gray = cv2.cvtColor(zone, cv2.COLOR_BGR2GRAY) if zone.ndim == 3 else zone
+        _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+        count, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+
+        # Chiffres en plusieurs traits (4 ouvert, impression cassée) : fusion des
+        # composantes qui se chevauchent horizontalement
+        boxes = []
+        for x, y, w, h, area in sorted(stats[1:].tolist()):
+            if area < 4 or h > 0.95 * gray.shape[0]:
+                continue
+            if boxes:
+                px, py, pw, ph = boxes[-1]
+                if min(px + pw, x + w) - max(px, x) > 0.5 * min(pw, w):
+                    x2, y2 = max(px + pw, x + w), max(py + ph, y + h)
+                    boxes[-1] = (px, min(py, y), x2 - px, y2 - min(py, y))
+                    continue
+            boxes.append((x, y, w, h))
+        boxes = [(x, y, w, h) for x, y, w, h in boxes if h >= 6]
+        if not boxes:
+            return []
+        # Ligne du glyphe le plus haut, glyphes de taille comparable
+        tallest = max(boxes, key=lambda b: b[3])
+        center = tallest[1] + tallest[3] / 2
+        line = sorted((b for b in boxes if b[3] >= 0.6 * tallest[3]
+                       and abs(b[1] + b[3] / 2 - center) <= tallest[3] / 2), key=lambda b: b[0])
+        if any(w > 1.5 * h for _, _, w, h in line):
+            return None  # Glyphes collés : segmentation impossible
+        return [self._glyph(binary[y:y + h, x:x + w]) for x, y, w, h in line]
+
+    def recognize(self, zone: np.ndarray) -> Tuple[str, Optional[str]]:
+        """('number', chiffres) si tous les glyphes sont sûrs, ('empty', None) ou ('uncertain', None)"""
+        glyphs = self.segment(zone)
+        if glyphs is not None and not glyphs:
+            return 'empty', None
+        if glyphs is None or not self.ready or len(glyphs) > 6:
+            return 'uncertain', None
+        data, labels, threshold = self._fit()
+        neighbours, distances = self._nearest(np.vstack(glyphs), data, labels, self.k)
+        digits = []
+        for votes, dists in zip(neighbours, distances):
+            if len(set(votes.tolist())) != 1 or dists[0] > threshold:
+                return 'uncertain', None
+            digits.append(str(votes[0]))
+        return 'number', "".join(digits)
+
+    def read_zones(self, zones: List[np.ndarray]) -> Optional[str]:
+        """Premier numéro sûr dans les zones (ordre de priorité), None s'il faut Tesseract"""
+        for zone in zones:
+            status, number = self.recognize(zone)
+            if status == 'number':
+                return number
+            if status == 'uncertain':
+                return None
+        return None
+
+    def should_audit(self) -> bool:
+        return self.audit_every > 0 and self.stats['rectangles_knn'] % self.audit_every == 0
+
+    def learn(self, zone: np.ndarray, number: str):
+        """Exemples tirés d'un numéro confirmé par Tesseract (un glyphe par chiffre)"""
+        if not number or not number.isdigit():
+            return
+        glyphs = self.segment(zone)
+        if glyphs is None or len(glyphs) != len(number):
+            return
+        for glyph, digit in zip(glyphs, number):
+            if self.labels.count(int(digit)) < self.max_per_digit:
+                self.samples.append(glyph)
+                self.labels.append(int(digit))
+                self._model = None
+
+    def report(self) -> Dict[str, Any]:
+        """Statistiques du document : appels évités et précision mesurée par les audits"""
+        stats = dict(self.stats)
+        total = stats['rectangles_knn'] + stats['rectangles_tesseract']
+        stats['samples'] = len(self.samples)
+        stats['call_reduction'] = round(stats['rectangles_knn'] / total, 3) if total else None
+        stats['audit_accuracy'] = (round(stats['audit_agreements'] / stats['audits'], 3)
+                                   if stats['audits'] else None)
+        return stats
+
+    def _glyph(self, binary: np.ndarray) -> np.ndarray:
+        """Glyphe centré dans un carré, réduit à size × size"""
+        h, w = binary.shape[:2]
+        side = max(h, w)
+        square = np.zeros((side, side), np.uint8)
+        square[(side - h) // 2:(side - h) // 2 + h, (side - w) // 2:(side - w) // 2 + w] = binary
+        small = cv2.resize(square, (self.size, self.size), interpolation=cv2.INTER_AREA)
+        return (small.astype(np.float32) / 255.0).reshape(1, -1)
+
+    def _fit(self):
+        if self._model is None:
+            data = np.vstack(self.samples)
+            labels = np.array(self.labels)
+            # Seuil : distance au plus proche autre exemple de même chiffre (95e centile)
+            neighbours, distances = self._nearest(data, data, labels, min(2, len(data)))
+            same = [d[1] for n, d, label in zip(neighbours, distances, labels)
+                    if len(d) > 1 and n[1] == label]
+            spread = float(np.percentile(same, 95)) if same else 0.0
+            self._threshold = max(spread * self.config.get('distance_margin', 1.5),
+                                  self.config.get('min_distance', 4.0))
+            self._model = (data, labels)
+        return self._model[0], self._model[1], self._threshold
+
+    @staticmethod
+    def _nearest(queries: np.ndarray, data: np.ndarray, labels: np.ndarray, k: int):
+        """Étiquettes et distances (L2 au carré) des k plus proches exemples"""
+        distances = ((queries ** 2).sum(1)[:, None] - 2 * queries @ data.T + (data ** 2).sum(1)[None, :])
+        order = np.argsort(distances, axis=1)[:, :k]
+        return labels[order], np.maximum(np.take_along_axis(distances, order, axis=1), 0)
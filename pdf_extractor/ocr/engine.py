@@ -0,0 +1,397 @@
+"""
+Moteur OCR partagé : disponibilité sondée une fois, API Tesseract gardée chaude
+"""
+import os
+import threading
+from concurrent.futures import Future
+from typing import Optional, List, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from utils import logger
+from config import OCR_CONFIG
+from .normalizer import OCRNormalizer
+
+
+class OCREngine:
+    """Point d'entrée unique de l'OCR pour les collections et les analyseurs.
+
+    Le backend est choisi au premier appel puis mémorisé :
+    - `tesserocr` (binding de l'API C) : une instance `PyTessBaseAPI` par
+      thread, initialisée une seule fois, sans sous-processus ni fichier
+      temporaire ;
+    - `pytesseract` : un processus `tesseract` par appel, mais la version
+      n'est plus vérifiée avant chaque reconnaissance.
+    `recognize` est utilisable depuis plusieurs threads. Avec un cache
+    attaché (`attach_cache`), chaque zone déjà reconnue avec la même
+    configuration est servie sans appel Tesseract. `submit_words`,
+    `submit_recognize` et `submit_mosaic` confient la reconnaissance au pool
+    de processus (`OCR_CONFIG['pool']`) et retournent un `Future`. Chaque image est
+    d'abord ramenée à une hauteur de texte cible (`OCRNormalizer`) ; les
+    boîtes des mots restent dans les coordonnées de l'image fournie.
+    """
+
+    BACKENDS = ('tesserocr', 'pytesseract')
+
+    def __init__(self, backend: str = None, lang: str = None):
+        self.requested = backend or OCR_CONFIG.get('engine', 'auto')
+        self.lang = lang or OCR_CONFIG.get('lang', 'eng')
+        self.logger = logger
+        self._backend: Optional[str] = None
+        self._probed = False
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._version = ''
+        self.cache = None
+        self._pool = None
+        self.normalizer = (OCRNormalizer() if OCR_CONFIG.get('normalize', {}).get('enabled', True)
+                           else None)
+
+    def attach_cache(self, cache):
+        """Cache de résultats (OCRCache) consulté avant chaque reconnaissance"""
+        self.cache = cache
+
+    @property
+    def backend(self) -> Optional[str]:
+        """Backend retenu (None si aucun Tesseract utilisable)"""
+        if not self._probed:
+            with self._lock:
+                if not self._probed:
+                    self._backend = self._probe()
+                    self._probed = True
+        return self._backend
+
+    @property
+    def available(self) -> bool:
+        return self.backend is not None
+
+    def recognize(self, image: np.ndarray, psm: int = 6, whitelist: str = None) -> str:
+        """Texte reconnu dans une zone (niveaux de gris ou BGR) ; "" si OCR indisponible"""
+        backend = self.backend
+        if backend is None or image is None or image.size == 0:
+            return ""
+        return self._cached(image, self.config_key('text', psm, whitelist),
+                            lambda: self._recognize(image, psm, whitelist))
+
+    def words(self, image: np.ndarray, psm: int = 3, whitelist: str = None) -> List[dict]:
+        """Mots reconnus avec leur boîte : {'text', 'x', 'y', 'w', 'h', 'line'}.
+
+        `line` identifie la ligne Tesseract du mot (reconstitution du texte).
+        """
+        if self.backend is None or image is None or image.size == 0:
+            return []
+        return self._cached(image, self.config_key('words', psm, whitelist),
+                            lambda: self._words(image, psm, whitelist))
+
+    def submit_words(self, image: np.ndarray, psm: int = 3, whitelist: str = None) -> Future:
+        """Comme `words`, exécuté par le pool OCR ; résultat attendu plus tard"""
+        return self._submit('words', image, psm, whitelist)
+
+    def submit_recognize(self, image: np.ndarray, psm: int = 6, whitelist: str = None) -> Future:
+        """Comme `recognize`, exécuté par le pool OCR ; résultat attendu plus tard"""
+        return self._submit('text', image, psm, whitelist)
+
+    @property
+    def pool_workers(self) -> int:
+        """Nombre de processus OCR (0 : reconnaissance dans le processus courant)"""
+        if self.backend is None:
+            return 0
+        return max(0, int(OCR_CONFIG.get('pool', {}).get('workers', 0) or 0))
+
+    def shutdown_pool(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+    def recognize_mosaic(self, zones: List[np.ndarray], psm: int = None, whitelist: str = None,
+                         padding: int = None) -> List[str]:
+        """Reconnaît plusieurs zones en un seul appel (voir `submit_mosaic`)"""
+        return self.submit_mosaic(zones, psm, whitelist, padding).result()
+
+    def submit_mosaic(self, zones: List[np.ndarray], psm: int = None, whitelist: str = None,
+                      padding: int = None) -> Future:
+        """Reconnaît plusieurs zones en un seul appel, exécuté par le pool OCR.
+
+        Les zones sont empilées verticalement sur fond blanc, séparées par
+        `padding` pixels ; chaque mot reconnu est rattaché à la zone qui
+        contient son centre. Le `Future` donne le texte de chaque zone, dans
+        l'ordre. Avec un cache, seules les zones absentes du cache entrent dans
+        la mosaïque, et chaque zone est mémorisée séparément.
+        """
+        config = OCR_CONFIG.get('mosaic', {})
+        psm = psm or config.get('psm', 11)
+        padding = config.get('padding', 24) if padding is None else padding
+        texts = [""] * len(zones)
+        if not zones or self.backend is None:
+            return self._done(texts)
+
+        pending = list(range(len(zones)))
+        keys = [None] * len(zones)
+        if self.cache is not None:
+            config_key = self.config_key('mosaic', psm, whitelist, padding)
+            pending = []
+            for index, zone in enumerate(zones):
+                if zone is None or zone.size == 0:
+                    continue
+                keys[index] = self.cache.make_key(self._gray(zone), config_key)
+                cached = self.cache.get(keys[index])
+                if cached is None:
+                    pending.append(index)
+                else:
+                    texts[index] = cached
+            if not pending:
+                return self._done(texts)
+
+        mosaic, spans = self.build_mosaic([self._normalized(zones[i]) for i in pending], padding)
+        if mosaic is None:
+            return self._done(texts)
+
+        def split(words: list) -> List[str]:
+            per_zone: List[List[Tuple[int, int, str]]] = [[] for _ in pending]
+            for word in words:
+                center_y = word['y'] + word['h'] / 2
+                for slot, (y1, y2) in enumerate(spans):
+                    if y1 <= center_y < y2:
+                        per_zone[slot].append((word['y'], word['x'], word['text']))
+                        break
+            for slot, found in enumerate(per_zone):
+                index = pending[slot]
+                texts[index] = " ".join(text for _, _, text in sorted(found))
+                if keys[index] is not None:
+                    self.cache.put(keys[index], texts[index])
+            return texts
+
+        pool = self._get_pool()
+        if pool is None:
+            return self._done(split(self._words(mosaic, psm, whitelist, normalize=False)))
+
+        result = Future()
+
+        def done(job: Future):
+            try:
+                result.set_result(split(job.result()))
+            except BaseException as e:
+                result.set_exception(e)
+
+        pool.submit('mosaic', mosaic, psm, whitelist).add_done_callback(done)
+        return result
+
+    def config_key(self, kind: str, psm: int, whitelist: Optional[str], *extra) -> str:
+        """Configuration qui détermine le résultat (clé de cache avec les pixels)"""
+        parts = [kind, self.backend or '', self._version, os.environ.get('TESSDATA_PREFIX', ''),
+                 self.lang, str(psm), whitelist or '',
+                 self.normalizer.describe() if self.normalizer else 'brut'] + [str(e) for e in extra]
+        return "|".join(parts)
+
+    @staticmethod
+    def build_mosaic(zones: List[np.ndarray], padding: int) -> Tuple[Optional[np.ndarray], List[Tuple[int, int]]]:
+        """Image unique (niveaux de gris) et bande verticale [y1, y2) de chaque zone"""
+        grays = []
+        for zone in zones:
+            if zone is None or zone.size == 0:
+                grays.append(None)
+            else:
+                grays.append(OCREngine._gray(zone))
+        placed = [g for g in grays if g is not None]
+        if not placed:
+            return None, [(0, 0)] * len(zones)
+
+        width = max(g.shape[1] for g in placed) + 2 * padding
+        height = sum(g.shape[0] + padding for g in placed) + padding
+        mosaic = np.full((height, width), 255, dtype=np.uint8)
+
+        spans = []
+        y = padding
+        for gray in grays:
+            if gray is None:
+                spans.append((0, 0))
+                continue
+            h, w = gray.shape[:2]
+            mosaic[y:y + h, padding:padding + w] = gray
+            # Bande élargie de la moitié du séparateur (mots débordant de la zone)
+            spans.append((y - padding // 2, y + h + padding // 2))
+            y += h + padding
+        return mosaic, spans
+
+    def _probe(self) -> Optional[str]:
+        candidates = self.BACKENDS if self.requested == 'auto' else (self.requested,)
+        for name in candidates:
+            try:
+                if name == 'tesserocr':
+                    import tesserocr
+                    api = tesserocr.PyTessBaseAPI(lang=self.lang)
+                    api.End()
+                    self._version = tesserocr.tesseract_version().splitlines()[0]
+                else:
+                    import pytesseract
+                    self._version = str(pytesseract.get_tesseract_version())
+            except Exception as e:
+                self.logger.debug(f"OCR {name} indisponible: {e}")
+                continue
+            self.logger.info(f"🔤 Moteur OCR: {name}")
+            return name
+        self.logger.warning("⚠️ Tesseract non disponible - OCR désactivé")
+        return None
+
+    def _submit(self, kind: str, image: np.ndarray, psm: int, whitelist: Optional[str]) -> Future:
+        empty = "" if kind == 'text' else []
+        if self.backend is None or image is None or image.size == 0:
+            return self._done(empty)
+        key = None
+        if self.cache is not None:
+            key = self.cache.make_key(image, self.config_key(kind, psm, whitelist))
+            cached = self.cache.get(key)
+            if cached is not None:
+                return self._done(cached)
+
+        pool = self._get_pool()
+        if pool is None:
+            result = (self._recognize if kind == 'text' else self._words)(image, psm, whitelist)
+            if key is not None:
+                self.cache.put(key, result)
+            return self._done(result)
+
+        future = pool.submit(kind, image, psm, whitelist)
+        if key is not None:
+            def store(done: Future):
+                if not done.cancelled() and done.exception() is None:
+                    self.cache.put(key, done.result())
+            future.add_done_callback(store)
+        return future
+
+    def _get_pool(self):
+        workers = self.pool_workers
+        if workers == 0:
+            return None
+        with self._lock:
+            if self._pool is None:
+                from .pool import OCRPool
+                config = OCR_CONFIG.get('pool', {})
+                self._pool = OCRPool(workers, self.backend, self.lang,
+                                     config.get('omp_thread_limit', 1))
+                self.logger.info(f"🔤 Pool OCR: {workers} processus")
+            return self._pool
+
+    @staticmethod
+    def _done(result) -> Future:
+        future = Future()
+        future.set_result(result)
+        return future
+
+    def _cached(self, image: np.ndarray, config_key: str, compute):
+        if self.cache is None:
+            return compute()
+        key = self.cache.make_key(image, config_key)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        result = compute()
+        self.cache.put(key, result)
+        return result
+
+    def _normalized(self, image: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        if self.normalizer is None or image is None or image.size == 0:
+            return image
+        return self.normalizer.normalize(image)[0]
+
+    def _recognize(self, image: np.ndarray, psm: int, whitelist: Optional[str]) -> str:
+        image = self._normalized(image)
+        if self.backend == 'tesserocr':
+            return self._recognize_tesserocr(image, psm, whitelist)
+        return self._recognize_pytesseract(image, psm, whitelist)
+
+    def _words(self, image: np.ndarray, psm: int, whitelist: Optional[str], normalize: bool = True) -> list:
+        scale = 1.0
+        if normalize and self.normalizer is not None:
+            image, scale = self.normalizer.normalize(image)
+        if self.backend == 'tesserocr':
+            words = self._words_tesserocr(image, psm, whitelist)
+        else:
+            words = self._words_pytesseract(image, psm, whitelist)
+        if scale != 1.0:
+            # Boîtes ramenées dans les coordonnées de l'image fournie
+            for word in words:
+                for key in ('x', 'y', 'w', 'h'):
+                    word[key] = int(round(word[key] / scale))
+        return words
+
+    def _recognize_tesserocr(self, image: np.ndarray, psm: int, whitelist: Optional[str]) -> str:
+        import tesserocr
+        api = getattr(self._local, 'api', None)
+        if api is None:
+            api = tesserocr.PyTessBaseAPI(lang=self.lang)
+            self._local.api = api
+        api.SetPageSegMode(psm)
+        api.SetVariable('tessedit_char_whitelist', whitelist or '')
+        api.SetImage(self._to_pil(image))
+        return api.GetUTF8Text()
+
+    def _recognize_pytesseract(self, image: np.ndarray, psm: int, whitelist: Optional[str]) -> str:
+        import pytesseract
+        config = f"--psm {psm}"
+        if whitelist:
+            config += f" -c tessedit_char_whitelist={whitelist}"
+        return pytesseract.image_to_string(image, lang=self.lang, config=config)
+
+    def _words_tesserocr(self, image: np.ndarray, psm: int, whitelist: Optional[str]) -> list:
+        import tesserocr
+        api = getattr(self._local, 'api', None)
+        if api is None:
+            api = tesserocr.PyTessBaseAPI(lang=self.lang)
+            self._local.api = api
+        api.SetPageSegMode(psm)
+        api.SetVariable('tessedit_char_whitelist', whitelist or '')
+        api.SetImage(self._to_pil(image))
+        api.Recognize()
+
+        words = []
+        line = 0
+        level = tesserocr.RIL.WORD
+        for item in tesserocr.iterate_level(api.GetIterator(), level):
+            if item.IsAtBeginningOf(tesserocr.RIL.TEXTLINE):
+                line += 1
+            text = (item.GetUTF8Text(level) or "").strip()
+            box = item.BoundingBox(level)
+            if text and box:
+                x1, y1, x2, y2 = box
+                words.append({'text': text, 'x': x1, 'y': y1, 'w': x2 - x1, 'h': y2 - y1,
+                              'line': line})
+        return words
+
+    def _words_pytesseract(self, image: np.ndarray, psm: int, whitelist: Optional[str]) -> list:
+        import pytesseract
+        config = f"--psm {psm}"
+        if whitelist:
+            config += f" -c tessedit_char_whitelist={whitelist}"
+        data = pytesseract.image_to_data(image, lang=self.lang, config=config,
+                                         output_type=pytesseract.Output.DICT)
+        return [{'text': text.strip(), 'x': data['left'][i], 'y': data['top'][i],
+                 'w': data['width'][i], 'h': data['height'][i],
+                 'line': (data['block_num'][i], data['par_num'][i], data['line_num'][i])}
+                for i, text in enumerate(data['text']) if text and text.strip()]
+
+    @staticmethod
+    def _gray(image: np.ndarray) -> np.ndarray:
+        return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+
+    @staticmethod
+    def _to_pil(image: np.ndarray) -> Image.Image:
+        if image.ndim == 3:
+            image = image[:, :, ::-1]  # BGR → RGB
+        return Image.fromarray(np.ascontiguousarray(image))
+
+
+_shared_engine: Optional[OCREngine] = None
+_shared_lock = threading.Lock()
+
+
+def get_ocr_engine() -> OCREngine:
+    """Moteur partagé par tout le processus"""
+    global _shared_engine
+    with _shared_lock:
+        if _shared_engine is None:
+            _shared_engine = OCREngine()
+        return _shared_engine
@@ -0,0 +1,69 @@
+"""
+Mots positionnés d'une page (couche texte PDF ou OCR), partagés par les analyseurs
+"""
+from typing import List, Dict, Any, Tuple
+
+import cv2
+import numpy as np
+
+
+class PageWords:
+    """Mots d'une page en coordonnées du raster : {'text', 'x', 'y', 'w', 'h', 'line'}.
+
+    Lus dans la couche texte du PDF quand elle existe, sinon par un OCR
+    pleine page, une seule fois par page, puis consommés par l'analyse de
+    sommaire (`text()`) et par les collections (jointure spatiale `text_in()` sur les
+    zones de recherche des numéros).
+    """
+
+    def __init__(self, words: List[Dict[str, Any]] = None, source: str = 'ocr'):
+        self.words = words or []
+        self.source = source
+
+    @staticmethod
+    def preprocess(page_image: np.ndarray) -> np.ndarray:
+        """Niveaux de gris + CLAHE, comme l'extraction de texte historique"""
+        gray = cv2.cvtColor(page_image, cv2.COLOR_BGR2GRAY) if page_image.ndim == 3 else page_image
+        return cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8)).apply(gray)
+
+    @classmethod
+    def from_ocr(cls, page_image: np.ndarray, engine, psm: int = 3) -> 'PageWords':
+        """OCR pleine page"""
+        return cls(engine.words(cls.preprocess(page_image), psm=psm), source='ocr')
+
+    @classmethod
+    def from_text_layer(cls, pdf_page, dpi: int) -> 'PageWords':
+        """Mots de la couche texte d'une page PyMuPDF, convertis en pixels du raster à `dpi`"""
+        import fitz
+        scale = dpi / 72.0
+        # Coordonnées de page non tournée → page affichée (telle que rastérisée)
+        matrix = pdf_page.rotation_matrix * fitz.Matrix(scale, scale)
+        words = []
+        for x0, y0, x1, y1, text, block, line, _ in pdf_page.get_text("words"):
+            if not text.strip():
+                continue
+            rect = fitz.Rect(x0, y0, x1, y1) * matrix
+            words.append({'text': text.strip(), 'x': int(round(rect.x0)), 'y': int(round(rect.y0)),
+                          'w': max(1, int(round(rect.width))), 'h': max(1, int(round(rect.height))),
+                          'line': (block, line)})
+        return cls(words, source='text_layer')
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def text(self) -> str:
+        """Texte de la page, une ligne de texte détectée par ligne"""
+        lines: Dict[Any, List[str]] = {}
+        for word in self.words:
+            lines.setdefault(word.get('line'), []).append(word['text'])
+        return "\n".join(" ".join(words) for words in lines.values()).strip()
+
+    def in_zone(self, box: Tuple[int, int, int, int]) -> List[Dict[str, Any]]:
+        """Mots dont le centre tombe dans la zone (x, y, w, h), en ordre de lecture"""
+        x, y, w, h = box
+        found = [word for word in self.words
+                 if x <= word['x'] + word['w'] / 2 < x + w and y <= word['y'] + word['h'] / 2 < y + h]
+        return sorted(found, key=lambda word: (word['y'], word['x']))
+
+    def text_in(self, box: Tuple[int, int, int, int]) -> str:
+        return " ".join(word['text'] for word in self.in_zone(box))
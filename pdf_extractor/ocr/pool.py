@@ -0,0 +1,71 @@
+"""
+Pool de processus OCR : Tesseract tourne hors du processus principal
+"""
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, Future
+from typing import Optional
+
+# Moteur propre à chaque processus du pool (initialisé une fois par worker)
+_worker_engine = None
+
+
+def _init_worker(backend: str, lang: str, tesseract_cmd: Optional[str], omp_thread_limit: int):
+    """Limite les threads OpenMP de Tesseract avant son premier chargement"""
+    global _worker_engine
+    os.environ['OMP_THREAD_LIMIT'] = str(omp_thread_limit)
+    if tesseract_cmd:
+        import pytesseract
+        pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+    from .engine import OCREngine
+    _worker_engine = OCREngine(backend, lang)
+
+
+def _run_job(kind: str, image, psm: int, whitelist: Optional[str]):
+    if _worker_engine.backend is None:
+        return "" if kind == 'text' else []
+    if kind == 'text':
+        return _worker_engine._recognize(image, psm, whitelist)
+    # Mosaïque : zones déjà normalisées une à une avant assemblage
+    return _worker_engine._words(image, psm, whitelist, normalize=kind != 'mosaic')
+
+
+class OCRPool:
+    """Processus OCR dédiés, `workers` × `omp_thread_limit` threads au plus.
+
+    Chaque processus garde son propre moteur (API tesserocr ouverte une
+    fois). Les soumissions retournent des `Future` attendus par l'appelant
+    seulement quand il a besoin du résultat.
+    """
+
+    def __init__(self, workers: int, backend: str, lang: str, omp_thread_limit: int = 1):
+        self.workers = workers
+        tesseract_cmd = None
+        if backend == 'pytesseract':
+            import pytesseract
+            tesseract_cmd = pytesseract.pytesseract.tesseract_cmd
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker,
+            initargs=(backend, lang, tesseract_cmd, omp_thread_limit))
+        # Soumissions en cours (annulées à l'arrêt, `cancel_futures` n'existe qu'en 3.9)
+        self.pending = set()
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, image, psm: int, whitelist: Optional[str] = None) -> Future:
+        """kind: 'text' (chaîne reconnue), 'words' (mots et boîtes) ou 'mosaic' (mots, sans normalisation)"""
+        future = self.executor.submit(_run_job, kind, image, psm, whitelist)
+        with self._lock:
+            self.pending.add(future)
+        future.add_done_callback(self._forget)
+        return future
+
+    def shutdown(self):
+        with self._lock:
+            pending = list(self.pending)
+        for future in pending:
+            future.cancel()
+        self.executor.shutdown(wait=True)
+
+    def _forget(self, future: Future):
+        with self._lock:
+            self.pending.discard(future)
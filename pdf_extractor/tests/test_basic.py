@@ -10,9 +10,12 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from pdf_extractor.core import PDFExtractor
-from pdf_extractor.utils import ImageUtils, FileUtils
-from pdf_extractor.detectors import UltraDetector, TemplateDetector, ColorDetector
-from pdf_extractor.analyzers import CoherenceAnalyzer, QualityAnalyzer
+from pdf_extractor.utils import (ImageUtils, FileUtils, ImageWriterPool, OutputFormats, CropRef,
+                                 PagePyramid, BlobStore, SessionDB, ArtworkStore)
+from pdf_extractor.detectors import UltraDetector, TemplateDetector, ColorDetector, ContainmentTree
+from pdf_extractor.analyzers import CoherenceAnalyzer, QualityAnalyzer, DetectorAnalytics
+from pdf_extractor.analyzers.final_json_generator import FinalJSONGenerator
+from pdf_extractor.ocr import OCREngine, get_ocr_engine, PageWords
 
 class TestPDFExtractor(unittest.TestCase):
     """Tests pour l'extracteur PDF principal"""
@@ -28,6 +31,120 @@ class TestPDFExtractor(unittest.TestCase):
         self.assertIsNotNone(self.extractor.coherence_analyzer)
         self.assertIsNotNone(self.extractor.quality_analyzer)
     
+    def test_throughput_presets(self):
+        """Test la sélection des presets de débit"""
+        fast = PDFExtractor(preset='fast')
+        self.assertEqual([d.name for d in fast.detectors], ['ultra_detector'])
+        self.assertEqual(fast._select_dpi(500), 200)
+        self.assertEqual(self.extractor._select_dpi(300), 400)
+        self.assertEqual(self.extractor._select_dpi(500), 500)
+        with self.assertRaises(ValueError):
+            PDFExtractor(preset='inconnu')
+    
+    def test_inferred_numbers_are_not_evidence(self):
+        """Test que les numéros déduits ne nourrissent ni la suite ni le décalage de la table"""
+        import numpy as np
+        from unittest import mock
+        from pdf_extractor.analyzers import ExpectedPlates, NumberSequence
+        
+        rectangles = [{'bbox': {'x': 550, 'y': 100, 'w': 300, 'h': 250}},
+                      {'bbox': {'x': 100, 'y': 120, 'w': 300, 'h': 250}},
+                      {'bbox': {'x': 100, 'y': 550, 'w': 300, 'h': 250}},
+                      {'bbox': {'x': 550, 'y': 560, 'w': 300, 'h': 250}}]
+        
+        def detect(image, rects, page_context):
+            page_context['number_search'] = {'inferred': [True, False, True, True],
+                                             'sources': ['inferred', 'tesseract', 'inferred', 'inferred']}
+            return ['12', '11', '13', '14']
+        
+        extractor = self.extractor
+        extractor.collection = mock.Mock()
+        extractor.collection.detect_artwork_numbers.side_effect = detect
+        extractor.expected_plates = ExpectedPlates({11: {'page': 5}, 12: {'page': 5}, 14: {'page': 6}},
+                                                   {'enabled': True, 'min_votes': 1})
+        extractor.number_sequence = NumberSequence({'enabled': True, 'min_rectangles': 3,
+                                                    'max_jump': 50, 'reset_after': 2})
+        numbers = extractor._detect_artwork_numbers(np.zeros((1000, 1000, 3), np.uint8), rectangles,
+                                                    page_result={'page_number': 9})
+        
+        self.assertEqual(numbers, ['12', '11', '13', '14'])
+        self.assertEqual(list(extractor.expected_plates.offsets), [4])
+        self.assertEqual(extractor.number_sequence.last, 11)
+        self.assertEqual(extractor.number_sequence.report()['numbers_inferred'], 3)
+    
+    def test_page_finish_overlaps_next_detection(self):
+        """Test que la détection de la page suivante commence avant la fin de la page courante"""
+        import tempfile
+        import threading
+        from unittest import mock
+        from PIL import Image
+        
+        events = []
+        second_started = threading.Event()
+        
+        def start(pdf_path, page_num):
+            events.append(('start', page_num))
+            if page_num == 2:
+                second_started.set()
+            return {'page_num': page_num}
+        
+        def finish(state):
+            # La page 1 ne se termine qu'une fois la détection de la page 2 lancée
+            if state['page_num'] == 1:
+                self.assertTrue(second_started.wait(timeout=10))
+            events.append(('finish', state['page_num']))
+            return {'page_number': state['page_num'], 'success': True, 'images_extracted': 0,
+                    'rectangles_details': []}
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            pdf_path = os.path.join(tmp, 'planches.pdf')
+            pages = [Image.new('RGB', (200, 300), 'white') for _ in range(2)]
+            pages[0].save(pdf_path, 'PDF', save_all=True, append_images=pages[1:])
+            extractor = PDFExtractor(preset='fast')
+            extractor.output_base_dir = tmp
+            extractor.blob_store = None
+            extractor.collection = extractor.collection_manager.get_collection('picasso')
+            with mock.patch.object(extractor.collection, 'extract_toc', return_value=None), \
+                    mock.patch.object(extractor, '_start_page', side_effect=start), \
+                    mock.patch.object(extractor, '_finish_page', side_effect=finish):
+                self.assertTrue(extractor.extract_pdf(pdf_path))
+        
+        self.assertEqual(events, [('start', 1), ('start', 2), ('finish', 1), ('finish', 2)])
+    
+    def test_output_formats(self):
+        """Test les formats de sortie par artefact"""
+        import cv2
+        formats = OutputFormats({'crop': {'format': 'webp'}, 'thumbnail': {'quality': 70}},
+                                png_compression=1)
+        self.assertEqual(formats.filename('crop', '12'), '12.webp')
+        self.assertEqual(formats.write_params('crop'), [cv2.IMWRITE_WEBP_QUALITY, 101])
+        self.assertEqual(formats.write_params('thumbnail'), [cv2.IMWRITE_JPEG_QUALITY, 70])
+        self.assertEqual(self.extractor.output_formats.extension('crop'), '.png')
+        self.assertTrue(OutputFormats.is_image_file('DOUTEUX_3.jpg'))
+        self.assertFalse(OutputFormats.is_image_file('thumb_3.jpg'))
+        self.assertFalse(OutputFormats.is_image_file('page_full_image.jpg'))
+        with self.assertRaises(ValueError):
+            OutputFormats({'page_preview': {'format': 'png'}})
+    
+    def test_renaming_any_extension(self):
+        """Test le renommage des planches quel que soit le format"""
+        import tempfile
+        from pdf_extractor.toc_planches import apply_renaming
+        
+        with tempfile.TemporaryDirectory() as session_dir:
+            page_dir = os.path.join(session_dir, "page_001")
+            os.makedirs(page_dir)
+            for name in ("7.webp", "thumb_7.jpg", "page_full_image.jpg"):
+                open(os.path.join(page_dir, name), 'wb').close()
+            
+            stats = apply_renaming(session_dir, {7: {'title': 'Femme assise', 'page': 12}}, {})
+            files = sorted(os.listdir(page_dir))
+        
+        self.assertEqual(stats['renamed'], 1)
+        self.assertIn('007_femme-assise_012.webp', files)
+        self.assertIn('thumb_007_femme-assise_012.jpg', files)
+        self.assertIn('page_full_image.jpg', files)
+    
     def test_session_folder_creation(self):
         """Test la création du dossier de session"""
         session_dir = FileUtils.create_session_folder("test.pdf", "test_output")
@@ -76,6 +193,102 @@ class TestDetectors(unittest.TestCase):
         rectangles = detector.detect(self.test_image)
         self.assertIsInstance(rectangles, list)
 
+class TestContainmentTree(unittest.TestCase):
+    """Tests pour la hiérarchie de contenance"""
+    
+    def _rect(self, x, y, w, h, confidence=0.5):
+        return {'bbox': {'x': x, 'y': y, 'w': w, 'h': h}, 'confidence': confidence}
+    
+    def setUp(self):
+        """Cadre > image > sous-zone, plus une planche isolée"""
+        self.rectangles = [
+            self._rect(100, 100, 400, 500, 0.4),   # cadre
+            self._rect(120, 120, 360, 460, 0.9),   # image
+            self._rect(150, 150, 300, 380, 0.6),   # sous-zone
+            self._rect(700, 100, 300, 300, 0.7),   # autre planche
+        ]
+    
+    def test_parents(self):
+        """Test le calcul des parents les plus serrés"""
+        parents = ContainmentTree(policy='outermost').build(self.rectangles)
+        self.assertEqual(parents, [None, 0, 1, None])
+    
+    def test_policies(self):
+        """Test la réduction des chaînes selon chaque politique"""
+        expected = {'outermost': 100, 'innermost': 150, 'best_score': 120}
+        for policy, x in expected.items():
+            result = ContainmentTree(policy=policy).resolve(self.rectangles)
+            xs = sorted(r['bbox']['x'] for r in result['rectangles'])
+            self.assertEqual(xs, [x, 700])
+            self.assertEqual(result['stats']['rectangles_dropped'], 2)
+    
+    def test_siblings_are_kept(self):
+        """Test qu'un conteneur à plusieurs enfants ne fusionne pas ses enfants"""
+        rectangles = [
+            self._rect(0, 0, 1000, 500),
+            self._rect(10, 10, 480, 480),
+            self._rect(510, 10, 480, 480),
+        ]
+        result = ContainmentTree(policy='outermost').resolve(rectangles)
+        self.assertEqual(len(result['rectangles']), 3)
+
+    def test_policy_applied_in_process_page(self):
+        """Test que la politique décide entre cadre, image et sous-zone trouvés par des détecteurs différents"""
+        import tempfile
+        import numpy as np
+        from unittest import mock
+        from PIL import Image
+        
+        page = np.full((1000, 1000, 3), 245, np.uint8)
+        page[100:700, 100:600] = np.random.default_rng(0).integers(0, 255, (600, 500, 3), dtype=np.uint8)
+        boxes = {'cadre': (100, 100, 500, 600, 0.4), 'image': (130, 130, 440, 540, 0.9),
+                 'sous_zone': (180, 180, 340, 420, 0.6)}
+        
+        class FixedDetector:
+            merge_provenance = staticmethod(UltraDetector.merge_provenance)
+            
+            def __init__(self, name):
+                self.name = name
+            
+            def detect(self, image):
+                x, y, w, h, confidence = boxes[self.name]
+                return [{'bbox': {'x': x, 'y': y, 'w': w, 'h': h}, 'area': w * h,
+                         'confidence': confidence, 'method': self.name, 'found_by': [self.name]}]
+        
+        module = sys.modules[PDFExtractor.__module__]
+        expected = {'outermost': 100, 'innermost': 180, 'best_score': 130}
+        for policy, x in expected.items():
+            extractor = PDFExtractor(preset='fast')
+            extractor.collection = extractor.collection_manager.get_collection('picasso')
+            extractor.detectors = [FixedDetector('cadre'), FixedDetector('image'), FixedDetector('sous_zone')]
+            extractor.containment_tree = ContainmentTree(policy=policy)
+            extractor.blob_store = None
+            extractor._analyze_page_dimensions = lambda pdf, n: {
+                'width_mm': 210, 'height_mm': 297, 'area_mm2': 62370,
+                'page_format': 'A4', 'recommended_dpi': 200}
+            with tempfile.TemporaryDirectory() as session_dir, \
+                    mock.patch.object(module, 'convert_from_path',
+                                      return_value=[Image.fromarray(page[:, :, ::-1])]):
+                extractor.session_dir = session_dir
+                result = extractor.process_page('planches.pdf', 1)
+                extractor.image_writer.close()
+            
+            self.assertEqual(result['containment']['rectangles_dropped'], 2, policy)
+            self.assertEqual([r['bbox']['x'] for r in result['rectangles_details']], [x], policy)
+            self.assertEqual(sorted(result['rectangles_details'][0]['found_by']),
+                             ['cadre', 'image', 'sous_zone'], policy)
+    
+    def test_exact_duplicates_still_merged(self):
+        """Test que deux détections de la même boîte restent un doublon, pas une imbrication"""
+        frame = {'bbox': {'x': 100, 'y': 100, 'w': 500, 'h': 600}}
+        self.assertFalse(UltraDetector._is_nested(frame['bbox'], {'x': 102, 'y': 99, 'w': 497, 'h': 602}))
+        self.assertTrue(UltraDetector._is_nested(frame['bbox'], {'x': 130, 'y': 130, 'w': 440, 'h': 540}))
+        detector = UltraDetector()
+        self.assertIs(detector._find_duplicate_rectangle(
+            {'bbox': {'x': 102, 'y': 99, 'w': 497, 'h': 602}}, [frame]), frame)
+        self.assertIsNone(detector._find_duplicate_rectangle(
+            {'bbox': {'x': 130, 'y': 130, 'w': 440, 'h': 540}}, [frame]))
+
 class TestAnalyzers(unittest.TestCase):
     """Tests pour les analyseurs"""
     
@@ -106,6 +319,579 @@ class TestAnalyzers(unittest.TestCase):
         self.assertTrue(result['is_doubtful'])
         self.assertIn('image_vide', result['reasons'])
 
+    def test_page_quality_matches_per_image(self):
+        """Test l'accord entre l'analyse par page et l'analyse image par image"""
+        import numpy as np
+        analyzer = QualityAnalyzer()
+        rng = np.random.default_rng(0)
+        
+        blank = np.full((1200, 900, 3), 255, dtype=np.uint8)
+        noise = rng.integers(0, 256, (1100, 1300, 3), dtype=np.uint8)
+        drawing = blank.copy()
+        drawing[::20, :] = 0
+        drawing[:, ::20] = 0
+        flat = np.full((1000, 1000, 3), 128, dtype=np.uint8)
+        strip = rng.integers(0, 256, (60, 900, 3), dtype=np.uint8)
+        images = [blank, noise, drawing, flat, strip]
+        
+        batch = analyzer.analyze_page_quality(images)
+        for image, result in zip(images, batch):
+            expected = analyzer.analyze_image_quality(image, images)
+            self.assertEqual(result['is_doubtful'], expected['is_doubtful'])
+            self.assertEqual(result['reasons'], expected['reasons'])
+            self.assertAlmostEqual(result['confidence'], expected['confidence'])
+    
+    def test_duplicate_index(self):
+        """Test le regroupement des quasi-doublons dans la session et entre volumes"""
+        import tempfile
+        import cv2
+        import numpy as np
+        from pdf_extractor.analyzers.duplicate_index import DuplicateIndex, BKTree, hamming_distance
+        
+        rng = np.random.default_rng(0)
+        artwork = cv2.GaussianBlur(rng.integers(0, 256, (400, 300, 3), dtype=np.uint8), (0, 0), 8)
+        other = cv2.GaussianBlur(rng.integers(0, 256, (400, 300, 3), dtype=np.uint8), (0, 0), 8)
+        detail = cv2.resize(artwork, (150, 200), interpolation=cv2.INTER_AREA)
+        hashes = [f"{ImageUtils.dhash(img):016x}" for img in (artwork, detail, other)]
+        
+        def session(names):
+            return {'pages': [{'page_number': page, 'rectangles_details': [
+                {'filename': f"{i}.png", 'phash': h, 'doubt_reasons': []}
+                for i, h in enumerate(names)]} for page in (1,)]}
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            index_path = os.path.join(tmp_dir, '_phash_index.json')
+            index = DuplicateIndex(index_path)
+            first = session(hashes)
+            groups = index.assign_groups(first, 'volume_1')
+            index.save()
+            
+            self.assertEqual(len(groups), 1)
+            self.assertEqual([m['filename'] for m in groups[0]['members']], ['0.png', '1.png'])
+            self.assertNotIn('duplicate_group', first['pages'][0]['rectangles_details'][2])
+            
+            second = session([hashes[2]])
+            groups = DuplicateIndex(index_path).assign_groups(second, 'volume_2')
+            self.assertEqual(groups[0]['other_volumes'][0]['session'], 'volume_1')
+            self.assertEqual(groups[0]['other_volumes'][0]['filename'], '2.png')
+        
+        tree = BKTree()
+        values = [int(h, 16) for h in hashes] + [int(rng.integers(0, 2**62)) for _ in range(50)]
+        for i, value in enumerate(values):
+            tree.add(value, i)
+        expected = sorted(i for i, v in enumerate(values) if hamming_distance(values[0], v) <= 20)
+        self.assertEqual(sorted(i for _, i in tree.query(values[0], 20)), expected)
+    
+    def test_detector_analytics(self):
+        """Test la contribution des détecteurs sur une session validée"""
+        import json
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as session_dir:
+            page = {
+                'page_number': 1,
+                'detector_timings': {'ultra_detector': 3.0, 'color_detector': 1.0,
+                                     'ultra_detector/ultra_adaptive': 1.0,
+                                     'ultra_detector/ultra_documents': 2.0},
+                'rectangles_details': [
+                    {'filename': '1.png', 'found_by': ['ultra_detector/ultra_adaptive']},
+                    {'filename': '2.png', 'found_by': ['ultra_detector/ultra_adaptive',
+                                                       'ultra_detector/ultra_documents',
+                                                       'color_detector']},
+                    {'filename': '3.png', 'found_by': ['color_detector']},
+                    {'filename': '4.png', 'found_by': ['ultra_detector', 'ultra_detector/ultra_adaptive',
+                                                       'ultra_detector/ultra_documents']}
+                ]
+            }
+            with open(os.path.join(session_dir, 'extraction_ultra_complete.json'), 'w') as f:
+                json.dump({'pages': [page]}, f)
+            with open(os.path.join(session_dir, 'validation_results.json'), 'w') as f:
+                json.dump({'image_states': {'page1_1.png': 'validated',
+                                            'page1_2.png': 'validated',
+                                            'page1_3.png': 'rejected',
+                                            'page1_4.png': 'validated'}}, f)
+
+            analytics = DetectorAnalytics()
+            self.assertTrue(analytics.add_session(session_dir))
+            report = analytics.report()
+
+        sources = {row['source']: row for row in report['sources']}
+        self.assertEqual(sources['ultra_detector/ultra_adaptive']['unique_validated'], 1)
+        self.assertEqual(sources['color_detector']['false_positives'], 1)
+        self.assertEqual(sources['ultra_detector']['unique_validated'], 2)
+        self.assertTrue(sources['ultra_detector']['keep'])
+        self.assertEqual(sources['ultra_detector']['time_share'], 0.75)
+        kept = [c['name'] for c in report['recommended_detection_config']['ultra_configs']]
+        self.assertIn('ultra_adaptive', kept)
+        self.assertNotIn('ultra_documents', kept)
+        self.assertEqual(report['recommended_detectors'], ['ultra_detector'])
+    
+    def test_final_json_incremental(self):
+        """Test le JSON final construit page par page"""
+        import cv2
+        import numpy as np
+        import tempfile
+        
+        with tempfile.TemporaryDirectory() as session_dir:
+            page_dir = os.path.join(session_dir, 'page_001')
+            os.makedirs(os.path.join(page_dir, 'DOUTEUX'))
+            cv2.imwrite(os.path.join(page_dir, '7.png'), np.zeros((30, 20, 3), np.uint8))
+            cv2.imwrite(os.path.join(page_dir, 'DOUTEUX', 'DOUTEUX_rectangle_02.png'),
+                        np.zeros((10, 40, 3), np.uint8))
+            rects = [
+                {'filename': '7.png', 'artwork_number': '7', 'dimensions': [20, 30]},
+                {'filename': 'DOUTEUX_rectangle_02.png', 'is_doubtful': True},
+                {'filename': 'absent.png'}
+            ]
+            summary_page = {'page_number': 2, 'summary_analysis': {
+                'is_summary': True, 'entries': [{'artwork_number': '7', 'title': 'Nu'}]}}
+            
+            generator = FinalJSONGenerator()
+            generator.add_page({'page_number': 1, 'page_dir': page_dir, 'rectangles_details': rects})
+            generator.add_page(summary_page)
+            rects[0]['duplicate_group'] = 'dup_001'
+            final = generator.finalize({'pdf_name': 'cat.pdf'}, session_dir)
+        
+        artworks = {a['image_filename']: a for a in final['artworks']}
+        self.assertEqual(len(artworks), 2)
+        self.assertEqual(artworks['7.png']['title'], 'Nu')
+        self.assertEqual(artworks['7.png']['metadata']['duplicate_group'], 'dup_001')
+        self.assertEqual(artworks['DOUTEUX_rectangle_02.png']['metadata']['image_dimensions'], [40, 10])
+
+    def test_summary_prescreen(self):
+        """Test le pré-filtre des sommaires et l'OCR pleine page évité"""
+        import cv2
+        import numpy as np
+        from unittest import mock
+        from pdf_extractor.analyzers import SummaryPrescreen
+
+        toc = np.full((1754, 1240, 3), 255, np.uint8)
+        for i in range(20):
+            cv2.putText(toc, f"{i + 1}. Femme assise, 1938 ....... {i + 10}", (100, 150 + i * 70),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 0, 0), 2)
+        plates = np.full((1754, 1240, 3), 255, np.uint8)
+        plates[100:800, 100:1100] = np.random.default_rng(0).integers(0, 255, (700, 1000, 3), np.uint8)
+
+        prescreen = SummaryPrescreen()
+        self.assertTrue(prescreen.screen(toc, 50, 200)['candidate'])
+        self.assertEqual(prescreen.screen(plates, 50, 200)['reasons'], [])
+        self.assertEqual(prescreen.screen(plates, 50, 200, toc_pages={50})['reasons'],
+                         ['page_table_des_planches'])
+        self.assertTrue(prescreen.screen(plates, 50, 200, "TABLE DES PLANCHES")['candidate'])
+
+        # Page de planches : pas d'OCR pleine page, décision enregistrée dans summary_analysis
+        extractor = PDFExtractor()
+        from ocr import get_ocr_engine as shared_engine
+        with mock.patch.object(type(shared_engine()), 'available', new_callable=mock.PropertyMock,
+                               return_value=True), \
+                mock.patch.object(shared_engine(), 'submit_words') as submit, \
+                mock.patch.object(extractor, '_text_layer_words', return_value=None):
+            pending, decision = extractor._submit_page_words('cat.pdf', 50, 150, plates)
+            extractor._submit_page_words('cat.pdf', 51, 150, toc)
+        self.assertIsNone(pending)
+        self.assertEqual(submit.call_count, 1)
+        result = extractor.analyze_summary_page({'page_number': 50}, plates, None, decision)
+        self.assertFalse(result['summary_analysis']['prescreen']['candidate'])
+
+class TestOCREngine(unittest.TestCase):
+    """Tests pour le moteur OCR partagé"""
+    
+    def test_probe_runs_once(self):
+        """Test que la disponibilité n'est sondée qu'une fois"""
+        import threading
+        import numpy as np
+        
+        class CountingEngine(OCREngine):
+            probes = 0
+            
+            def _probe(self):
+                CountingEngine.probes += 1
+                return None
+        
+        engine = CountingEngine()
+        threads = [threading.Thread(target=engine.recognize, args=(np.zeros((20, 20), np.uint8),))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(CountingEngine.probes, 1)
+        self.assertFalse(engine.available)
+        self.assertEqual(engine.recognize(np.zeros((20, 20), np.uint8)), "")
+        self.assertIs(get_ocr_engine(), get_ocr_engine())
+    
+    def test_mosaic_layout(self):
+        """Test l'empilement des zones et leurs bandes verticales"""
+        import numpy as np
+        
+        zones = [np.zeros((20, 50, 3), np.uint8), np.zeros((0, 10), np.uint8),
+                 np.full((30, 80), 7, np.uint8)]
+        mosaic, spans = OCREngine.build_mosaic(zones, padding=10)
+        
+        self.assertEqual(mosaic.shape, (80, 100))
+        self.assertEqual(spans, [(5, 35), (0, 0), (35, 75)])
+        self.assertTrue((mosaic[40:70, 10:90] == 7).all())
+        self.assertTrue((mosaic[30:40] == 255).all())
+    
+    def test_batched_numbers_follow_zone_priority(self):
+        """Test la résolution des numéros par priorité de zone sur un lot"""
+        import numpy as np
+        from unittest import mock
+        from pdf_extractor.artwork_collections.picasso_collection import PicassoCollection
+        
+        collection = PicassoCollection()
+        collection.zone_search.config = dict(collection.zone_search.config, triage=False)
+        page = np.full((1000, 1000, 3), 255, np.uint8)
+        rectangles = [{'bbox': {'x': 100, 'y': 100, 'w': 300, 'h': 300}},
+                      {'bbox': {'x': 500, 'y': 500, 'w': 300, 'h': 300}}]
+        zone_counts = [len(collection.number_search_zones(page, r)) for r in rectangles]
+        self.assertEqual(zone_counts, [6, 6])
+        
+        # Rectangle 1 : rien dans la 1re zone, "12" dans la 2e, "99" plus loin
+        texts = ["", "n° 12", "", "", "99", "", "", "", "", "", "", "7"]
+        # Les collections importent le moteur partagé à plat (`ocr`)
+        from ocr import get_ocr_engine as shared_engine
+        context = {}
+        with mock.patch.object(shared_engine(), 'recognize_mosaic', return_value=texts) as batch:
+            numbers = collection.detect_artwork_numbers(page, rectangles, context)
+        
+        self.assertEqual(batch.call_count, 1)
+        self.assertEqual(len(batch.call_args[0][0]), 12)
+        self.assertEqual(numbers, ['12', '7'])
+        readings = context['number_search']['readings']
+        self.assertEqual((readings[1]['zone'], readings[1]['text'], readings[1]['source']),
+                         ('bande_sous_large', 'n° 12', 'tesseract'))
+        self.assertEqual(context['number_search']['sources'], ['tesseract', 'tesseract'])
+    
+    def test_zone_triage_and_adaptive_order(self):
+        """Test l'écart des zones vides ou couvertes et l'ordre appris des zones"""
+        import cv2
+        import numpy as np
+        from unittest import mock
+        from pdf_extractor.artwork_collections import ZoneSearch
+        from pdf_extractor.artwork_collections.picasso_collection import PicassoCollection
+        
+        collection = PicassoCollection()
+        collection.digit_recognizer = None
+        page = np.full((1000, 1000, 3), 255, np.uint8)
+        rectangles = [{'bbox': {'x': 100, 'y': 100, 'w': 300, 'h': 300}},
+                      {'bbox': {'x': 400, 'y': 100, 'w': 300, 'h': 300}}]
+        cv2.putText(page, "12", (230, 430), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 0, 0), 2)
+        cv2.putText(page, "5", (420, 250), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 0, 0), 2)
+        
+        # Zone droite couverte par le 2e rectangle, zones internes sans encre
+        zones = collection.number_search_zones(page, rectangles[0], rectangles)
+        self.assertEqual([name for name, _ in zones], ['bande_sous_petite', 'bande_sous_large'])
+        
+        from ocr import get_ocr_engine as shared_engine
+        context = {}
+        with mock.patch.object(shared_engine(), 'recognize_mosaic', return_value=["12", "12", "5"]):
+            numbers = collection.detect_artwork_numbers(page, rectangles, context)
+        self.assertEqual(numbers[0], '12')
+        self.assertEqual(context['number_search']['ocr_zones'][0], 2)
+        
+        search = ZoneSearch({'min_found': 3, 'stage_min_rate': 0.5})
+        order = [('bande_sous_petite', None), ('zone_droite', None)]
+        self.assertEqual(search.order(order), order)
+        for _ in range(3):
+            search.record(['bande_sous_petite', 'zone_droite'], 'zone_droite')
+        self.assertEqual([name for name, _ in search.order(order)], ['zone_droite', 'bande_sous_petite'])
+        self.assertEqual(search.stages(), [(0, 1), (1, None)])
+        self.assertEqual(search.report()['ocr_per_rectangle'], 2.0)
+    
+    def test_toc_guided_verification(self):
+        """Test la vérification des numéros attendus d'après la table des planches"""
+        import cv2
+        import numpy as np
+        from unittest import mock
+        from pdf_extractor.analyzers import ExpectedPlates
+        from pdf_extractor.artwork_collections.picasso_collection import PicassoCollection
+        
+        plates = ExpectedPlates({12: {'page': 40}, 13: {'page': 40}, 14: {'page': 41}, 15: {'page': None}},
+                                {'enabled': True, 'min_votes': 2, 'page_slack': 0})
+        self.assertIsNone(plates.expected(50))
+        plates.confirm(48, ['12', '13', None])
+        self.assertEqual(plates.offset, 8)
+        self.assertEqual(plates.expected(48)['numbers'], ['12', '13'])
+        
+        collection = PicassoCollection()
+        collection.digit_recognizer = None
+        page = np.full((1000, 1000, 3), 255, np.uint8)
+        rectangles = [{'bbox': {'x': 100, 'y': 100, 'w': 300, 'h': 300}},
+                      {'bbox': {'x': 100, 'y': 550, 'w': 300, 'h': 300}},
+                      {'bbox': {'x': 600, 'y': 100, 'w': 100, 'h': 100}}]
+        for text, origin in (("12", (230, 430)), ("18", (230, 880)), ("7", (640, 230))):
+            cv2.putText(page, text, origin, cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 0, 0), 2)
+        
+        # "18" corrigé en 13 ; page complète : pas de recherche ouverte pour le "7"
+        context = {'expected_numbers': plates.expected(48)}
+        from ocr import get_ocr_engine as shared_engine
+        with mock.patch.object(shared_engine(), 'recognize_mosaic',
+                               return_value=["12", "12", "18", "", "7", "7"]) as batch:
+            numbers = collection.detect_artwork_numbers(page, rectangles, context)
+        self.assertEqual(numbers, ['12', '13', None])
+        self.assertEqual(batch.call_count, 1)
+        self.assertEqual(batch.call_args[1]['whitelist'], "123")
+        verification = context['number_search']['verification']
+        self.assertEqual((verification['matched'], verification['corrected'], verification['skipped']), (2, 1, 1))
+    
+    def test_sequence_inference_from_anchors(self):
+        """Test la déduction des numéros intérieurs quand les extrêmes confirment la suite"""
+        import cv2
+        import numpy as np
+        from unittest import mock
+        from pdf_extractor.analyzers import NumberSequence
+        from pdf_extractor.artwork_collections.picasso_collection import PicassoCollection
+        
+        rectangles = [{'bbox': {'x': 550, 'y': 100, 'w': 300, 'h': 250}},
+                      {'bbox': {'x': 100, 'y': 120, 'w': 300, 'h': 250}},
+                      {'bbox': {'x': 100, 'y': 550, 'w': 300, 'h': 250}},
+                      {'bbox': {'x': 550, 'y': 560, 'w': 300, 'h': 250}}]
+        sequence = NumberSequence({'enabled': True, 'min_rectangles': 3, 'max_jump': 50, 'reset_after': 2})
+        self.assertEqual(sequence.reading_order(rectangles), [1, 0, 2, 3])
+        self.assertIsNone(sequence.predict(rectangles))
+        sequence.observe(rectangles[:2], ['10', '9'])
+        self.assertEqual(sequence.predict(rectangles)['next'], 11)
+        
+        collection = PicassoCollection()
+        collection.digit_recognizer = None
+        page = np.full((1000, 1000, 3), 255, np.uint8)
+        for rect in rectangles:
+            box = rect['bbox']
+            cv2.putText(page, "00", (box['x'] + 120, box['y'] + box['h'] + 30),
+                        cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 0, 0), 2)
+        
+        from ocr import get_ocr_engine as shared_engine
+        context = {'sequence': sequence.predict(rectangles)}
+        with mock.patch.object(shared_engine(), 'recognize_mosaic',
+                               return_value=["11", "11", "14", "14"]) as batch:
+            numbers = collection.detect_artwork_numbers(page, rectangles, context)
+        self.assertEqual(numbers, ['12', '11', '13', '14'])
+        self.assertEqual(batch.call_count, 1)
+        self.assertEqual(context['number_search']['inferred'], [True, False, True, False])
+        
+        # Extrêmes hors de la suite prédite : les rectangles intérieurs sont lus
+        sequence.observe(rectangles, numbers, context['number_search']['inferred'])
+        context = {'sequence': sequence.predict(rectangles)}
+        with mock.patch.object(shared_engine(), 'recognize_mosaic',
+                               side_effect=[["15", "15", "30", "30"], ["16", "16", "17", "17"]]) as batch:
+            numbers = collection.detect_artwork_numbers(page, rectangles, context)
+        self.assertEqual(numbers, ['16', '15', '17', '30'])
+        self.assertEqual(batch.call_count, 2)
+        self.assertFalse(any(context['number_search']['inferred']))
+        self.assertEqual(sequence.report()['numbers_inferred'], 2)
+    
+    def test_numbers_from_page_words(self):
+        """Test la jointure spatiale mots de page / zones de recherche"""
+        import numpy as np
+        from unittest import mock
+        from pdf_extractor.artwork_collections.picasso_collection import PicassoCollection
+        
+        words = PageWords([
+            {'text': 'TABLE', 'x': 10, 'y': 10, 'w': 60, 'h': 20, 'line': 1},
+            {'text': 'DES', 'x': 80, 'y': 10, 'w': 40, 'h': 20, 'line': 1},
+            {'text': '12', 'x': 220, 'y': 410, 'w': 30, 'h': 20, 'line': 2},   # sous le rectangle 1
+            {'text': '34', 'x': 820, 'y': 600, 'w': 30, 'h': 20, 'line': 3},   # à droite du rectangle 2
+        ])
+        self.assertEqual(words.text(), "TABLE DES\n12\n34")
+        self.assertEqual(words.text_in((0, 0, 200, 50)), "TABLE DES")
+        
+        collection = PicassoCollection()
+        page = np.full((1000, 1000, 3), 255, np.uint8)
+        rectangles = [{'bbox': {'x': 100, 'y': 100, 'w': 300, 'h': 300}},
+                      {'bbox': {'x': 500, 'y': 500, 'w': 300, 'h': 300}},
+                      {'bbox': {'x': 100, 'y': 600, 'w': 200, 'h': 200}}]
+        from ocr import get_ocr_engine as shared_engine
+        with mock.patch.object(shared_engine(), 'recognize_mosaic') as batch:
+            numbers = collection.detect_artwork_numbers(page, rectangles, {'page_words': words})
+        
+        self.assertEqual(numbers, ['12', '34', None])
+        batch.assert_not_called()
+    
+    def test_text_layer_words_in_raster_space(self):
+        """Test les mots de la couche texte convertis en pixels du raster"""
+        import fitz
+        import numpy as np
+        
+        for rotation in (0, 90):
+            doc = fitz.open()
+            page = doc.new_page(width=400, height=600)
+            page.insert_text((100, 300), "17", fontsize=20)
+            page.set_rotation(rotation)
+            
+            words = PageWords.from_text_layer(page, dpi=144)
+            pix = page.get_pixmap(dpi=144)
+            raster = np.frombuffer(pix.samples, np.uint8).reshape(pix.height, pix.width, pix.n)
+            ys, xs = np.nonzero(raster[:, :, 0] < 128)
+            ink_x, ink_y = xs.mean(), ys.mean()
+            doc.close()
+            
+            self.assertEqual(words.source, 'text_layer')
+            self.assertEqual(len(words), 1)
+            self.assertEqual(words.text_in((int(ink_x) - 5, int(ink_y) - 5, 10, 10)), "17")
+
+    def test_ocr_cache_skips_known_zones(self):
+        """Test que seules les zones absentes du cache entrent dans la mosaïque"""
+        import tempfile
+        import numpy as np
+        from unittest import mock
+        from pdf_extractor.ocr import OCRCache
+        from config import OCR_CONFIG   # Configuration lue par le moteur (import à plat)
+
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.dict(OCR_CONFIG, {'pool': {'workers': 0}}):
+            engine = OCREngine()
+            engine._backend, engine._probed, engine._version = 'pytesseract', True, '5.3.0'
+            cache = OCRCache(os.path.join(tmp, 'cache.sqlite'))
+            engine.attach_cache(cache)
+
+            zones = [np.full((20, 40), 10, np.uint8), np.full((20, 40), 20, np.uint8)]
+            first = [{'text': '12', 'x': 30, 'y': 30, 'w': 20, 'h': 10, 'line': 1},
+                     {'text': '34', 'x': 30, 'y': 75, 'w': 20, 'h': 10, 'line': 2}]
+            with mock.patch.object(engine, '_words', return_value=first) as ocr:
+                self.assertEqual(engine.recognize_mosaic(zones, padding=24), ['12', '34'])
+                self.assertEqual(engine.recognize_mosaic(zones, padding=24), ['12', '34'])
+            self.assertEqual(ocr.call_count, 1)
+            self.assertEqual(cache.snapshot()['hits'], 2)
+
+            # Une zone modifiée : elle seule est reconnue de nouveau
+            changed = [zones[0], np.full((20, 40), 30, np.uint8)]
+            second = [{'text': '56', 'x': 30, 'y': 30, 'w': 20, 'h': 10, 'line': 1}]
+            with mock.patch.object(engine, '_words', return_value=second) as ocr:
+                self.assertEqual(engine.recognize_mosaic(changed, padding=24), ['12', '56'])
+            self.assertEqual(ocr.call_args[0][0].shape, (68, 88))
+
+            # Autre configuration (psm) : pas de réutilisation
+            with mock.patch.object(engine, '_words', return_value=[]) as ocr:
+                engine.recognize_mosaic(zones, psm=7, padding=24)
+            self.assertEqual(ocr.call_count, 1)
+            cache.close()
+
+    def test_ocr_pool_workers(self):
+        """Test le pool OCR : limite OpenMP par processus et résultats différés"""
+        import numpy as np
+        from pdf_extractor.ocr import OCRPool
+
+        pool = OCRPool(1, None, 'eng', omp_thread_limit=1)
+        try:
+            self.assertEqual(pool.executor.submit(os.getenv, 'OMP_THREAD_LIMIT').result(timeout=60), '1')
+            blank = np.full((40, 40), 255, np.uint8)
+            self.assertEqual(pool.submit('words', blank, 3).result(timeout=60), [])
+            self.assertEqual(pool.submit('mosaic', blank, 11).result(timeout=60), [])
+            self.assertEqual(pool.pending, set())
+        finally:
+            pool.shutdown()
+    
+    def test_mosaic_submitted_to_pool(self):
+        """Test la mosaïque des zones confiée au pool, textes répartis à la réception"""
+        import numpy as np
+        from concurrent.futures import Future
+        from unittest import mock
+
+        engine = OCREngine()
+        engine._backend, engine._probed = 'pytesseract', True
+        job = Future()
+        pool = mock.Mock()
+        pool.submit.return_value = job
+        zones = [np.full((20, 40), 10, np.uint8), np.full((20, 40), 20, np.uint8)]
+        with mock.patch.object(engine, '_get_pool', return_value=pool):
+            future = engine.submit_mosaic(zones, padding=24)
+        self.assertFalse(future.done())
+        self.assertEqual(pool.submit.call_args[0][0], 'mosaic')
+        job.set_result([{'text': '34', 'x': 30, 'y': 75, 'w': 20, 'h': 10, 'line': 2},
+                        {'text': '12', 'x': 30, 'y': 30, 'w': 20, 'h': 10, 'line': 1}])
+        self.assertEqual(future.result(timeout=5), ['12', '34'])
+
+    def test_submit_without_pool_uses_cache(self):
+        """Test la soumission dans le processus courant (pool à 0) et le cache"""
+        import tempfile
+        import numpy as np
+        from unittest import mock
+        from pdf_extractor.ocr import OCRCache
+        from config import OCR_CONFIG   # Configuration lue par le moteur (import à plat)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = OCREngine()
+            engine._backend, engine._probed = 'pytesseract', True
+            engine.attach_cache(OCRCache(os.path.join(tmp, 'cache.sqlite')))
+            words = [{'text': '7', 'x': 1, 'y': 2, 'w': 3, 'h': 4, 'line': 1}]
+            page = np.zeros((30, 30), np.uint8)
+            with mock.patch.dict(OCR_CONFIG, {'pool': {'workers': 0}}), \
+                    mock.patch.object(engine, '_words', return_value=words) as ocr:
+                self.assertEqual(engine.pool_workers, 0)
+                self.assertEqual(engine.submit_words(page).result(), words)
+                self.assertEqual(engine.submit_words(page).result(), words)
+            self.assertEqual(ocr.call_count, 1)
+            engine.cache.close()
+
+    def test_resolution_normalizer(self):
+        """Test la hauteur de texte cible et les boîtes ramenées à l'image fournie"""
+        import cv2
+        import numpy as np
+        from unittest import mock
+        from pdf_extractor.ocr import OCRNormalizer
+
+        normalizer = OCRNormalizer({'target_text_height': 30, 'min_scale': 0.25,
+                                    'max_scale': 4.0, 'tolerance': 0.15})
+        zone = np.full((60, 150), 255, np.uint8)
+        cv2.putText(zone, "12", (40, 40), cv2.FONT_HERSHEY_SIMPLEX, 0.6, 0, 1)
+        self.assertAlmostEqual(normalizer.estimate_text_height(zone), 12, delta=1)
+        resized, scale = normalizer.normalize(zone)
+        self.assertAlmostEqual(scale, 2.5, delta=0.25)
+        self.assertEqual(resized.shape[1], round(150 * scale))
+        self.assertEqual(normalizer.normalize(np.full((60, 150), 255, np.uint8))[1], 1.0)
+
+        engine = OCREngine()
+        engine._backend, engine._probed = 'pytesseract', True
+        engine.normalizer = normalizer
+        found = [{'text': '12', 'x': 100, 'y': 50, 'w': 50, 'h': 30, 'line': 1}]
+        with mock.patch.object(engine, '_words_pytesseract', return_value=found) as ocr:
+            words = engine.words(zone)
+        self.assertEqual(ocr.call_args[0][0].shape, resized.shape)
+        self.assertEqual((words[0]['x'], words[0]['w']), (round(100 / scale), round(50 / scale)))
+
+    def test_ocr_cache_lru_eviction(self):
+        """Test l'éviction des entrées les moins récemment utilisées"""
+        import tempfile
+        import time
+        from pdf_extractor.ocr import OCRCache
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = OCRCache(os.path.join(tmp, 'cache.sqlite'), max_entries=10, check_every=1)
+            for i in range(10):
+                cache.put(f"k{i}", f"texte {i}")
+                time.sleep(0.001)
+            cache.get("k0")
+            cache.put("k10", "texte 10")
+
+            self.assertEqual(cache.get("k0"), "texte 0")
+            self.assertIsNone(cache.get("k1"))
+            self.assertEqual(cache.get("k10"), "texte 10")
+            self.assertEqual(OCRCache.hit_rate({'hits': 0, 'misses': 0}, cache.snapshot()),
+                             {'hits': 3, 'misses': 1, 'hit_rate': 0.75})
+            cache.close()
+
+    def test_digit_recognizer(self):
+        """Test l'apprentissage des chiffres confirmés et le renvoi à Tesseract des zones incertaines"""
+        import cv2
+        import numpy as np
+        from pdf_extractor.ocr import DigitRecognizer
+
+        def zone(text, font=cv2.FONT_HERSHEY_SIMPLEX):
+            image = np.full((50, 120), 255, np.uint8)
+            cv2.putText(image, text, (10, 38), font, 1.0, 0, 2)
+            return image
+
+        recognizer = DigitRecognizer({'k': 3, 'min_samples': 20, 'audit_every': 10})
+        self.assertEqual(recognizer.recognize(zone("12")), ('uncertain', None))
+        for number in ["102", "345", "678", "901", "234", "567", "890", "123", "456", "789"]:
+            recognizer.learn(zone(number), number)
+        self.assertTrue(recognizer.ready)
+
+        self.assertEqual(recognizer.recognize(zone("2580")), ('number', "2580"))
+        self.assertEqual(recognizer.recognize(np.full((50, 120), 255, np.uint8)), ('empty', None))
+        self.assertIsNone(recognizer.read_zones([zone("17", cv2.FONT_HERSHEY_TRIPLEX)]))
+
 class TestImageUtils(unittest.TestCase):
     """Tests pour les utilitaires d'images"""
     
@@ -132,6 +918,164 @@ class TestImageUtils(unittest.TestCase):
         
         # Image None
         self.assertFalse(ImageUtils.is_image_valid(None))
+    
+    def test_crop_reference(self):
+        """Test les découpes paresseuses sans copie"""
+        import numpy as np
+        page = np.zeros((500, 400, 3), dtype=np.uint8)
+        crop = CropRef(page, {'x': 350, 'y': 10, 'w': 100, 'h': 50})
+        
+        self.assertEqual(crop.shape, (50, 50, 3))
+        self.assertTrue(np.shares_memory(crop.view, page))
+    
+    def test_page_pyramid(self):
+        """Test la pyramide d'aperçus tuilée"""
+        import json
+        import tempfile
+        import numpy as np
+        
+        pyramid = PagePyramid(tile_size=256, overlap=1)
+        page = np.random.default_rng(0).integers(0, 256, (500, 600, 3), dtype=np.uint8)
+        pool = ImageWriterPool()
+        with tempfile.TemporaryDirectory() as page_dir:
+            manifest, futures = pyramid.build(page, page_dir, pool, dpi=200)
+            pool.wait(futures)
+            pool.close()
+            
+            top = manifest['levels'][-1]
+            self.assertEqual(len(manifest['levels']), 11)
+            self.assertEqual((top['width'], top['cols'], top['rows']), (600, 3, 2))
+            self.assertEqual(manifest['levels'][0]['width'], 1)
+            self.assertEqual(len(os.listdir(os.path.join(page_dir, 'page_pyramid_files', '10'))), 6)
+            with open(os.path.join(page_dir, 'page_pyramid.json')) as f:
+                self.assertEqual(json.load(f)['dpi'], 200)
+        self.assertEqual(pyramid.tile_bounds(600, 500, 1, 0), (255, 0, 513, 257))
+        
+        # Niveau le plus haut plafonné : coordonnées du raster d'extraction × scale
+        capped = PagePyramid(tile_size=256, overlap=1, max_side=300)
+        pool = ImageWriterPool()
+        with tempfile.TemporaryDirectory() as page_dir:
+            manifest, futures = capped.build(page, page_dir, pool, dpi=200)
+            pool.wait(futures)
+            pool.close()
+        self.assertEqual((manifest['width'], manifest['height']), (300, 250))
+        self.assertEqual((manifest['source_width'], manifest['scale'], manifest['dpi']), (600, 0.5, 100))
+        self.assertEqual(len(manifest['levels']), 10)
+    
+    def test_blob_store_deduplication(self):
+        """Test le stockage par empreinte des découpes"""
+        import tempfile
+        import numpy as np
+        
+        page = np.random.default_rng(0).integers(0, 256, (300, 300, 3), dtype=np.uint8)
+        with tempfile.TemporaryDirectory() as root:
+            store = BlobStore(os.path.join(root, '_blobs'))
+            session = os.path.join(root, 'session')
+            os.makedirs(os.path.join(session, 'page_001'))
+            first = os.path.join(session, 'page_001', '1.png')
+            second = os.path.join(session, 'page_001', '2.png')
+            
+            key1, _ = store.write_image(first, page[10:110, 20:120], [])
+            key2, _ = store.write_image(second, page[10:110, 20:120].copy(), [])
+            key3, _ = store.write_image(first, page[0:100, 0:100], [])
+            manifest = store.save_manifest(session)
+            
+            self.assertEqual(key1, key2)
+            self.assertNotEqual(key1, key3)
+            self.assertEqual(store.stats['written'], 2)
+            self.assertEqual(store.stats['reused'], 1)
+            self.assertEqual(manifest['files']['page_001/2.png'], key1)
+            self.assertEqual(manifest['files']['page_001/1.png'], key3)
+            self.assertEqual(os.stat(second).st_ino,
+                             os.stat(store.blob_path(key1, '.png')).st_ino)
+            
+            # Entrées publiées retirées de la mémoire, manifeste complété ensuite
+            self.assertEqual(store.entries, {})
+            third = os.path.join(session, 'page_001', '3.png')
+            store.write_image(third, page[50:150, 50:150], [])
+            manifest = store.save_manifest(session)
+            self.assertEqual(len(manifest['files']), 3)
+            self.assertEqual(store.entries, {})
+    
+    def test_image_writer_pool(self):
+        """Test l'écriture asynchrone des images"""
+        import numpy as np
+        import tempfile
+        
+        pool = ImageWriterPool(workers=2, queue_size=2)
+        image = np.random.default_rng(0).integers(0, 256, (300, 300, 3), dtype=np.uint8)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            futures = [pool.submit(os.path.join(tmp_dir, f"{i}.png"), image) for i in range(6)]
+            futures.append(pool.submit(os.path.join(tmp_dir, "absent", "x.png"), image))
+            sizes = pool.wait(futures)
+            pool.close()
+            
+            self.assertEqual(len(os.listdir(tmp_dir)), 6)
+            self.assertEqual(sizes[0], os.path.getsize(os.path.join(tmp_dir, "0.png")) // 1024)
+            self.assertGreater(sizes[0], 0)
+            self.assertEqual(sizes[-1], 0)
+    
+    def test_session_db_roundtrip(self):
+        """Test le manifeste SQLite d'une session"""
+        import tempfile
+        
+        page = {
+            'page_number': 3, 'success': True, 'dpi_used': 300, 'images_extracted': 2,
+            'image_size': '100×200',
+            'rectangles_details': [
+                {'rectangle_id': 1, 'filename': '12.png', 'artwork_number': '12',
+                 'bbox': {'x': 1, 'y': 2, 'w': 30, 'h': 40}, 'phash': 'ff'},
+                {'rectangle_id': 2, 'filename': 'DOUTEUX_rectangle_02.png', 'is_doubtful': True}
+            ]
+        }
+        with tempfile.TemporaryDirectory() as session:
+            self.assertFalse(SessionDB.exists(session))
+            db = SessionDB(session)
+            db.write_page(page, {'pdf_name': 'cat.pdf', 'pages': [page]})
+            readings = [{'scope': 'zone', 'rectangle': 1, 'zone': 'bande_sous_petite', 'text': 'n° 12',
+                         'source': 'tesseract', 'number': '12'}]
+            db.write_page(dict(page, images_extracted=1, rectangles_details=page['rectangles_details'][:1]),
+                          ocr_readings=readings)
+            db.set_duplicate_groups([{'group_id': 'dup_001',
+                                      'members': [{'page': 3, 'filename': '12.png'}]}])
+            db.write_artworks([{'id': 'a1', 'image_filename': '12.png',
+                                'metadata': {'page_number': 3, 'artwork_number': '12'}}])
+            db.write_validation({'page3_12.png': 'validated'})
+            db.close()
+            
+            db = SessionDB(session)
+            stored = db.get_page(3)
+            self.assertEqual(stored['images_extracted'], 1)
+            self.assertEqual([r['filename'] for r in stored['rectangles_details']], ['12.png'])
+            self.assertEqual(stored['rectangles_details'][0]['duplicate_group'], 'dup_001')
+            self.assertIsNone(db.get_page(4))
+            self.assertEqual(db.get_session()['pdf_name'], 'cat.pdf')
+            self.assertNotIn('pages', db.get_session())
+            self.assertEqual(db.find_artworks('12')[0]['id'], 'a1')
+            self.assertEqual(db.find_artworks(page_number=4), [])
+            self.assertEqual(db.get_validation_states(), {'page3_12.png': 'validated'})
+            self.assertEqual(db.get_ocr_readings(3), [{'rectangle_id': 1, 'scope': 'zone',
+                                                       'zone': 'bande_sous_petite', 'text': 'n° 12',
+                                                       'source': 'tesseract', 'number': '12'}])
+            db.close()
+    
+    def test_artwork_store_random_access(self):
+        """Test le stockage JSONL indexé des fiches d'œuvres"""
+        import tempfile
+        
+        artworks = [{'id': f"id-{i}", 'title': f"Œuvre {i}"} for i in range(50)]
+        with tempfile.TemporaryDirectory() as session:
+            self.assertEqual(ArtworkStore(session).write(artworks), 50)
+            store = ArtworkStore(session)
+            self.assertEqual(store.get('id-37')['title'], 'Œuvre 37')
+            self.assertIsNone(store.get('absent'))
+            self.assertEqual(len(store), 50)
+            
+            os.remove(store.index_path)
+            rebuilt = ArtworkStore(session)
+            self.assertEqual(rebuilt.get('id-49'), artworks[49])
+            self.assertEqual([a['id'] for a in rebuilt][:2], ['id-0', 'id-1'])
+            self.assertEqual(sorted(os.listdir(session)), ['artworks.jsonl'])
 
 if __name__ == '__main__':
     unittest.main()
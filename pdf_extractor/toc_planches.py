@@ -12,6 +12,7 @@ import logging
 from typing import Dict, List, Optional, Union
 from pathlib import Path
 from datetime import datetime
+from collections import deque
 
 try:
     import pdfplumber
@@ -39,6 +40,9 @@ logger = logging.getLogger(__name__)
 # Cache pour éviter de recharger le même PDF
 _toc_cache = {}
 
+# Extracted image formats (see OUTPUT_CONFIG['formats'])
+IMAGE_SUFFIXES = ('.png', '.webp', '.jpg', '.jpeg')
+
 
 def extract_toc_from_pdf(pdf_path: str, last_n: int = 10) -> Optional[Dict]:
     """
@@ -245,11 +249,10 @@ def _extract_from_text_layer(pdf_path: Path, last_n: int) -> Optional[Dict]:
 def _extract_from_ocr(pdf_path: Path, last_n: int) -> Optional[Dict]:
     """Extract TOC using OCR on page images"""
     
-    try:
-        # Check Tesseract availability
-        _ = pytesseract.get_tesseract_version()
-    except Exception:
-        logger.warning("⚠️ Tesseract non disponible - OCR désactivé")
+    # Moteur OCR partagé (disponibilité sondée une seule fois)
+    from ocr import get_ocr_engine
+    ocr_engine = get_ocr_engine()
+    if not ocr_engine.available:
         return None
     
     try:
@@ -273,10 +276,8 @@ def _extract_from_ocr(pdf_path: Path, last_n: int) -> Optional[Dict]:
             dpi=200  # DPI réduit pour économiser la mémoire
         )
         
-        # Traiter de la dernière vers la première
-        for i in range(len(pages) - 1, -1, -1):
-            page_image = pages[i]
-            page_array = np.array(page_image)
+        def submit(i):
+            page_array = np.array(pages[i])
             page_cv = cv2.cvtColor(page_array, cv2.COLOR_RGB2BGR)
             
             # OCR with optimized config for text
@@ -286,14 +287,26 @@ def _extract_from_ocr(pdf_path: Path, last_n: int) -> Optional[Dict]:
             clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8,8))
             enhanced = clahe.apply(gray)
             
-            # Scale up for better OCR
-            big = cv2.resize(enhanced, None, fx=2.0, fy=2.0, interpolation=cv2.INTER_CUBIC)
-            
-            text = pytesseract.image_to_string(big, config='--psm 6')
+            # Résolution ajustée par le moteur (hauteur de texte cible)
+            return ocr_engine.submit_recognize(enhanced, psm=6)
+        
+        # Traiter de la dernière vers la première ; autant de pages en cours
+        # d'OCR que de processus du pool (mémoire bornée)
+        order = list(range(len(pages) - 1, -1, -1))
+        window = max(1, ocr_engine.pool_workers)
+        pending = deque()
+        while order or pending:
+            while order and len(pending) < window:
+                i = order.pop(0)
+                pending.append((i, submit(i)))
+            i, future = pending.popleft()
+            text = future.result()
             
             if text and len(text.strip()) >= 50:  # Minimum text length
                 toc_data = parse_toc_text(text)
                 if toc_data:
+                    for _, other in pending:
+                        other.cancel()
                     # Ajuster l'index de page pour correspondre au PDF original
                     actual_page_index = start_page + i - 1
                     toc_data['source_page_index'] = actual_page_index
@@ -597,9 +610,7 @@ def apply_renaming(output_dir, plate_map: Dict[int, Dict],
         if not page_dir.is_dir():
             continue
             
-        for image_file in page_dir.glob("*.png"):
-            if image_file.name.startswith("thumb_"):
-                continue
+        for image_file in _iter_extracted_images(page_dir):
                 
             # Extract detected number from filename or detections data
             detected_number = _extract_number_from_filename(image_file.name)
@@ -644,12 +655,12 @@ def apply_renaming(output_dir, plate_map: Dict[int, Dict],
             # Rename main image
             image_file.rename(new_path)
             
-            # Rename thumbnail if exists
-            thumb_file = image_file.parent / f"thumb_{image_file.name}"
-            if thumb_file.exists():
-                thumb_new_name = f"thumb_{new_name}"
-                thumb_new_path = image_file.parent / thumb_new_name
-                thumb_file.rename(thumb_new_path)
+            # Rename thumbnail if exists (its format may differ from the image's)
+            for thumb_file in image_file.parent.glob(f"thumb_{image_file.stem}.*"):
+                if thumb_file.suffix.lower() not in IMAGE_SUFFIXES:
+                    continue
+                thumb_new_name = f"thumb_{Path(new_name).stem}{thumb_file.suffix}"
+                thumb_file.rename(image_file.parent / thumb_new_name)
             
             logger.info(f"✅ {item['original_name']} → {new_name}")
             stats['renamed'] += 1
@@ -661,11 +672,20 @@ def apply_renaming(output_dir, plate_map: Dict[int, Dict],
     return stats
 
 
+def _iter_extracted_images(page_dir: Path) -> List[Path]:
+    """Extracted images of a page folder, whatever their format (no thumbnails/preview)"""
+    return sorted(
+        f for f in page_dir.iterdir()
+        if f.is_file() and f.suffix.lower() in IMAGE_SUFFIXES
+        and not f.name.startswith("thumb_") and not f.name.startswith("page_full_image")
+    )
+
+
 def _extract_number_from_filename(filename: str) -> Optional[int]:
     """Extract plate number from filename"""
     # Try to extract number from filename patterns
     patterns = [
-        r'^(\d+)\.png$',  # "1.png"
+        r'^(\d+)\.(?:png|webp|jpe?g)$',  # "1.png", "1.webp"
         r'^(\d+)_',       # "1_title.png"
         r'^rectangle_(\d+)',  # "rectangle_01.png"
     ]
@@ -897,9 +917,7 @@ def create_artwork_jsons_for_images(output_dir: Path, plate_map: Dict[int, Dict]
         if not page_dir.is_dir():
             continue
             
-        for image_file in page_dir.glob("*.png"):
-            if image_file.name.startswith("thumb_"):
-                continue
+        for image_file in _iter_extracted_images(page_dir):
                 
             stats['total_images'] += 1
             
@@ -917,16 +935,16 @@ def create_artwork_jsons_for_images(output_dir: Path, plate_map: Dict[int, Dict]
                 continue
             
             try:
-                # Obtenir les dimensions de l'image
-                import cv2
-                img = cv2.imread(str(image_file))
-                if img is None:
+                # Obtenir les dimensions de l'image (en-tête seulement)
+                from PIL import Image
+                try:
+                    with Image.open(image_file) as img:
+                        image_size = img.size  # (width, height)
+                except (OSError, ValueError):
                     logger.warning(f"⚠️ Impossible de lire l'image {image_file}")
                     stats['skipped'] += 1
                     continue
                 
-                image_size = (img.shape[1], img.shape[0])  # (width, height)
-                
                 # Créer le JSON de l'œuvre
                 plate_info = plate_map[plate_number]
                 artwork_data = create_artwork_json(
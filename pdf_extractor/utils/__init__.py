@@ -4,3 +4,10 @@ Module d'utilitaires
 from .logger import logger, Logger
 from .image_utils import ImageUtils
 from .file_utils import FileUtils
+from .image_writer import ImageWriterPool
+from .output_formats import OutputFormats, IMAGE_EXTENSIONS
+from .crop_ref import CropRef
+from .page_pyramid import PagePyramid
+from .blob_store import BlobStore
+from .session_db import SessionDB, SESSION_DB
+from .artwork_store import ArtworkStore
@@ -0,0 +1,88 @@
+"""
+Stockage compact des fiches d'œuvres (JSONL + index d'offsets)
+"""
+import os
+import json
+from typing import Dict, Any, List, Iterator, Optional
+
+ARTWORKS_JSONL = "artworks.jsonl"
+ARTWORKS_INDEX = "artworks.idx.json"
+
+
+class ArtworkStore:
+    """Une fiche JSON par ligne dans `artworks.jsonl`, index id → (offset, longueur).
+
+    Remplace le dossier `individual_artworks/` (un fichier par œuvre) : deux
+    fichiers par session quel que soit le nombre d'œuvres, et lecture d'une
+    fiche par un seul seek.
+    """
+
+    def __init__(self, directory: str):
+        self.path = os.path.join(directory, ARTWORKS_JSONL)
+        self.index_path = os.path.join(directory, ARTWORKS_INDEX)
+        self._index: Optional[Dict[str, List[int]]] = None
+
+    @staticmethod
+    def exists(directory: str) -> bool:
+        return os.path.exists(os.path.join(directory, ARTWORKS_JSONL))
+
+    def write(self, artworks: List[Dict[str, Any]]) -> int:
+        """Réécrit toutes les fiches (écriture atomique) et retourne leur nombre"""
+        index = {}
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            for artwork in artworks:
+                line = json.dumps(artwork, ensure_ascii=False).encode('utf-8') + b"\n"
+                index[str(artwork.get('id'))] = [f.tell(), len(line)]
+                f.write(line)
+        os.replace(tmp_path, self.path)
+
+        with open(f"{self.index_path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+        os.replace(f"{self.index_path}.tmp", self.index_path)
+        self._index = index
+        return len(index)
+
+    def ids(self) -> List[str]:
+        return list(self._load_index())
+
+    def get(self, artwork_id: str) -> Optional[Dict[str, Any]]:
+        """Fiche d'une œuvre par son id (accès direct)"""
+        entry = self._load_index().get(str(artwork_id))
+        if entry is None:
+            return None
+        offset, length = entry
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            return json.loads(f.read(length))
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def __len__(self) -> int:
+        return len(self._load_index())
+
+    def _load_index(self) -> Dict[str, List[int]]:
+        if self._index is None:
+            if os.path.exists(self.index_path):
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    self._index = json.load(f)
+            else:
+                self._index = self._rebuild_index()
+        return self._index
+
+    def _rebuild_index(self) -> Dict[str, List[int]]:
+        """Index reconstruit en parcourant le JSONL (index absent)"""
+        index = {}
+        if not os.path.exists(self.path):
+            return index
+        with open(self.path, 'rb') as f:
+            offset = 0
+            for line in f:
+                if line.strip():
+                    index[str(json.loads(line).get('id'))] = [offset, len(line)]
+                offset += len(line)
+        return index
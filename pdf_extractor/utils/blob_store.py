@@ -0,0 +1,117 @@
+"""
+Stockage adressé par contenu des images extraites
+"""
+import os
+import json
+import shutil
+import hashlib
+import threading
+import uuid
+from typing import Dict, Any, Tuple
+
+import cv2
+import numpy as np
+
+BLOB_MANIFEST = "blob_manifest.json"
+
+
+class BlobStore:
+    """Blobs d'images indexés par empreinte, partagés entre pages et sessions.
+
+    La clé est un BLAKE2b des pixels et des paramètres d'encodage : une image
+    déjà stockée n'est ni ré-encodée ni réécrite. Le fichier attendu dans la
+    session est un lien physique vers le blob (copie si le système de fichiers
+    ne le permet pas), les consommateurs existants voient donc des fichiers
+    ordinaires. Un blob n'est jamais réécrit en place : les chemins de session
+    sont remplacés atomiquement (os.replace).
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        # Fichiers écrits depuis le dernier save_manifest de leur session
+        self.entries: Dict[str, str] = {}
+        self.stats = {'written': 0, 'reused': 0, 'linked': 0, 'copied': 0}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def image_key(image: np.ndarray, extension: str, params: list) -> str:
+        """Empreinte des pixels et de l'encodage (sans copie des vues)"""
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(f"{image.shape}|{image.dtype}|{extension}|{list(params)}".encode())
+        if image.flags['C_CONTIGUOUS']:
+            digest.update(image)
+        else:
+            for row in image:
+                digest.update(np.ascontiguousarray(row))
+        return digest.hexdigest()
+
+    def blob_path(self, key: str, extension: str) -> str:
+        return os.path.join(self.root, key[:2], f"{key}{extension}")
+
+    def write_image(self, path: str, image: np.ndarray, params: list) -> Tuple[str, int]:
+        """Place l'image à `path` via le store.
+
+        Returns:
+            (clé du blob, taille en KB)
+        """
+        extension = os.path.splitext(path)[1].lower()
+        key = self.image_key(image, extension, params)
+        blob = self.blob_path(key, extension)
+
+        if os.path.exists(blob):
+            self._count('reused')
+        else:
+            os.makedirs(os.path.dirname(blob), exist_ok=True)
+            tmp_blob = f"{blob}.{uuid.uuid4().hex}{extension}"
+            if not cv2.imwrite(tmp_blob, image, params):
+                raise IOError(f"Encodage impossible: {path}")
+            os.replace(tmp_blob, blob)
+            self._count('written')
+
+        self._link(blob, path)
+        with self._lock:
+            self.entries[os.path.abspath(path)] = key
+        return key, os.path.getsize(blob) // 1024
+
+    def save_manifest(self, session_dir: str) -> Dict[str, Any]:
+        """Complète le manifeste chemin relatif → blob des fichiers de la session.
+
+        Les entrées enregistrées sont retirées de la mémoire : un store de
+        longue durée (serveur) ne garde que les écritures pas encore publiées.
+        """
+        session_abs = os.path.abspath(session_dir)
+        manifest_path = os.path.join(session_dir, BLOB_MANIFEST)
+        manifest = {'blob_root': os.path.relpath(self.root, session_abs).replace(os.sep, '/'),
+                    'files': {}}
+        if os.path.exists(manifest_path):
+            try:
+                with open(manifest_path, 'r', encoding='utf-8') as f:
+                    manifest['files'] = json.load(f).get('files', {})
+            except (OSError, ValueError):
+                pass
+
+        with self._lock:
+            session_paths = [path for path in self.entries if path.startswith(session_abs + os.sep)]
+            manifest['files'].update({
+                os.path.relpath(path, session_abs).replace(os.sep, '/'): self.entries.pop(path)
+                for path in session_paths
+            })
+
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        return manifest
+
+    def _link(self, blob: str, path: str):
+        """Lien physique atomique du blob vers le chemin de session"""
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            os.link(blob, tmp_path)
+            self._count('linked')
+        except OSError:
+            shutil.copyfile(blob, tmp_path)
+            self._count('copied')
+        os.replace(tmp_path, path)
+
+    def _count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
@@ -0,0 +1,32 @@
+"""
+Références de découpe sans copie des pixels
+"""
+import numpy as np
+
+
+class CropRef:
+    """Découpe paresseuse : (raster de page, bbox) au lieu d'une copie.
+
+    `view` est une vue numpy sur le raster de la page (aucune allocation) ;
+    les lecteurs (analyse de qualité, miniature, encodeur) s'en contentent
+    tant que la page n'est plus modifiée.
+    """
+
+    __slots__ = ('page', 'x', 'y', 'w', 'h')
+
+    def __init__(self, page: np.ndarray, bbox: dict):
+        page_h, page_w = page.shape[:2]
+        x = min(max(0, int(bbox['x'])), page_w)
+        y = min(max(0, int(bbox['y'])), page_h)
+        self.page = page
+        self.x, self.y = x, y
+        self.w = max(0, min(int(bbox['w']), page_w - x))
+        self.h = max(0, min(int(bbox['h']), page_h - y))
+
+    @property
+    def view(self) -> np.ndarray:
+        return self.page[self.y:self.y + self.h, self.x:self.x + self.w]
+
+    @property
+    def shape(self) -> tuple:
+        return (self.h, self.w) + self.page.shape[2:]
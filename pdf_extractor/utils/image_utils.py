@@ -71,3 +71,21 @@ class ImageUtils:
         
         aspect_ratio = ImageUtils.calculate_aspect_ratio(w, h)
         return 0.1 < aspect_ratio < 10  # Ratio raisonnable
+    
+    @staticmethod
+    def dhash(image: np.ndarray, hash_size: int = 8) -> int:
+        """Hash perceptuel par différences (dHash) sur hash_size² bits"""
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if len(image.shape) == 3 else image
+        small = cv2.resize(gray, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+        bits = (small[:, 1:] > small[:, :-1]).flatten()
+        return int(''.join('1' if b else '0' for b in bits), 2)
+    
+    @staticmethod
+    def read_image_size(path: str) -> Optional[Tuple[int, int]]:
+        """(largeur, hauteur) lue dans l'en-tête du fichier, sans décoder les pixels"""
+        from PIL import Image
+        try:
+            with Image.open(path) as img:
+                return img.size
+        except (OSError, ValueError):
+            return None
@@ -0,0 +1,113 @@
+"""
+Écriture asynchrone des images et fichiers de sortie
+"""
+import os
+import queue
+import threading
+from concurrent.futures import Future
+from typing import List, Optional
+
+import cv2
+import numpy as np
+
+from .logger import logger
+
+
+class ImageWriterPool:
+    """Pool de threads d'encodage avec file bornée.
+
+    `submit` bloque quand la file est pleine : la mémoire occupée par les
+    images en attente reste plafonnée (backpressure). Chaque écriture
+    renvoie un `Future` dont le résultat est la taille du fichier en KB.
+    Une image soumise ne doit plus être modifiée par l'appelant.
+    """
+
+    def __init__(self, workers: int = 2, queue_size: int = 8):
+        self.workers = max(1, workers)
+        self.queue_size = max(1, queue_size)
+        self.logger = logger
+        self._queue = None
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    def submit(self, path: str, image: np.ndarray, params: Optional[list] = None) -> Future:
+        """Programme l'encodage d'une image (cv2.imwrite)"""
+        return self._put(self._write_image, path, image, params or [])
+
+    def submit_to_store(self, store, path: str, image: np.ndarray,
+                        params: Optional[list] = None) -> Future:
+        """Programme l'écriture d'une image via un BlobStore (dédoublonnage)"""
+        return self._put(self._write_to_store, store, path, image, params or [])
+
+    def submit_text(self, path: str, content: str) -> Future:
+        """Programme l'écriture d'un fichier texte"""
+        return self._put(self._write_text, path, content)
+
+    def wait(self, futures: List[Future]) -> List[int]:
+        """Attend des écritures et retourne leurs tailles en KB (0 en cas d'échec)"""
+        sizes = []
+        for future in futures:
+            try:
+                sizes.append(future.result())
+            except Exception as e:
+                self.logger.error(f"    ❌ Erreur écriture asynchrone: {e}")
+                sizes.append(0)
+        return sizes
+
+    def close(self):
+        """Vide la file et arrête les threads (le pool redémarre au prochain submit)"""
+        with self._lock:
+            if self._queue is None:
+                return
+            for _ in self._threads:
+                self._queue.put(None)
+            for thread in self._threads:
+                thread.join()
+            self._queue = None
+            self._threads = []
+
+    def _put(self, func, *args) -> Future:
+        self._ensure_started()
+        future = Future()
+        self._queue.put((future, func, args))
+        return future
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._queue is not None:
+                return
+            self._queue = queue.Queue(maxsize=self.queue_size)
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._worker, args=(self._queue,),
+                                          name=f"image-writer-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _worker(self, jobs: queue.Queue):
+        while True:
+            job = jobs.get()
+            if job is None:
+                break
+            future, func, args = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(func(*args))
+            except Exception as e:
+                future.set_exception(e)
+
+    @staticmethod
+    def _write_image(path: str, image: np.ndarray, params: list) -> int:
+        if not cv2.imwrite(path, image, params):
+            raise IOError(f"Encodage impossible: {path}")
+        return os.path.getsize(path) // 1024
+
+    @staticmethod
+    def _write_to_store(store, path: str, image: np.ndarray, params: list) -> int:
+        return store.write_image(path, image, params)[1]
+
+    @staticmethod
+    def _write_text(path: str, content: str) -> int:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return os.path.getsize(path) // 1024
@@ -0,0 +1,104 @@
+"""
+Formats de sortie par type d'artefact (découpe, miniature, aperçu de page)
+"""
+import os
+import copy
+from typing import Dict, Any, Optional
+
+import cv2
+
+from config import OUTPUT_CONFIG
+
+# Extensions reconnues comme images extraites
+IMAGE_EXTENSIONS = ('.png', '.webp', '.jpg', '.jpeg')
+
+EXTENSIONS = {'png': '.png', 'webp': '.webp', 'jpeg': '.jpg'}
+
+# Formats acceptés par artefact
+ALLOWED_FORMATS = {
+    'crop': ('png', 'webp', 'jpeg'),
+    'thumbnail': ('jpeg', 'webp', 'png'),
+    'page_preview': ('jpeg',)
+}
+
+
+class OutputFormats:
+    """Politique d'encodage de chaque artefact.
+
+    `quality` dépend du format : niveau de compression 0-9 pour PNG (None =
+    niveau du preset), qualité 1-100 pour JPEG, qualité 1-100 pour WebP avec
+    None ou > 100 pour le WebP sans perte.
+    """
+
+    def __init__(self, overrides: Optional[Dict[str, Dict[str, Any]]] = None,
+                 png_compression: Optional[int] = None):
+        self.formats = copy.deepcopy(OUTPUT_CONFIG['formats'])
+        for artifact, policy in (overrides or {}).items():
+            policy = {k: v for k, v in policy.items() if v is not None}
+            current = self.formats.setdefault(artifact, {})
+            # Changer de format invalide la qualité configurée pour l'ancien
+            if policy.get('format', current.get('format')) != current.get('format'):
+                current['quality'] = None
+            current.update(policy)
+        self.png_compression = png_compression
+
+        for artifact, policy in self.formats.items():
+            allowed = ALLOWED_FORMATS.get(artifact, tuple(EXTENSIONS))
+            if policy.get('format') not in allowed:
+                raise ValueError(f"Format {policy.get('format')} non supporté pour {artifact} "
+                                 f"(disponibles: {', '.join(allowed)})")
+
+    def extension(self, artifact: str) -> str:
+        """Extension de fichier de l'artefact ('.png', '.webp', '.jpg')"""
+        return EXTENSIONS[self.formats[artifact]['format']]
+
+    def write_params(self, artifact: str) -> list:
+        """Paramètres cv2.imwrite de l'artefact"""
+        return self.encode_params(self.formats[artifact]['format'],
+                                  self.formats[artifact].get('quality'),
+                                  self.png_compression)
+
+    def filename(self, artifact: str, stem: str) -> str:
+        return f"{stem}{self.extension(artifact)}"
+
+    def describe(self) -> Dict[str, str]:
+        """Résumé lisible des formats (pour les logs et le JSON global)"""
+        summary = {}
+        for artifact, policy in self.formats.items():
+            quality = policy.get('quality')
+            if policy['format'] == 'png':
+                quality = self.png_compression if quality is None else quality
+            summary[artifact] = policy['format'] + (f":{quality}" if quality is not None else "")
+        return summary
+
+    @staticmethod
+    def encode_params(fmt: str, quality: Optional[int] = None,
+                      png_compression: Optional[int] = None) -> list:
+        """Paramètres OpenCV d'un format donné"""
+        if fmt == 'png':
+            level = png_compression if quality is None else quality
+            return [] if level is None else [cv2.IMWRITE_PNG_COMPRESSION, int(level)]
+        if fmt == 'webp':
+            # OpenCV encode en WebP sans perte au-delà de 100
+            return [cv2.IMWRITE_WEBP_QUALITY, 101 if quality is None else int(quality)]
+        if fmt == 'jpeg':
+            return [cv2.IMWRITE_JPEG_QUALITY, 95 if quality is None else int(quality)]
+        raise ValueError(f"Format inconnu: {fmt}")
+
+    @staticmethod
+    def is_image_file(filename: str) -> bool:
+        """Vrai pour une image extraite (ni miniature, ni aperçu de page)"""
+        name = os.path.basename(filename)
+        return (name.lower().endswith(IMAGE_EXTENSIONS)
+                and not name.startswith('thumb_')
+                and not name.startswith('page_full_image'))
+
+    @staticmethod
+    def find_thumbnail(directory: str, filename: str) -> Optional[str]:
+        """Chemin de la miniature d'une image, quel que soit son format"""
+        stem = os.path.splitext(filename)[0]
+        for ext in IMAGE_EXTENSIONS:
+            path = os.path.join(directory, f"thumb_{stem}{ext}")
+            if os.path.exists(path):
+                return path
+        return None
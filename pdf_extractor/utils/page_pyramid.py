@@ -0,0 +1,114 @@
+"""
+Pyramide d'aperçus tuilée (DeepZoom) générée à l'extraction
+"""
+import os
+import json
+import math
+from typing import Dict, Any, List, Tuple
+
+import cv2
+import numpy as np
+
+from config import OUTPUT_CONFIG
+from .output_formats import OutputFormats
+
+PYRAMID_NAME = "page_pyramid"
+
+
+class PagePyramid:
+    """Niveaux DeepZoom d'une page à partir du raster déjà en mémoire.
+
+    Le niveau le plus haut est le raster d'extraction réduit à `max_side`
+    pixels (résolution d'aperçu de l'interface), chaque niveau inférieur
+    divise les dimensions par deux jusqu'à 1×1. Les tuiles sont écrites dans
+    `page_pyramid_files/<niveau>/<col>_<ligne>.jpg`, avec `page_pyramid.dzi`
+    (lisible par OpenSeadragon) et `page_pyramid.json` (manifeste du serveur).
+    """
+
+    def __init__(self, tile_size: int = None, overlap: int = None, quality: int = None,
+                 max_side: int = None):
+        config = OUTPUT_CONFIG.get('pyramid', {})
+        self.enabled = config.get('enabled', True)
+        self.tile_size = tile_size or config.get('tile_size', 256)
+        self.overlap = config.get('overlap', 1) if overlap is None else overlap
+        self.quality = quality or config.get('quality', 85)
+        self.max_side = max_side or config.get('max_side')
+
+    @staticmethod
+    def level_count(width: int, height: int) -> int:
+        return int(math.ceil(math.log2(max(width, height, 1)))) + 1
+
+    def tile_bounds(self, width: int, height: int, col: int, row: int) -> Tuple[int, int, int, int]:
+        """Zone (x1, y1, x2, y2) d'une tuile, recouvrement DeepZoom compris"""
+        x1 = max(0, col * self.tile_size - self.overlap)
+        y1 = max(0, row * self.tile_size - self.overlap)
+        x2 = min(width, (col + 1) * self.tile_size + self.overlap)
+        y2 = min(height, (row + 1) * self.tile_size + self.overlap)
+        return x1, y1, x2, y2
+
+    def build(self, page: np.ndarray, page_dir: str, writer, dpi: int = None) -> Tuple[Dict[str, Any], List]:
+        """Programme l'écriture de toutes les tuiles via le pool d'écriture.
+
+        Returns:
+            (manifeste, futures des écritures)
+        """
+        source_height, source_width = page.shape[:2]
+        scale = 1.0
+        if self.max_side and max(source_width, source_height) > self.max_side:
+            scale = self.max_side / max(source_width, source_height)
+            page = cv2.resize(page, (max(1, round(source_width * scale)), max(1, round(source_height * scale))),
+                              interpolation=cv2.INTER_AREA)
+        height, width = page.shape[:2]
+        max_level = self.level_count(width, height) - 1
+        tiles_dir = os.path.join(page_dir, f"{PYRAMID_NAME}_files")
+        params = OutputFormats.encode_params('jpeg', self.quality)
+
+        futures = []
+        levels = []
+        image = page
+        for level in range(max_level, -1, -1):
+            level_h, level_w = image.shape[:2]
+            cols = int(math.ceil(level_w / self.tile_size))
+            rows = int(math.ceil(level_h / self.tile_size))
+            level_dir = os.path.join(tiles_dir, str(level))
+            os.makedirs(level_dir, exist_ok=True)
+
+            for row in range(rows):
+                for col in range(cols):
+                    x1, y1, x2, y2 = self.tile_bounds(level_w, level_h, col, row)
+                    futures.append(writer.submit(os.path.join(level_dir, f"{col}_{row}.jpg"),
+                                                 image[y1:y2, x1:x2], params))
+
+            levels.append({'level': level, 'width': level_w, 'height': level_h,
+                           'cols': cols, 'rows': rows})
+            if level > 0:
+                image = cv2.resize(image, (max(1, (level_w + 1) // 2), max(1, (level_h + 1) // 2)),
+                                   interpolation=cv2.INTER_AREA)
+
+        manifest = {
+            'format': 'jpg',
+            'tile_size': self.tile_size,
+            'overlap': self.overlap,
+            'width': width,
+            'height': height,
+            'dpi': round(dpi * scale) if dpi else dpi,
+            # Coordonnées des rectangles (raster d'extraction) × scale = pixels du niveau max
+            'scale': round(scale, 6),
+            'source_width': source_width,
+            'source_height': source_height,
+            'max_level': max_level,
+            'tiles_dir': f"{PYRAMID_NAME}_files",
+            'levels': sorted(levels, key=lambda l: l['level'])
+        }
+        futures.append(writer.submit_text(os.path.join(page_dir, f"{PYRAMID_NAME}.json"),
+                                          json.dumps(manifest, indent=2)))
+        futures.append(writer.submit_text(os.path.join(page_dir, f"{PYRAMID_NAME}.dzi"),
+                                          self._dzi_xml(width, height)))
+        return manifest, futures
+
+    def _dzi_xml(self, width: int, height: int) -> str:
+        return ('<?xml version="1.0" encoding="UTF-8"?>\n'
+                '<Image xmlns="http://schemas.microsoft.com/deepzoom/2008" '
+                f'TileSize="{self.tile_size}" Overlap="{self.overlap}" Format="jpg">\n'
+                f'  <Size Width="{width}" Height="{height}"/>\n'
+                '</Image>\n')
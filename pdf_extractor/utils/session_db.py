@@ -0,0 +1,223 @@
+"""
+Manifeste SQLite d'une session d'extraction
+"""
+import os
+import json
+import sqlite3
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+SESSION_DB = "session.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS session (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS pages (
+    page_number INTEGER PRIMARY KEY,
+    success INTEGER,
+    dpi_used INTEGER,
+    images_extracted INTEGER,
+    processing_time REAL,
+    data TEXT
+);
+CREATE TABLE IF NOT EXISTS rectangles (
+    page_number INTEGER NOT NULL,
+    filename TEXT NOT NULL,
+    rectangle_id INTEGER,
+    is_doubtful INTEGER,
+    confidence REAL,
+    artwork_number TEXT,
+    bbox_x INTEGER, bbox_y INTEGER, bbox_w INTEGER, bbox_h INTEGER,
+    size_kb INTEGER,
+    phash TEXT,
+    duplicate_group TEXT,
+    data TEXT,
+    PRIMARY KEY (page_number, filename)
+);
+CREATE INDEX IF NOT EXISTS idx_rectangles_number ON rectangles(artwork_number);
+CREATE INDEX IF NOT EXISTS idx_rectangles_group ON rectangles(duplicate_group);
+CREATE TABLE IF NOT EXISTS artworks (
+    id TEXT PRIMARY KEY,
+    page_number INTEGER,
+    filename TEXT,
+    artwork_number TEXT,
+    data TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_artworks_number ON artworks(artwork_number);
+CREATE INDEX IF NOT EXISTS idx_artworks_page ON artworks(page_number);
+CREATE TABLE IF NOT EXISTS ocr_readings (
+    page_number INTEGER NOT NULL,
+    rectangle_id INTEGER,
+    scope TEXT,
+    zone TEXT,
+    text TEXT,
+    source TEXT,
+    number TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_ocr_readings_page ON ocr_readings(page_number);
+CREATE TABLE IF NOT EXISTS validation (
+    image_id TEXT PRIMARY KEY,
+    page_number INTEGER,
+    filename TEXT,
+    state TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_validation_state ON validation(state);
+"""
+
+
+class SessionDB:
+    """Pages, rectangles, œuvres, OCR et validation d'une session dans un seul fichier.
+
+    Chaque écriture est une transaction : une page est soit entièrement
+    présente, soit absente. Les fichiers JSON/texte historiques deviennent
+    des exports optionnels (OUTPUT_CONFIG['exports']).
+    """
+
+    def __init__(self, session_dir: str):
+        self.path = os.path.join(session_dir, SESSION_DB)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    @staticmethod
+    def exists(session_dir: str) -> bool:
+        return os.path.exists(os.path.join(session_dir, SESSION_DB))
+
+    def close(self):
+        self.conn.close()
+
+    # Écriture
+
+    def set_session(self, meta: Dict[str, Any]):
+        """Métadonnées globales (hors liste des pages)"""
+        with self.conn:
+            self._upsert_session(meta)
+
+    def write_page(self, page_result: Dict[str, Any], session_meta: Dict[str, Any] = None,
+                   ocr_readings: List[Dict[str, Any]] = None):
+        """Remplace une page, ses rectangles et ses lectures OCR (et les compteurs de session) en une transaction.
+
+        `ocr_readings` : texte brut lu par page ou par zone, avec sa source
+        (text_layer, ocr, tesseract, knn) et le numéro qui en a été tiré.
+        """
+        page_num = page_result['page_number']
+        page_data = {k: v for k, v in page_result.items() if k not in ('rectangles_details', 'ocr_readings')}
+        if ocr_readings is None:
+            ocr_readings = page_result.get('ocr_readings', [])
+        with self.conn:
+            if session_meta:
+                self._upsert_session(session_meta)
+            self.conn.execute("DELETE FROM rectangles WHERE page_number = ?", (page_num,))
+            self.conn.execute("DELETE FROM ocr_readings WHERE page_number = ?", (page_num,))
+            self.conn.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?)",
+                (page_num, int(bool(page_result.get('success'))), page_result.get('dpi_used'),
+                 page_result.get('images_extracted', 0), page_result.get('processing_time'),
+                 json.dumps(page_data, ensure_ascii=False, default=str)))
+
+            for rect in page_result.get('rectangles_details', []):
+                bbox = rect.get('bbox') or {}
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO rectangles VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (page_num, rect.get('filename'), rect.get('rectangle_id'),
+                     int(bool(rect.get('is_doubtful'))), rect.get('confidence'),
+                     rect.get('artwork_number'), bbox.get('x'), bbox.get('y'), bbox.get('w'),
+                     bbox.get('h'), rect.get('size_kb'), rect.get('phash'),
+                     rect.get('duplicate_group'), json.dumps(rect, ensure_ascii=False, default=str)))
+            self.conn.executemany(
+                "INSERT INTO ocr_readings VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(page_num, reading.get('rectangle'), reading.get('scope'), reading.get('zone'),
+                  reading.get('text'), reading.get('source'), reading.get('number'))
+                 for reading in ocr_readings])
+
+    def set_duplicate_groups(self, groups: List[Dict[str, Any]]):
+        with self.conn:
+            self.conn.execute("UPDATE rectangles SET duplicate_group = NULL")
+            for group in groups:
+                for member in group.get('members', []):
+                    self.conn.execute(
+                        "UPDATE rectangles SET duplicate_group = ? WHERE page_number = ? AND filename = ?",
+                        (group['group_id'], member['page'], member['filename']))
+            self.conn.execute("INSERT OR REPLACE INTO session (key, value) VALUES ('duplicate_groups', ?)",
+                              (json.dumps(groups, ensure_ascii=False),))
+
+    def write_artworks(self, artworks: List[Dict[str, Any]]):
+        with self.conn:
+            self.conn.execute("DELETE FROM artworks")
+            self.conn.executemany(
+                "INSERT INTO artworks VALUES (?, ?, ?, ?, ?)",
+                [(a.get('id'), a.get('metadata', {}).get('page_number'), a.get('image_filename'),
+                  a.get('metadata', {}).get('artwork_number'), json.dumps(a, ensure_ascii=False))
+                 for a in artworks])
+
+    def write_validation(self, image_states: Dict[str, str]):
+        now = datetime.now().isoformat()
+        rows = []
+        for image_id, state in image_states.items():
+            # Format de l'interface: page<N>_<fichier>
+            page_part, _, filename = image_id.partition('_')
+            page_num = int(page_part[4:]) if page_part[4:].isdigit() else None
+            rows.append((image_id, page_num, filename, state, now))
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO validation VALUES (?, ?, ?, ?, ?)", rows)
+
+    def _upsert_session(self, meta: Dict[str, Any]):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO session (key, value) VALUES (?, ?)",
+            [(k, json.dumps(v, ensure_ascii=False, default=str)) for k, v in meta.items() if k != 'pages'])
+
+    # Lecture
+
+    def get_session(self) -> Dict[str, Any]:
+        return {row['key']: json.loads(row['value'])
+                for row in self.conn.execute("SELECT key, value FROM session")}
+
+    def get_page(self, page_number: int) -> Optional[Dict[str, Any]]:
+        """Détails d'une page au format de page_ultra_details.json"""
+        row = self.conn.execute("SELECT data FROM pages WHERE page_number = ?", (page_number,)).fetchone()
+        if row is None:
+            return None
+        page = json.loads(row['data'])
+        page['rectangles_details'] = self.get_rectangles(page_number)
+        return page
+
+    def get_pages(self) -> List[Dict[str, Any]]:
+        numbers = [row[0] for row in self.conn.execute("SELECT page_number FROM pages ORDER BY page_number")]
+        return [self.get_page(n) for n in numbers]
+
+    def get_rectangles(self, page_number: int) -> List[Dict[str, Any]]:
+        rows = self.conn.execute(
+            "SELECT data, duplicate_group FROM rectangles WHERE page_number = ? ORDER BY rectangle_id",
+            (page_number,))
+        rectangles = []
+        for row in rows:
+            rect = json.loads(row['data'])
+            if row['duplicate_group']:
+                rect['duplicate_group'] = row['duplicate_group']
+            rectangles.append(rect)
+        return rectangles
+
+    def find_artworks(self, artwork_number: str = None, page_number: int = None) -> List[Dict[str, Any]]:
+        """Œuvres par numéro et/ou page (recherche indexée)"""
+        query, params = "SELECT data FROM artworks WHERE 1 = 1", []
+        if artwork_number is not None:
+            query += " AND artwork_number = ?"
+            params.append(str(artwork_number))
+        if page_number is not None:
+            query += " AND page_number = ?"
+            params.append(page_number)
+        return [json.loads(row['data']) for row in self.conn.execute(query, params)]
+
+    def get_ocr_readings(self, page_number: int) -> List[Dict[str, Any]]:
+        rows = self.conn.execute(
+            "SELECT rectangle_id, scope, zone, text, source, number FROM ocr_readings WHERE page_number = ?",
+            (page_number,))
+        return [dict(row) for row in rows]
+
+    def get_validation_states(self) -> Dict[str, str]:
+        return {row['image_id']: row['state']
+                for row in self.conn.execute("SELECT image_id, state FROM validation")}
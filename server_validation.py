@@ -4,19 +4,146 @@ Serveur Flask pour l'interface de validation des extractions PDF ULTRA
 """
 
 import os
+import sys
 import json
-import glob
 from datetime import datetime
 from pathlib import Path
 from flask import Flask, render_template, jsonify, request, send_file, send_from_directory
 from flask_cors import CORS
 
+# Modules de l'extracteur (stockage des images par empreinte)
+sys.path.insert(0, str(Path(__file__).parent / "pdf_extractor"))
+from config import OUTPUT_CONFIG
+from utils.blob_store import BlobStore
+from utils.session_db import SessionDB
+from utils.artwork_store import ArtworkStore
+
 app = Flask(__name__)
 CORS(app)  # Permettre les requêtes cross-origin
 
 # Configuration
 EXTRACTIONS_DIR = "extractions_ultra"
 UPLOAD_DIR = "uploads"
+# Images ajoutées par l'interface: même stockage dédoublonné que l'extracteur (si activé)
+BLOB_CONFIG = OUTPUT_CONFIG.get('blob_store', {})
+blob_store = (BlobStore(os.path.join(EXTRACTIONS_DIR, BLOB_CONFIG.get('dir', '_blobs')))
+              if BLOB_CONFIG.get('enabled') else None)
+# Formats possibles des images extraites (OUTPUT_CONFIG['formats'] de l'extracteur)
+IMAGE_EXTENSIONS = ('.png', '.webp', '.jpg', '.jpeg')
+
+def list_extracted_images(directory, prefix=""):
+    """Images extraites d'un dossier, quel que soit leur format (sans miniatures ni aperçu)"""
+    if not os.path.isdir(directory):
+        return []
+    return sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name.lower().endswith(IMAGE_EXTENSIONS) and name.startswith(prefix)
+        and not name.startswith("thumb_") and not name.startswith("page_full_image")
+    )
+
+def write_session_image(session_path, out_path, image):
+    """Image ajoutée par l'interface : store dédoublonné, sinon écriture atomique"""
+    if blob_store is not None:
+        blob_store.write_image(out_path, image, [])
+        blob_store.save_manifest(session_path)
+        return
+
+    import cv2
+    import uuid
+    extension = os.path.splitext(out_path)[1]
+    tmp_path = f"{out_path}.{uuid.uuid4().hex}{extension}"
+    if not cv2.imwrite(tmp_path, image):
+        raise IOError(f"Encodage impossible: {out_path}")
+    os.replace(tmp_path, out_path)
+
+def load_page_pyramid(page_dir):
+    """Manifeste de la pyramide d'aperçus écrite à l'extraction (None si absente)"""
+    manifest_file = os.path.join(page_dir, "page_pyramid.json")
+    if not os.path.exists(manifest_file):
+        return None
+    try:
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+def assemble_pyramid_level(page_dir, manifest, min_width):
+    """Recompose le plus petit niveau d'au moins min_width pixels de large (JPEG)"""
+    import cv2
+    import numpy as np
+
+    levels = manifest['levels']
+    level = next((l for l in levels if l['width'] >= min_width), levels[-1])
+    tile_size, overlap = manifest['tile_size'], manifest['overlap']
+    level_dir = os.path.join(page_dir, manifest['tiles_dir'], str(level['level']))
+
+    canvas = np.full((level['height'], level['width'], 3), 255, dtype=np.uint8)
+    for row in range(level['rows']):
+        for col in range(level['cols']):
+            tile = cv2.imread(os.path.join(level_dir, f"{col}_{row}.jpg"), cv2.IMREAD_COLOR)
+            if tile is None:
+                continue
+            x = max(0, col * tile_size - overlap)
+            y = max(0, row * tile_size - overlap)
+            h = min(tile.shape[0], level['height'] - y)
+            w = min(tile.shape[1], level['width'] - x)
+            canvas[y:y + h, x:x + w] = tile[:h, :w]
+
+    ok, buffer = cv2.imencode('.jpg', canvas, [cv2.IMWRITE_JPEG_QUALITY, 90])
+    return buffer.tobytes() if ok else None
+
+def load_page_details(session_path, page_num):
+    """Détails d'une page : manifeste SQLite (recherche indexée), sinon page_ultra_details.json"""
+    if SessionDB.exists(session_path):
+        db = SessionDB(session_path)
+        try:
+            page_details = db.get_page(page_num)
+        finally:
+            db.close()
+        if page_details is not None:
+            return page_details
+    
+    page_details_file = os.path.join(session_path, f"page_{page_num:03d}", "page_ultra_details.json")
+    try:
+        with open(page_details_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+def load_duplicate_groups(session_path):
+    """Groupes de quasi-doublons calculés à l'extraction"""
+    if SessionDB.exists(session_path):
+        db = SessionDB(session_path)
+        try:
+            groups = db.get_session().get('duplicate_groups')
+        finally:
+            db.close()
+        if groups is not None:
+            return groups
+    meta_file = os.path.join(session_path, "extraction_ultra_complete.json")
+    try:
+        with open(meta_file, 'r', encoding='utf-8') as f:
+            return json.load(f).get('duplicate_groups', [])
+    except Exception:
+        return []
+
+def propagate_group_states(image_states, groups):
+    """Étend une décision (validée/rejetée) aux images en attente de son groupe.
+    
+    Un groupe dont les membres ont déjà reçu des décisions différentes n'est pas modifié.
+    """
+    propagated = 0
+    for group in groups:
+        ids = [f"page{m['page']}_{m['filename']}" for m in group.get('members', [])]
+        decided = {image_states[i] for i in ids if image_states.get(i) in ('validated', 'rejected')}
+        if len(decided) != 1:
+            continue
+        state = decided.pop()
+        for image_id in ids:
+            if image_states.get(image_id, 'pending') == 'pending':
+                image_states[image_id] = state
+                propagated += 1
+    return propagated
 
 class ValidationServer:
     def __init__(self):
@@ -70,15 +197,12 @@ class ValidationServer:
         images = []
         
         # Lire les détails de la page si disponibles
-        page_details_file = os.path.join(page_dir, "page_ultra_details.json")
-        page_details = {}
+        page_details = load_page_details(session_path, page_num)
         page_width = 0
         page_height = 0
         page_dpi = 0
-        if os.path.exists(page_details_file):
+        if page_details:
             try:
-                with open(page_details_file, 'r', encoding='utf-8') as f:
-                    page_details = json.load(f)
                 # Extraire meta de taille
                 size_str = page_details.get('image_size') or ''
                 if isinstance(size_str, str) and '×' in size_str:
@@ -94,11 +218,15 @@ class ValidationServer:
         
         rectangles_details = page_details.get('rectangles_details', [])
         
+        # Groupes de quasi-doublons de la page (validation groupée)
+        duplicate_of = {
+            member['filename']: group['group_id']
+            for group in load_duplicate_groups(session_path)
+            for member in group.get('members', []) if member.get('page') == page_num
+        }
+        
         # Scanner les images normales
-        for img_file in glob.glob(os.path.join(page_dir, "*.png")):
-            if "thumb_" in os.path.basename(img_file):
-                continue  # Ignorer les miniatures
-            
+        for img_file in list_extracted_images(page_dir):
             filename = os.path.basename(img_file)
             
             # Trouver les détails correspondants
@@ -116,18 +244,19 @@ class ValidationServer:
                 'detection_method': details.get('detection_method', 'unknown'),
                 'dimensions': f"{details.get('bbox', {}).get('w', 0)}×{details.get('bbox', {}).get('h', 0)}",
                 'bbox': details.get('bbox', {}),
+                'duplicate_group': duplicate_of.get(filename),
                 'folder': 'normal'
             })
         
         # Scanner le dossier DOUTEUX
         doubtful_dir = os.path.join(page_dir, "DOUTEUX")
         if os.path.exists(doubtful_dir):
-            for img_file in glob.glob(os.path.join(doubtful_dir, "DOUTEUX_*.png")):
+            for img_file in list_extracted_images(doubtful_dir, "DOUTEUX_"):
                 filename = os.path.basename(img_file)
                 base_filename = filename.replace("DOUTEUX_", "")
                 
                 # Chercher le fichier info correspondant
-                info_file = os.path.join(doubtful_dir, base_filename.replace('.png', '_INFO.txt'))
+                info_file = os.path.join(doubtful_dir, os.path.splitext(base_filename)[0] + '_INFO.txt')
                 doubt_info = ""
                 if os.path.exists(info_file):
                     try:
@@ -152,6 +281,7 @@ class ValidationServer:
                     'detection_method': details.get('detection_method', 'unknown'),
                     'dimensions': f"{details.get('bbox', {}).get('w', 0)}×{details.get('bbox', {}).get('h', 0)}",
                     'bbox': details.get('bbox', {}),
+                    'duplicate_group': duplicate_of.get(filename),
                     'folder': 'DOUTEUX'
                 })
         
@@ -240,6 +370,52 @@ def get_page_images(page_num):
         'meta': page_meta
     })
 
+@app.route('/api/duplicate-groups')
+def get_duplicate_groups():
+    """Groupes de quasi-doublons de la session (même œuvre reproduite plusieurs fois)"""
+    if not validation_server.current_session:
+        return jsonify({'error': 'Aucune session active'}), 400
+    
+    groups = load_duplicate_groups(validation_server.current_session['path'])
+    return jsonify({'success': True, 'groups': groups, 'count': len(groups)})
+
+@app.route('/api/artworks')
+def find_artworks():
+    """Œuvres de la session par numéro (?number=) et/ou page (?page=)"""
+    if not validation_server.current_session:
+        return jsonify({'error': 'Aucune session active'}), 400
+    
+    session_path = validation_server.current_session['path']
+    if not SessionDB.exists(session_path):
+        return jsonify({'error': 'Manifeste SQLite non disponible'}), 404
+    
+    db = SessionDB(session_path)
+    try:
+        artworks = db.find_artworks(request.args.get('number'), request.args.get('page', type=int))
+    finally:
+        db.close()
+    return jsonify({'success': True, 'artworks': artworks, 'count': len(artworks)})
+
+@app.route('/api/artwork/<artwork_id>')
+def get_artwork(artwork_id):
+    """Fiche d'une œuvre par id (artworks.jsonl, sinon individual_artworks/)"""
+    if not validation_server.current_session:
+        return jsonify({'error': 'Aucune session active'}), 400
+    
+    session_path = validation_server.current_session['path']
+    artwork = None
+    if ArtworkStore.exists(session_path):
+        artwork = ArtworkStore(session_path).get(artwork_id)
+    else:
+        artwork_file = os.path.join(session_path, "individual_artworks", f"{os.path.basename(artwork_id)}.json")
+        if os.path.exists(artwork_file):
+            with open(artwork_file, 'r', encoding='utf-8') as f:
+                artwork = json.load(f)
+    
+    if artwork is None:
+        return jsonify({'error': 'Œuvre introuvable'}), 404
+    return jsonify(artwork)
+
 @app.route('/api/get-image/<path:image_path>')
 def get_image(image_path):
     """Servir une image spécifique"""
@@ -259,14 +435,52 @@ def get_image(image_path):
     except Exception as e:
         return jsonify({'error': f'Erreur servir image: {str(e)}'}), 500
 
+@app.route('/api/page-pyramid/<int:page_num>')
+def get_page_pyramid(page_num):
+    """Manifeste DeepZoom d'une page (niveaux, taille des tuiles, DPI)"""
+    if not validation_server.current_session:
+        return jsonify({'error': 'Aucune session active'}), 400
+    
+    page_dir = os.path.join(validation_server.current_session['path'], f"page_{page_num:03d}")
+    manifest = load_page_pyramid(page_dir)
+    if manifest is None:
+        return jsonify({'error': 'Pyramide non disponible'}), 404
+    
+    manifest['tile_url'] = f"/api/page-tile/{page_num}/{{level}}/{{col}}_{{row}}.jpg"
+    return jsonify(manifest)
+
+@app.route('/api/page-tile/<int:page_num>/<int:level>/<tile_name>')
+def get_page_tile(page_num, level, tile_name):
+    """Servir une tuile de la pyramide (fichier statique, aucun travail PDF)"""
+    if not validation_server.current_session:
+        return jsonify({'error': 'Aucune session active'}), 400
+    
+    level_dir = os.path.join(validation_server.current_session['path'], f"page_{page_num:03d}",
+                             "page_pyramid_files", str(level))
+    return send_from_directory(level_dir, tile_name, max_age=86400)
+
 @app.route('/api/get-pdf-page/<int:page_num>')
 def get_pdf_page(page_num):
     """Récupérer l'image de la page PDF originale"""
     if not validation_server.current_session:
         return jsonify({'error': 'Aucune session active'}), 400
     
-    # Lire les métadonnées pour trouver le PDF original
     session_path = validation_server.current_session['path']
+    
+    # Pyramide écrite à l'extraction : recomposer un niveau sans toucher au PDF
+    page_dir = os.path.join(session_path, f"page_{page_num:03d}")
+    manifest = load_page_pyramid(page_dir)
+    if manifest is not None:
+        try:
+            min_width = int(request.args.get('width', 1600))
+            image_bytes = assemble_pyramid_level(page_dir, manifest, min_width)
+            if image_bytes:
+                from io import BytesIO
+                return send_file(BytesIO(image_bytes), mimetype='image/jpeg')
+        except Exception as e:
+            print(f"⚠️ Pyramide page {page_num} illisible, rastérisation du PDF: {e}")
+    
+    # Lire les métadonnées pour trouver le PDF original
     meta_file = os.path.join(session_path, "extraction_ultra_complete.json")
     
     if os.path.exists(meta_file):
@@ -353,12 +567,16 @@ def save_validation():
         session_path = validation_server.current_session['path']
         results_file = os.path.join(session_path, "validation_results.json")
         
+        # Une décision vaut pour tout le groupe de quasi-doublons
+        image_states = data.get('imageStates', {})
+        propagated = propagate_group_states(image_states, load_duplicate_groups(session_path))
+        
         # Ajouter des métadonnées
         validation_data = {
             'session_name': data.get('sessionName'),
             'validation_timestamp': datetime.now().isoformat(),
             'total_pages': data.get('totalPages'),
-            'image_states': data.get('imageStates', {}),
+            'image_states': image_states,
             'summary': data.get('summary', {}),
             'validator_info': {
                 'version': '1.0',
@@ -366,14 +584,22 @@ def save_validation():
             }
         }
         
-        # Sauvegarder
+        # Sauvegarder (fichier JSON + table de validation du manifeste SQLite)
         with open(results_file, 'w', encoding='utf-8') as f:
             json.dump(validation_data, f, indent=2, ensure_ascii=False)
+        if SessionDB.exists(session_path):
+            db = SessionDB(session_path)
+            try:
+                db.write_validation(image_states)
+            finally:
+                db.close()
         
         return jsonify({
             'success': True,
             'message': 'Validation sauvegardée avec succès',
-            'file': results_file
+            'file': results_file,
+            'propagated': propagated,
+            'image_states': image_states
         })
     
     except Exception as e:
@@ -462,25 +688,24 @@ def retry_doubtful():
             return jsonify({'success': True, 'processed': 0})
 
         processed = 0
-        for name in os.listdir(doubtful_dir):
-            if name.lower().endswith('.png') and name.startswith('DOUTEUX_'):
-                src_path = os.path.join(doubtful_dir, name)
-                img = cv2.imread(src_path, cv2.IMREAD_COLOR)
-                if img is None:
-                    continue
-                # Renforcement simple: CLAHE sur L, unsharp mask léger
-                lab = cv2.cvtColor(img, cv2.COLOR_BGR2LAB)
-                l, a, b = cv2.split(lab)
-                clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8,8))
-                l2 = clahe.apply(l)
-                lab2 = cv2.merge((l2, a, b))
-                enh = cv2.cvtColor(lab2, cv2.COLOR_LAB2BGR)
-                # Unsharp
-                blur = cv2.GaussianBlur(enh, (0,0), 1.0)
-                sharp = cv2.addWeighted(enh, 1.3, blur, -0.3, 0)
-                out_path = os.path.join(doubtful_dir, name.replace('.png', '_RETRY.png'))
-                cv2.imwrite(out_path, sharp)
-                processed += 1
+        for src_path in list_extracted_images(doubtful_dir, 'DOUTEUX_'):
+            name = os.path.basename(src_path)
+            img = cv2.imread(src_path, cv2.IMREAD_COLOR)
+            if img is None:
+                continue
+            # Renforcement simple: CLAHE sur L, unsharp mask léger
+            lab = cv2.cvtColor(img, cv2.COLOR_BGR2LAB)
+            l, a, b = cv2.split(lab)
+            clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8,8))
+            l2 = clahe.apply(l)
+            lab2 = cv2.merge((l2, a, b))
+            enh = cv2.cvtColor(lab2, cv2.COLOR_LAB2BGR)
+            # Unsharp
+            blur = cv2.GaussianBlur(enh, (0,0), 1.0)
+            sharp = cv2.addWeighted(enh, 1.3, blur, -0.3, 0)
+            out_path = os.path.join(doubtful_dir, '{}_RETRY{}'.format(*os.path.splitext(name)))
+            write_session_image(session_path, out_path, sharp)
+            processed += 1
 
         return jsonify({'success': True, 'processed': processed})
     except Exception as e:
@@ -529,7 +754,6 @@ def redetect_crop():
         session_path = validation_server.current_session['path']
         page_dir = os.path.join(session_path, f"page_{page_num:03d}")
         meta_file = os.path.join(session_path, 'extraction_ultra_complete.json')
-        page_details_file = os.path.join(page_dir, 'page_ultra_details.json')
 
         if not os.path.exists(meta_file):
             return jsonify({'success': False, 'error': 'Métadonnées globales introuvables'}), 404
@@ -542,10 +766,7 @@ def redetect_crop():
 
         dpi = 300
         try:
-            if os.path.exists(page_details_file):
-                with open(page_details_file, 'r', encoding='utf-8') as f:
-                    page_details = json.load(f)
-                dpi = int(page_details.get('dpi_used') or dpi)
+            dpi = int(load_page_details(session_path, page_num).get('dpi_used') or dpi)
         except Exception:
             pass
 
@@ -577,9 +798,14 @@ def redetect_crop():
         crop = pil_img.crop((x, y, x2, y2))
         # Enregistrer dans le dossier de la page
         base_name = req_filename or f"bbox_{x}_{y}_{w}_{h}.png"
+        if not base_name.lower().endswith(IMAGE_EXTENSIONS):
+            base_name += ".png"
         out_name = f"REDETECT_{base_name}"
         out_path = os.path.join(page_dir, out_name)
-        crop.save(out_path, format='PNG')
+        import cv2
+        import numpy as np
+        write_session_image(session_path, out_path,
+                            cv2.cvtColor(np.array(crop.convert('RGB')), cv2.COLOR_RGB2BGR))
 
         rel_path = os.path.relpath(out_path, EXTRACTIONS_DIR)
         return jsonify({'success': True, 'path': rel_path, 'width': crop.size[0], 'height': crop.size[1]})
@@ -606,7 +832,12 @@ if __name__ == '__main__':
     print("  GET  /api/get-session-data - Session active")
     print("  GET  /api/get-page-images/<page> - Images d'une page")
     print("  GET  /api/get-image/<path> - Servir une image")
+    print("  GET  /api/page-pyramid/<page> - Manifeste DeepZoom d'une page")
+    print("  GET  /api/page-tile/<page>/<level>/<tile> - Tuile d'aperçu")
     print("  POST /api/save-validation - Sauvegarder validation")
+    print("  GET  /api/duplicate-groups - Groupes de quasi-doublons")
+    print("  GET  /api/artworks?number=&page= - Recherche d'œuvres (manifeste SQLite)")
+    print("  GET  /api/artwork/<id> - Fiche d'une œuvre")
     print("  POST /api/export-validated-images - Exporter validées")
     print("=" * 50)
     